@@ -1,4 +1,8 @@
 
+import json
+
+CONFIG_CACHE_FILE = "config.json" # Copy of the SD configuration in internal flash
+
 class Config():
     def __init__(self):
         self._start_hour = 0
@@ -54,6 +58,11 @@ class Config():
         self._send_action_ec = False
         self._send_action_ph = False
         self._send_action_temp = False
+        self._ds18b20_resolution = 12
+        self._key_ladder_windows = [[0, 300], [550, 950], [1250, 1650], [1950, 2350], [2650, 3050]]
+        self._key_ladder_hysteresis = 100
+        self._key_ladder_samples = 3
+        self._rtc_temperature_offset = 0.0
 
     def set_timer_time(self, list_time = [0, 0, 0, 0]):
         self._start_hour = list_time[0]
@@ -200,34 +209,39 @@ class Config():
         "ec": self._ec,
         "ph": self._ph,
         "onOffRecovery": self._on_off_recovery,
+        "ds18b20Resolution": self._ds18b20_resolution,
+        "keyLadderWindows": self._key_ladder_windows,
+        "keyLadderHysteresis": self._key_ladder_hysteresis,
+        "keyLadderSamples": self._key_ladder_samples,
+        "rtcTemperatureOffset": self._rtc_temperature_offset,
         }
 
     def from_json(self, json):
         self.start_hour = json["startHour"]
         self.start_minutes = json["startMinutes"]
         self.end_hour = json["endHour"]
-        self.end_hour = json["endMinutes"]
+        self.end_minutes = json["endMinutes"]
         self.temp_max = json["tempMax"]
         self.temp_min = json["tempMin"]
         self.auto_enabled = json["autoEnabled"]
         self.mantein_enabled = json["manteinEnabled"]
         self.stand_by = json["standBy"]
-        self.set_on_off_light_auto = json["onOffLightAuto"]
-        self.set_on_off_heater = json["onOffHeater"]
-        self.set_on_off_ec = json["onOffEC"]
-        self.set_on_off_ph = json["onOffPH"]
-        self.set_on_off_temperature = json["onOffTemperature"]
-        self.set_on_off_filter = json["onOffFilter"]
-        self.set_on_off_feeder = json["onOffFeeder"]
-        self.set_on_off_temperature_sending = json["onOffTemperatureSending"]
-        self.set_on_off_ec_sending = json["onOffECSending"]
-        self.set_on_off_ph_sending = json["onOffPhSending"]
-        self.set_on_off_filter_auto = json["onOffFilterAuto"]
-        self.set_on_off_heater_auto = json["onOffHeaterAuto"]
-        self.set_freq_update_web_temperature = json["freqUpdateWebTemperature"]
-        self.set_freq_update_web_ec = json["freqUpdateWebEC"]
-        self.set_freq_update_web_ph = json["freqUpdateWebPH"]
-        self.set_freq_filter = json["freqFilter"]
+        self._on_off_light_auto = json["onOffLightAuto"]
+        self._on_off_heater = json["onOffHeater"]
+        self._on_off_ec = json["onOffEC"]
+        self._on_off_ph = json["onOffPH"]
+        self._on_off_temperature = json["onOffTemperature"]
+        self._on_off_filter = json["onOffFilter"]
+        self._on_off_feeder = json["onOffFeeder"]
+        self._on_off_temperature_sending = json["onOffTemperatureSending"]
+        self._on_off_ec_sending = json["onOffECSending"]
+        self._on_off_ph_sending = json["onOffPhSending"]
+        self._on_off_filter_auto = json["onOffFilterAuto"]
+        self._on_off_heater_auto = json["onOffHeaterAuto"]
+        self._freq_update_web_temperature = json["freqUpdateWebTemperature"]
+        self._freq_update_web_ec = json["freqUpdateWebEC"]
+        self._freq_update_web_ph = json["freqUpdateWebPH"]
+        self._freq_filter = json["freqFilter"]
         self.hour_loading = json["hourLoading"]
         self.min_loading = json["minLoading"]
         self.relay0 = json["relay0"]
@@ -237,7 +251,31 @@ class Config():
         self.temperature = json["temperature"]
         self.ec = json["ec"]
         self.ph = json["ph"]
-        self._on_off_heater_auto = json["onOffRecovery"]
+        self._on_off_recovery = json["onOffRecovery"]
+        self._ds18b20_resolution = json.get("ds18b20Resolution", 12)
+        self._key_ladder_windows = json.get("keyLadderWindows", self._key_ladder_windows)
+        self._key_ladder_hysteresis = json.get("keyLadderHysteresis", self._key_ladder_hysteresis)
+        self._key_ladder_samples = json.get("keyLadderSamples", self._key_ladder_samples)
+        self._rtc_temperature_offset = json.get("rtcTemperatureOffset", 0.0)
+
+    def load(self, path):
+        """Loads a configuration saved with save(). Returns False if missing or invalid."""
+        try:
+            with open(path, "r") as file:
+                self.from_json(json.load(file))
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Configuration {path} not loaded: {e}")
+            return False
+
+    def save(self, path):
+        try:
+            with open(path, "w") as file:
+                file.write(json.dumps(self.to_dict()))
+            return True
+        except OSError as e:
+            print(f"Errore: {e}")
+            return False
 
     @property
     def start_hour(self):
@@ -419,6 +457,27 @@ class Config():
     def set_freq_filter(self, value):
         self._freq_filter = self.freq[value]
 
+    def get_ds18b20_resolution(self):
+        return self._ds18b20_resolution
+
+    def set_ds18b20_resolution(self, value):
+        self._ds18b20_resolution = value
+
+    def get_rtc_temperature_offset(self):
+        """Calibration added to the DS3231 backup temperature, in degrees C."""
+        return self._rtc_temperature_offset
+
+    def set_rtc_temperature_offset(self, value):
+        self._rtc_temperature_offset = value
+
+    def get_key_ladder(self):
+        """Returns (windows, hysteresis, samples) for the resistor-ladder keypad."""
+        return self._key_ladder_windows, self._key_ladder_hysteresis, self._key_ladder_samples
+
+    def set_key_ladder_windows(self, windows):
+        """Stores calibrated [low, high] raw ADC windows for UP, DOWN, LEFT, RIGHT, CLICK."""
+        self._key_ladder_windows = [[low, high] for low, high in windows]
+
     @property
     def hour_loading(self):
         return self._hour_loading
@@ -87,6 +87,18 @@ class ConnectionManaging:
             self._station.active(False) # Disattiva se la connessione fallisce
             return False
 
+    def begin_connect(self):
+        """
+        Avvia la connessione WiFi senza attenderla: lo stato va poi controllato
+        con is_connected(). Restituisce True se era già connesso.
+        """
+        self._station.active(True)
+        if self.is_connected():
+            return True
+        self.log_message(f"Connessione al WiFi: {self.ssid}")
+        self._station.connect(self.ssid, self.password)
+        return False
+
     def disconnect(self):
         """
         Disconnette dalla rete WiFi e disattiva l'interfaccia.
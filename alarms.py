@@ -0,0 +1,199 @@
+try:
+    import heapq
+except ImportError:
+    import uheapq as heapq
+
+from ds3231 import days_since_2000, date_from_days
+
+DAY_MINUTES = 1440
+
+
+def minute_stamp(dt):
+    """
+    Minutes since 2000-01-01 00:00 for an RTC datetime tuple
+    (year, month, day, hour, minute, second, weekday, yearday), 2000-2099.
+    """
+    return days_since_2000(dt[0], dt[7]) * DAY_MINUTES + dt[3] * 60 + dt[4]
+
+
+def stamp_to_date(stamp):
+    """
+    Returns (year, month, day, hour, minute) for a minute stamp.
+    """
+    days, minutes = divmod(stamp, DAY_MINUTES)
+    year, month, day, yearday = date_from_days(days)
+    return (year, month, day, minutes // 60, minutes % 60)
+
+
+class CalendarEvent:
+    """
+    A wall-clock event with an optional repeat period in minutes.
+    """
+
+    def __init__(self, name, callback, stamp, period_min=0):
+        self.name = name
+        self.callback = callback
+        self.stamp = stamp
+        self.period_min = period_min
+        self.cancelled = False
+
+    def __str__(self):
+        return f"[{self.name}] at: {stamp_to_date(self.stamp)} period: {self.period_min} min"
+
+
+class AlarmCalendar:
+    """
+    Priority queue of upcoming wall-clock events backed by a DS3231 alarm.
+
+    The earliest event is always programmed into the alarm register (alarm 2
+    by default, minute resolution, matching date, hour and minute), so
+    nothing compares times between events: poll() only looks at the alarm
+    flag, or at a flag set from the INT pin IRQ (isr()), and runs the due
+    events when it fires. Repeating events then roll forward and the next
+    earliest one is programmed.
+    """
+
+    def __init__(self, rtc, alarm=2, int_en=True):
+        """
+        Args:
+            rtc (DS3231_RTC): Clock holding the alarm registers.
+            alarm (int): 1 or 2 (alarm 1 is used by the idle manager).
+            int_en (bool): Drive INT/SQW on the alarm; False keeps the square
+                wave running and the flag is only read back.
+        """
+        self._rtc = rtc
+        self._alarm = alarm
+        self._int_en = int_en
+        self._heap = []
+        self._events = {}
+        self._seq = 0
+        self._armed = None # Stamp currently in the alarm register
+        self._flag = False
+        self._irq = False
+        self._fired = 0
+
+    def _now(self):
+        return minute_stamp(self._rtc.now())
+
+    def daily(self, name, hour, minute, callback):
+        """
+        Runs `callback` every day at hour:minute. An event with the same name
+        is replaced.
+        """
+        now = self._now()
+        stamp = now - now % DAY_MINUTES + hour * 60 + minute
+        if stamp <= now:
+            stamp += DAY_MINUTES
+        return self._push(CalendarEvent(name, callback, stamp, DAY_MINUTES))
+
+    def every(self, name, period_min, callback):
+        """
+        Runs `callback` every `period_min` minutes, first one period from now.
+        """
+        return self._push(CalendarEvent(name, callback, self._now() + period_min, period_min))
+
+    def at(self, name, stamp, callback):
+        """Runs `callback` once at a minute stamp."""
+        return self._push(CalendarEvent(name, callback, stamp))
+
+    def get(self, name):
+        return self._events.get(name)
+
+    def cancel(self, name):
+        event = self._events.pop(name, None)
+        if event is None:
+            return False
+        event.cancelled = True # Removed lazily from the heap
+        self._program()
+        return True
+
+    def clear(self):
+        """Drops every event, e.g. before re-registering after a time change."""
+        for event in self._events.values():
+            event.cancelled = True
+        self._events = {}
+        self._heap = []
+        self._program()
+
+    def next_event(self):
+        """The earliest active event, or None."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def use_irq(self):
+        """
+        From now on poll() trusts the flag set by isr() and skips the I2C
+        status read; register isr() as the falling-edge handler of INT/SQW.
+        """
+        self._irq = True
+
+    def isr(self, pin):
+        self._flag = True
+
+    def poll(self, force=False):
+        """
+        Runs the events due if the alarm fired. Returns the number run.
+        force reads the alarm flag even in IRQ mode (e.g. after a light
+        sleep, when the edge may have been missed).
+        """
+        if self._irq and not self._flag and not force:
+            return 0
+        self._flag = False
+        if not self._rtc.check_alarm(self._alarm) and not force:
+            return 0
+        return self._run_due()
+
+    def _run_due(self):
+        now = self._now()
+        count = 0
+        while True:
+            event = self.next_event()
+            if event is None or event.stamp > now:
+                break
+            heapq.heappop(self._heap)
+            if event.period_min:
+                # Roll forward, skipping occurrences missed entirely
+                event.stamp += ((now - event.stamp) // event.period_min + 1) * event.period_min
+                self._seq += 1
+                heapq.heappush(self._heap, [event.stamp, self._seq, event])
+            else:
+                self._events.pop(event.name, None)
+            event.callback()
+            count += 1
+        self._fired += count
+        self._armed = None
+        self._program()
+        return count
+
+    def _push(self, event):
+        old = self._events.pop(event.name, None)
+        if old is not None:
+            old.cancelled = True
+        self._events[event.name] = event
+        self._seq += 1
+        heapq.heappush(self._heap, [event.stamp, self._seq, event])
+        self._program()
+        return event
+
+    def _program(self):
+        """Writes the earliest event into the alarm register if it changed."""
+        event = self.next_event()
+        if event is None:
+            if self._armed is not None:
+                self._rtc.alarm_int(enable=False, alarm=self._alarm)
+                self._armed = None
+            return
+        if event.stamp == self._armed:
+            return
+        year, month, day, hour, minute = stamp_to_date(event.stamp)
+        rtc = self._rtc
+        if self._alarm == 1:
+            rtc.alarm1((0, minute, hour, day), match=rtc.AL1_MATCH_DHMS, int_en=self._int_en)
+        else:
+            rtc.alarm2((minute, hour, day), match=rtc.AL2_MATCH_DHM, int_en=self._int_en)
+        self._armed = event.stamp
+
+    def stats(self):
+        return {"pending": len(self._events), "fired": self._fired, "armed": self._armed}
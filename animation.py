@@ -0,0 +1,207 @@
+import time
+
+ANIMATION_FPS = 25
+
+
+# --- Easing functions: progress 0..1 to eased progress 0..1 ---
+
+def linear(t):
+    return t
+
+
+def ease_in(t):
+    return t * t
+
+
+def ease_out(t):
+    return t * (2 - t)
+
+
+def ease_in_out(t):
+    return 2 * t * t if t < 0.5 else 1 - 2 * (1 - t) * (1 - t)
+
+
+def lerp(start, end, t):
+    return int(start + (end - start) * t + 0.5)
+
+
+def progress(duration_ms, easing=linear):
+    """
+    Yields the eased progress of an animation lasting `duration_ms`, from
+    the elapsed time at each resume, and 1.0 last. A slow frame rate drops
+    frames instead of stretching the animation.
+    """
+    start = time.ticks_ms()
+    while True:
+        t = time.ticks_diff(time.ticks_ms(), start) / duration_ms if duration_ms > 0 else 1.0
+        if t >= 1.0:
+            yield easing(1.0)
+            return
+        yield easing(t)
+
+
+def wipe(display, draw, duration_ms=250, easing=ease_in_out):
+    """
+    Transition revealing the screen drawn by `draw` from left to right
+    over the current one. `draw` renders the whole new screen; it may call
+    show(), which is deferred while the animator steps.
+    """
+    buffer = display.buffer
+    width = display.width
+    before = bytearray(buffer)
+    draw()
+    after = bytearray(buffer)
+    buffer[:] = before
+    shown = 0
+    try:
+        for t in progress(duration_ms, easing):
+            x = lerp(0, width, t)
+            if x > shown:
+                _reveal(display, after, shown, x)
+                shown = x
+            yield
+    finally:
+        if shown < width: # Stopped early: show the new screen at once
+            _reveal(display, after, shown, width)
+
+
+def _reveal(display, after, x0, x1):
+    buffer = display.buffer
+    width = display.width
+    for page in range(display.pages):
+        start = 1 + page * width
+        buffer[start + x0:start + x1] = after[start + x0:start + x1]
+    display.mark_dirty(x0, 0, x1 - x0, display.height)
+
+
+def scroll_portion(display, screen, _h, duration_ms=None, easing=ease_out):
+    """
+    SSD1306.scroll_portion() as an animation: the first row of `screen`
+    slides down by _h pixels, then the second one slides up by _h, each in
+    duration_ms (50 ms per pixel by default).
+    """
+    duration_ms = _h * 50 if duration_ms is None else duration_ms
+    for t in progress(duration_ms, easing):
+        display.fill(0)
+        display.text(screen[0][2], screen[0][0], screen[0][1] + lerp(0, _h, t))
+        yield
+    for t in progress(duration_ms, easing):
+        display.fill(0)
+        display.text(screen[0][2], screen[0][0], screen[0][1] + _h)
+        display.text(screen[1][2], screen[1][0], screen[1][1] - lerp(0, _h, t))
+        yield
+
+
+class Animator:
+    """
+    Runs non-blocking animations on a display, one frame per step.
+
+    An animation is a generator that draws a frame and yields: None to
+    draw the next frame after the frame period, or a number of
+    milliseconds to hold the frame (instead of time.sleep()). Every step
+    advances the animations that are due inside one display.frame(), so
+    they share one flush, and the frame rate is capped at `fps`.
+
+    With a scheduler attached the steps are a one-shot job re-armed for the
+    next frame or the end of the shortest hold, and dropped when nothing
+    runs; otherwise the owner calls step() from its refresh loop.
+    """
+
+    def __init__(self, display, fps=ANIMATION_FPS):
+        self.display = display
+        self.frame_ms = 1000 // fps
+        self._animations = {} # name -> [generator, due ticks, on_done]
+        self._scheduler = None
+        self._job = None
+        self._phase = -1
+        self._last_step = None
+        self.frames = 0
+
+    def attach(self, scheduler, name="animation", phase=-1):
+        self._scheduler = scheduler
+        self._job = name
+        self._phase = phase
+        if self._animations:
+            self._arm(0)
+
+    @property
+    def attached(self):
+        return self._scheduler is not None
+
+    @property
+    def busy(self):
+        return bool(self._animations)
+
+    def running(self, name):
+        return name in self._animations
+
+    def start(self, name, animation, on_done=None):
+        """
+        Starts a generator animation; one with the same name is replaced.
+        on_done runs when it ends or is stopped.
+        """
+        self._animations[name] = [animation, time.ticks_ms(), on_done]
+        self._arm(0)
+
+    def stop(self, name=None):
+        """
+        Stops one animation, or all of them, and shows the display as drawn
+        so far (a generator can complete its frame in a finally block);
+        their on_done callbacks still run.
+        """
+        names = list(self._animations) if name is None else [name]
+        stopped = []
+        for key in names:
+            state = self._animations.pop(key, None)
+            if state is not None:
+                state[0].close()
+                stopped.append(state[2])
+        if stopped:
+            self.display.show()
+        for on_done in stopped:
+            if on_done is not None:
+                on_done()
+        if not self._animations and self._scheduler is not None:
+            self._scheduler.cancel(self._job)
+
+    def step(self):
+        """
+        Draws the next frame of every animation that is due. Returns True
+        while animations remain.
+        """
+        now = time.ticks_ms()
+        if self._scheduler is None and self._last_step is not None \
+                and time.ticks_diff(now, self._last_step) < self.frame_ms:
+            return True # Frame rate cap when stepped from a faster loop
+        self._last_step = now
+        finished = []
+        drawn = False
+        with self.display.frame(): # One flush for every animation in the step
+            for name in list(self._animations):
+                state = self._animations[name]
+                if time.ticks_diff(state[1], now) > 0:
+                    continue # Holding a frame
+                try:
+                    delay = next(state[0])
+                except StopIteration:
+                    del self._animations[name]
+                    finished.append(state[2])
+                    continue
+                state[1] = time.ticks_add(now, delay or self.frame_ms)
+                drawn = True
+            if drawn:
+                self.frames += 1
+            self.display.show() # Also the last drawing of the ones that ended
+        for on_done in finished:
+            if on_done is not None:
+                on_done()
+        if self._animations:
+            wait = min(time.ticks_diff(state[1], now) for state in self._animations.values())
+            self._arm(max(wait, 0))
+        elif self._scheduler is not None:
+            self._scheduler.cancel(self._job)
+        return bool(self._animations)
+
+    def _arm(self, delay_ms):
+        if self._scheduler is not None:
+            self._scheduler.add(self._job, self.step, delay_ms, phase=self._phase)
@@ -0,0 +1,129 @@
+import json
+from ds3231 import epoch_seconds
+
+DRIFT_FILE = "drift.json"
+PPM_PER_LSB = 0.1 # Aging offset step at 25 degrees C, from the datasheet
+MIN_LEARN_S = 86400 # Shorter intervals are dominated by the 1 s quantization
+MAX_PPM = 100 # Larger errors mean the time was lost or set by hand, not drift
+MIN_SYNC_S = 86400
+MAX_SYNC_S = 30 * 86400
+HISTORY_SIZE = 8
+
+
+class DriftLearner:
+    """
+    Learns the DS3231 frequency error from successive NTP syncs and trims it
+    with the aging offset register.
+
+    At each sync the RTC time is compared with the NTP time before the RTC
+    is corrected: the difference over the time since the previous sync is
+    the frequency error in ppm, which is cancelled by moving the aging
+    offset. Both times only have whole seconds, so an estimate is good to
+    about 1 s divided by the interval; the remaining uncertainty sets how
+    long the RTC can run before the next sync, which grows as the intervals
+    get longer. The last sync and a short history are kept in flash.
+    """
+
+    def __init__(self, rtc, path=DRIFT_FILE, max_error_s=2):
+        """
+        Args:
+            rtc (DS3231_RTC): Clock to trim.
+            path (str): Flash file holding the sync history.
+            max_error_s (int): Error allowed to build up between syncs.
+        """
+        self._rtc = rtc
+        self._path = path
+        self.max_error_s = max_error_s
+        self._last_sync = None # Seconds since 2000 at the last correction
+        self._residual_ppm = None # Uncertainty left after the last trim
+        self._history = [] # [sync time, error s, ppm, aging offset]
+        self.load()
+
+    @property
+    def history(self):
+        return self._history
+
+    @property
+    def last_sync(self):
+        return self._last_sync
+
+    @property
+    def ppm(self):
+        """Frequency error measured at the last learning sync, or None."""
+        return self._history[-1][2] if self._history else None
+
+    def record_sync(self, reference):
+        """
+        Call with the NTP time, (year, month, day, hour, minute, second,
+        weekday, yearday), right before writing it to the RTC.
+        Returns the measured error in ppm, or None if nothing was learned.
+        """
+        ref_s = epoch_seconds(reference)
+        error = epoch_seconds(self._rtc.now()) - ref_s # Positive: the RTC runs fast
+        ppm = None
+        if self._rtc.OSF():
+            print("RTC oscillator stopped since the last sync: drift not learned.")
+        elif self._last_sync is not None:
+            elapsed = ref_s - self._last_sync
+            if elapsed >= MIN_LEARN_S:
+                ppm = error * 1000000 / elapsed
+                if abs(ppm) > MAX_PPM:
+                    print(f"RTC error of {error} s is not drift: ignored.")
+                    ppm = None
+                else:
+                    self._trim(ref_s, error, ppm, elapsed)
+        self._last_sync = ref_s
+        self.save()
+        return ppm
+
+    def _trim(self, ref_s, error, ppm, elapsed):
+        aging = self._rtc.aging
+        target = max(-128, min(127, aging + round(ppm / PPM_PER_LSB))) # A higher offset slows the clock
+        if target != aging:
+            self._rtc.aging = target
+        # Left after the trim: what the offset could not absorb plus the measurement step
+        self._residual_ppm = abs(ppm - (target - aging) * PPM_PER_LSB) + 1000000 / elapsed
+        self._history.append([ref_s, error, round(ppm, 2), target])
+        if len(self._history) > HISTORY_SIZE:
+            self._history.pop(0)
+
+    def sync_interval_s(self):
+        """
+        Seconds the RTC may run before it drifts by max_error_s, between
+        MIN_SYNC_S (nothing learned yet) and MAX_SYNC_S.
+        """
+        if self._residual_ppm is None:
+            return MIN_SYNC_S
+        interval = int(self.max_error_s * 1000000 / self._residual_ppm)
+        return max(MIN_SYNC_S, min(MAX_SYNC_S, interval))
+
+    def seconds_to_sync(self, now):
+        """
+        Seconds from `now` (an RTC datetime tuple) to the next sync; 0 if
+        it is due or there never was one.
+        """
+        if self._last_sync is None:
+            return 0
+        return max(0, self._last_sync + self.sync_interval_s() - epoch_seconds(now))
+
+    def load(self):
+        try:
+            with open(self._path, "r") as file:
+                state = json.load(file)
+            self._last_sync = state.get("last")
+            self._residual_ppm = state.get("residual")
+            self._history = state.get("history", [])
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Drift history {self._path} not loaded: {e}")
+            return False
+
+    def save(self):
+        try:
+            with open(self._path, "w") as file:
+                file.write(json.dumps({"last": self._last_sync, "residual": self._residual_ppm,
+                                       "history": self._history}))
+            return True
+        except OSError as e:
+            print(f"Errore: {e}")
+            return False
@@ -0,0 +1,164 @@
+import time
+
+# Conversion time (ms) for each DS18B20 resolution, from the datasheet.
+CONVERSION_MS = {9: 94, 10: 188, 11: 375, 12: 750}
+
+IDLE = 0
+CONVERTING = 1
+
+
+class DS18B20Sampler:
+    """
+    Non-blocking, two-phase sampler for a DS18B20 sensor.
+
+    start() triggers a conversion and returns immediately; tick() collects
+    the result on a later call once the conversion time for the configured
+    resolution has passed. The loop never sleeps waiting for the sensor.
+    """
+
+    def __init__(self, sensor, rom, resolution=12, label="DS18B20"):
+        """
+        Initialize the sampler.
+
+        Args:
+            sensor (DS18X20): The ds18x20 driver instance.
+            rom (bytearray): ROM code of the sensor to read.
+            resolution (int): Conversion resolution in bits (9-12).
+            label (str): A human-readable label for the sensor.
+        """
+        self._sensor = sensor
+        self._rom = rom
+        self._label = label
+        self._value = None
+        self._state = IDLE
+        self._started = 0
+        self._resolution = 12
+        self.conversion_ms = CONVERSION_MS[12]
+        # Metrics
+        self._samples = 0
+        self._errors = 0
+        self._recovered_ms = 0
+        self._active_us = 0
+        self.set_resolution(resolution)
+
+    @property
+    def label(self):
+        """Get the sensor label."""
+        return self._label
+
+    @property
+    def value(self):
+        """Get the last read value."""
+        return self._value
+
+    @property
+    def resolution(self):
+        """Get the conversion resolution in bits."""
+        return self._resolution
+
+    @property
+    def errors(self):
+        """Number of failed conversions or reads."""
+        return self._errors
+
+    @property
+    def is_converting(self):
+        """True while a conversion is in progress."""
+        return self._state == CONVERTING
+
+    def set_resolution(self, bits):
+        """
+        Sets the sensor resolution and the matching conversion time.
+        The configuration register is only written when it differs from 12 bits,
+        the power-on default.
+        """
+        if bits not in CONVERSION_MS:
+            raise ValueError("Resolution must be 9, 10, 11 or 12 bits")
+        if bits != 12 or self._resolution != 12:
+            try:
+                # Scratchpad bytes 2-4: TH, TL, config (R1 R0 in bits 6-5)
+                scratch = self._sensor.read_scratch(self._rom)
+                self._sensor.write_scratch(self._rom, bytearray([scratch[2], scratch[3], ((bits - 9) << 5) | 0x1F]))
+            except Exception as e:
+                print(f"Could not set {self._label} resolution: {e}")
+                return
+        self._resolution = bits
+        self.conversion_ms = CONVERSION_MS[bits]
+
+    def start(self):
+        """
+        Starts a conversion if none is running.
+        Returns True if a new conversion was started.
+        """
+        if self._state == CONVERTING:
+            return False
+        t0 = time.ticks_us()
+        try:
+            self._sensor.convert_temp()
+        except Exception as e:
+            self._errors += 1
+            print(f"Could not start {self._label} conversion: {e}")
+            return False
+        self._started = time.ticks_ms()
+        self._state = CONVERTING
+        self._active_us += time.ticks_diff(time.ticks_us(), t0)
+        return True
+
+    def ready(self):
+        """True when a running conversion has had enough time to finish."""
+        return self._state == CONVERTING and \
+            time.ticks_diff(time.ticks_ms(), self._started) >= self.conversion_ms
+
+    def tick(self):
+        """
+        Collects the result of a finished conversion.
+        Returns the temperature, or None if no new value is available yet.
+        """
+        if not self.ready():
+            return None
+        return self.collect()
+
+    def collect(self):
+        """
+        Reads the result of the running conversion without checking the
+        elapsed time; for callers that already waited conversion_ms.
+        """
+        if self._state != CONVERTING:
+            return None
+        t0 = time.ticks_us()
+        self._state = IDLE
+        try:
+            temp = self._sensor.read_temp(self._rom)
+        except Exception as e:
+            self._errors += 1
+            print(f"Could not read {self._label}: {e}")
+            return None
+        finally:
+            self._active_us += time.ticks_diff(time.ticks_us(), t0)
+        if not isinstance(temp, float):
+            self._errors += 1
+            return None
+        self._value = temp
+        self._samples += 1
+        # The blocking version slept for the whole conversion on every sample.
+        self._recovered_ms += self.conversion_ms
+        return temp
+
+    def stats(self):
+        """
+        Returns the sampler metrics.
+
+        recovered_ms is the loop time the blocking sleep would have taken,
+        active_us the time actually spent talking to the sensor.
+        """
+        return {
+            "samples": self._samples,
+            "errors": self._errors,
+            "resolution": self._resolution,
+            "conversion_ms": self.conversion_ms,
+            "recovered_ms": self._recovered_ms - self._active_us // 1000,
+            "active_us": self._active_us,
+        }
+
+    def __str__(self):
+        return f"[{self._label}] Value: {self._value}"
@@ -28,6 +28,7 @@
 # THE SOFTWARE.
 
 from micropython import const
+import time
 
 DATETIME_REG    = const(0) # 7 bytes
 ALARM1_REG      = const(7) # 5 bytes
@@ -37,6 +38,55 @@ STATUS_REG      = const(15)
 AGING_REG       = const(16)
 TEMPERATURE_REG = const(17) # 2 bytes
 
+UNIX_EPOCH_OFFSET = const(946684800) # Seconds from 1970-01-01 to 2000-01-01
+
+# Lookup tables: BCD encode for 0-99 and decode for every register byte
+_BCD_ENCODE = bytes((v // 10) << 4 | v % 10 for v in range(100))
+_BCD_DECODE = bytes((v >> 4) * 10 + (v & 0x0F) for v in range(256))
+# Days before the first of each month in a common year
+_CUMULATIVE_DAYS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def days_since_2000(year, yearday):
+    """
+    Days from 2000-01-01 to the given day (2000-2099, where every fourth
+    year is a leap year).
+    """
+    years = year - 2000
+    return years * 365 + (years + 3) // 4 + yearday - 1
+
+
+def date_from_days(days):
+    """
+    Inverse of days_since_2000: returns (year, month, day, yearday).
+    """
+    cycle, days = divmod(days, 1461) # Four-year cycles, leap year first
+    if days < 366:
+        year = 2000 + cycle * 4
+        leap = 1
+    else:
+        offset, days = divmod(days - 366, 365)
+        year = 2001 + cycle * 4 + offset
+        leap = 0
+    yearday = days + 1
+    if leap and days >= 59:
+        days -= 1 # Shift March onwards onto the common-year table
+        if days == 58:
+            return year, 2, 29, yearday
+    month = 12
+    while _CUMULATIVE_DAYS[month - 1] > days:
+        month -= 1
+    return year, month, days - _CUMULATIVE_DAYS[month - 1] + 1, yearday
+
+
+def epoch_seconds(dt):
+    """
+    Seconds since 2000-01-01 00:00:00 (the MicroPython epoch) for a
+    DS3231_RTC.now() tuple.
+    """
+    return days_since_2000(dt[0], dt[7]) * 86400 + dt[3] * 3600 + dt[4] * 60 + dt[5]
+
+
 class DS3231_RTC:
     """ DS3231 RTC driver.
 
@@ -58,7 +108,7 @@ class DS3231_RTC:
     AL2_MATCH_HM    = const(4) # Alarm when hours and minutes match (every day)
     AL2_MATCH_DHM   = const(0) # Alarm when day|wday match (once per month/week)
 
-    def __init__(self, i2c, addr=0x68):
+    def __init__(self, i2c, addr=0x68, osf_check_ms=60000):
         """
         Constructs a new instance
 
@@ -66,14 +116,21 @@ class DS3231_RTC:
         :type       i2c:    I2C
         :param      addr:   The I2C bus address of the EEPROM
         :type       addr:   int
+        :param      osf_check_ms:   Interval between oscillator stop flag checks
+                                    in now(), 0 to check on every read
+        :type       osf_check_ms:   int
 
         """
         self.i2c = i2c
         self._addr = addr
+        self._osf_check_ms = osf_check_ms
+        self._osf_checked = None # ticks_ms() of the last OSF check
+        self._transactions = 0
         self._timebuf = bytearray(7) # Pre-allocate a buffer for the time data
         self._buf = bytearray(1) # Pre-allocate a single bytearray for re-use
         self._al1_buf = bytearray(4)
         self._al2buf = bytearray(3)
+        self._tempbuf = bytearray(2)
         self._weekday_start = 0
     
     @property
@@ -104,30 +161,50 @@ class DS3231_RTC:
         """
         return self._addr
     
+    @property
+    def osf_check_ms(self) -> int:
+        """
+        Get the interval between oscillator stop flag checks in now()
+        """
+        return self._osf_check_ms
+
+    @osf_check_ms.setter
+    def osf_check_ms(self, value: int) -> None:
+        self._osf_check_ms = value
+
+    @property
+    def i2c_transactions(self) -> int:
+        """
+        Get the number of I2C transactions issued since the last reset
+
+        :returns:   Transaction count
+        :rtype:     int
+        """
+        return self._transactions
+
+    def reset_i2c_transactions(self) -> None:
+        self._transactions = 0
+
     @property
     def time(self) -> str:
         """
         Get the current time
         """
-        return "{0:02d}:{1:02d}:{2:02d}".format(self.hour, self.minute, self.second)
-        
-    @property
-    def datetime(self):
+        now = self.now()
+        return "{0:02d}:{1:02d}:{2:02d}".format(now[3], now[4], now[5])
+
+    def now(self):
         """
-        Get the current datetime
+        Get the current datetime from a single burst read of the time registers
 
-        (2023, 4, 18, 0, 10, 34, 4, 108)
-            y, m,  d, h, m,  s, wd, yd
+        The oscillator stop flag costs a second transaction, so it is only
+        checked every osf_check_ms milliseconds.
 
         :returns:   (year, month, day, hour, minute, second, weekday, yearday)
         :rtype:     Tuple[int, int, int, int, int, int, int, int]
-
-        returns in 24h format, converts to 24h if clock is set to 12h format
-        datetime : tuple, (0-year, 1-month, 2-day, 3-hour, 4-minutes[, 5-seconds[, 6-weekday]])
         """
-
         try:
-            self.i2c.readfrom_mem_into(self.addr, DATETIME_REG, self._timebuf)
+            self._read_into(DATETIME_REG, self._timebuf)
         except OSError as e:
             if e.errno == 19:  # ENODEV: No such module
                 print(f"Errore: RTC DS3231 module doesn't exist.")
@@ -141,34 +218,58 @@ class DS3231_RTC:
         # 0x04 - Day 1-31   00 BCD
         # 0x05 - Month 1-12 Century 00 BCD
         # 0x06 - Year 0-99  BCD (2000-2099)
-        seconds = self._bcd_to_dec(self._timebuf[0] & 0x7F)
-        minutes = self._bcd_to_dec(self._timebuf[1])
-
-        if (self._timebuf[2] & 0x40) >> 6: # Check for 12 hour mode bit
-            hour = self._bcd_to_dec(self._timebuf[2] & 0x9f) # Mask out bit 6(12/24) and 5(AM/PM)
-            if (self._timebuf[2] & 0x20) >> 5: # bit 5(AM/PM)
+        buf = self._timebuf
+        bcd = _BCD_DECODE
+        seconds = bcd[buf[0] & 0x7F]
+        minutes = bcd[buf[1]]
+
+        if buf[2] & 0x40: # Check for 12 hour mode bit
+            hour = bcd[buf[2] & 0x9f] # Mask out bit 6(12/24) and 5(AM/PM)
+            if buf[2] & 0x20: # bit 5(AM/PM)
                 # PM
                 hour += 12
         else:
             # 24h mode
-            hour = self._bcd_to_dec(self._timebuf[2] & 0xbf) # Mask bit 6 (12/24 format)
-
-        weekday = self._bcd_to_dec(self._timebuf[3] - self._weekday_start) # Can be set arbitrarily by user (1,7)
-        day = self._bcd_to_dec(self._timebuf[4])
-        month = self._bcd_to_dec(self._timebuf[5] & 0x7f) # Mask out the century bit
-        year = self._bcd_to_dec(self._timebuf[6]) + 2000
-        yearday = self.day_of_year(year=year, month=month, day=day)
-        try:
-            if self.OSF():
-                print("WARNING: Oscillator stop flag set. Time may not be accurate.")
-        except OSError as e:
-            if e.errno == 19:  # ENODEV: No such module
-                print(f"Errore: RTC DS3231 module doesn't exist.")
-            else:
-                print(f"Errore: {e}")  
+            hour = bcd[buf[2] & 0xbf] # Mask bit 6 (12/24 format)
+
+        weekday = bcd[(buf[3] - self._weekday_start) & 0xFF] # Can be set arbitrarily by user (1,7)
+        day = bcd[buf[4]]
+        month = bcd[buf[5] & 0x7f] # Mask out the century bit
+        year = bcd[buf[6]] + 2000
+        yearday = _CUMULATIVE_DAYS[month - 1] + day
+        if month > 2 and year % 4 == 0:
+            yearday += 1
+
+        ticks = time.ticks_ms()
+        if self._osf_checked is None or time.ticks_diff(ticks, self._osf_checked) >= self._osf_check_ms:
+            self._osf_checked = ticks
+            try:
+                if self.OSF():
+                    print("WARNING: Oscillator stop flag set. Time may not be accurate.")
+            except OSError as e:
+                if e.errno == 19:  # ENODEV: No such module
+                    print(f"Errore: RTC DS3231 module doesn't exist.")
+                else:
+                    print(f"Errore: {e}")  
 
         return (year, month, day, hour, minutes, seconds, weekday, yearday) # Conforms to the ESP8266 RTC (v1.13)
 
+    @property
+    def datetime(self):
+        """
+        Get the current datetime
+
+        (2023, 4, 18, 0, 10, 34, 4, 108)
+            y, m,  d, h, m,  s, wd, yd
+
+        :returns:   (year, month, day, hour, minute, second, weekday, yearday)
+        :rtype:     Tuple[int, int, int, int, int, int, int, int]
+
+        returns in 24h format, converts to 24h if clock is set to 12h format
+        datetime : tuple, (0-year, 1-month, 2-day, 3-hour, 4-minutes[, 5-seconds[, 6-weekday]])
+        """
+        return self.now()
+
     @datetime.setter
     def datetime(self, value=None):
         """
@@ -197,8 +298,8 @@ class DS3231_RTC:
         self._timebuf[2] = self._dec_to_bcd(value[3]) # Hour + the 24h format flag
         self._timebuf[4] = self._dec_to_bcd(value[2]) # Day
         self._timebuf[5] = self._dec_to_bcd(value[1]) & 0xff # Month + mask the century flag
-        self._timebuf[6] = self._dec_to_bcd(int(str(value[0])[-2:])) # Year can be yyyy, or yy
-        self.i2c.writeto_mem(self.addr, DATETIME_REG, self._timebuf)
+        self._timebuf[6] = self._dec_to_bcd(value[0] % 100) # Year can be yyyy, or yy
+        self._write(DATETIME_REG, self._timebuf)
         self._OSF_reset()
         return True    
     
@@ -210,7 +311,7 @@ class DS3231_RTC:
         :returns:   Year of RTC
         :rtype:     int
         """
-        return self.datetime[0]
+        return self.now()[0]
 
     @property
     def month(self) -> int:
@@ -220,7 +321,7 @@ class DS3231_RTC:
         :returns:   Month of RTC
         :rtype:     int
         """
-        return self.datetime[1]
+        return self.now()[1]
 
     @property
     def day(self) -> int:
@@ -230,7 +331,7 @@ class DS3231_RTC:
         :returns:   Day of RTC
         :rtype:     int
         """
-        return self.datetime[2]
+        return self.now()[2]
 
     @property
     def hour(self) -> int:
@@ -240,7 +341,7 @@ class DS3231_RTC:
         :returns:   Hour of RTC
         :rtype:     int
         """
-        return self.datetime[3]
+        return self.now()[3]
 
     @property
     def minute(self) -> int:
@@ -250,7 +351,7 @@ class DS3231_RTC:
         :returns:   Minute of RTC
         :rtype:     int
         """
-        return self.datetime[4]
+        return self.now()[4]
 
     @property
     def second(self) -> int:
@@ -260,7 +361,7 @@ class DS3231_RTC:
         :returns:   Second of RTC
         :rtype:     int
         """
-        return self.datetime[5]
+        return self.now()[5]
 
     @property
     def weekday(self) -> int:
@@ -270,7 +371,7 @@ class DS3231_RTC:
         :returns:   Weekday of RTC
         :rtype:     int
         """
-        return self.datetime[5]
+        return self.now()[6]
 
     @property
     def yearday(self) -> int:
@@ -280,7 +381,7 @@ class DS3231_RTC:
         :returns:   Yearday of RTC
         :rtype:     int
         """
-        return self.datetime[7]
+        return self.now()[7]
 
     def square_wave(self, freq=None):
         """Outputs Square Wave Signal
@@ -295,17 +396,17 @@ class DS3231_RTC:
             3 = 4.096 kHz,
             4 = 8.192 kHz"""
         if freq is None:
-            return self.i2c.readfrom_mem(self.addr, CONTROL_REG, 1)[0]
+            return self._read(CONTROL_REG, 1)[0]
 
         if not freq:
             # Set INTCN (bit 2) to 1 and both ALIE (bits 1 & 0) to 0
-            self.i2c.readfrom_mem_into(self.addr, CONTROL_REG, self._buf)
-            self.i2c.writeto_mem(self.addr, CONTROL_REG, bytearray([(self._buf[0] & 0xf8) | 0x04]))
+            self._read_into(CONTROL_REG, self._buf)
+            self._write(CONTROL_REG, bytearray([(self._buf[0] & 0xf8) | 0x04]))
         else:
             # Set the frequency in the control reg and at the same time set the INTCN to 0
             freq -= 1
-            self.i2c.readfrom_mem_into(self.addr, CONTROL_REG, self._buf)
-            self.i2c.writeto_mem(self.addr, CONTROL_REG, bytearray([(self._buf[0] & 0xe3) | (freq << 3)]))
+            self._read_into(CONTROL_REG, self._buf)
+            self._write(CONTROL_REG, bytearray([(self._buf[0] & 0xe3) | (freq << 3)]))
         return True
 
     def day_of_year(self, year: int, month: int, day: int) -> int:
@@ -322,17 +423,10 @@ class DS3231_RTC:
         :returns:   Day of the year, January 1 is day 1
         :rtype:     int
         """
-        month_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        year -= 2000
-        days16 = day
-
-        for x in range(1, month):
-            days16 += month_days[x - 1]
-
-        if month >= 2 and self.is_leap_year(year=year):
-            days16 += 1
-
-        return days16
+        days = _CUMULATIVE_DAYS[month - 1] + day
+        if month > 2 and self.is_leap_year(year=year):
+            days += 1
+        return days
 
     def is_leap_year(self, year: int) -> bool:
         """
@@ -344,7 +438,7 @@ class DS3231_RTC:
         :returns:   True if the specified year is leap year, False otherwise.
         :rtype:     bool
         """
-        return (year % 4 == 0)       
+        return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
     def alarm1(self, time=None, match=AL1_MATCH_DHMS, int_en=True, weekday=False):
         """Set alarm1, can match mday, wday, hour, minute, second
@@ -355,7 +449,7 @@ class DS3231_RTC:
         int_en  : bool, enable interrupt on alarm match on SQW/INT pin (disables SQW output)"""
         if time is None:
             # TODO Return readable string
-            self.i2c.readfrom_mem_into(self.addr, ALARM1_REG, self._al1_buf)
+            self._read_into(ALARM1_REG, self._al1_buf)
             return self._al1_buf
 
         if isinstance(time, int):
@@ -368,12 +462,12 @@ class DS3231_RTC:
 
         dydt = (1 << 6) if weekday else 0 # day / date bit
 
-        self._al1_buf[0] = dectobcd(time[0]) | a1m1 # second
-        self._al1_buf[1] = (dectobcd(time[1]) | a1m2) if len(time) > 1 else a1m2 # minute
-        self._al1_buf[2] = (dectobcd(time[2]) | a1m3) if len(time) > 2 else a1m3 # hour
-        self._al1_buf[3] = (dectobcd(time[3]) | a1m4 | dydt) if len(time) > 3 else a1m4 | dydt # day (wday|mday)
+        self._al1_buf[0] = self._dec_to_bcd(time[0]) | a1m1 # second
+        self._al1_buf[1] = (self._dec_to_bcd(time[1]) | a1m2) if len(time) > 1 else a1m2 # minute
+        self._al1_buf[2] = (self._dec_to_bcd(time[2]) | a1m3) if len(time) > 2 else a1m3 # hour
+        self._al1_buf[3] = (self._dec_to_bcd(time[3]) | a1m4 | dydt) if len(time) > 3 else a1m4 | dydt # day (wday|mday)
 
-        self.i2c.writeto_mem(self.addr, ALARM1_REG, self._al1_buf)
+        self._write(ALARM1_REG, self._al1_buf)
 
         # Set the interrupt bit
         self.alarm_int(enable=int_en, alarm=1)
@@ -393,7 +487,7 @@ class DS3231_RTC:
         Returns : bytearray(3), the alarm settings register"""
         if time is None:
             # TODO Return readable string
-            self.i2c.readfrom_mem_into(self.addr, ALARM2_REG, self._al2buf)
+            self._read_into(ALARM2_REG, self._al2buf)
             return self._al2buf
 
         if isinstance(time, int):
@@ -405,11 +499,11 @@ class DS3231_RTC:
 
         dydt = (1 << 6) if weekday else 0 # day / date bit
 
-        self._al2buf[0] = dectobcd(time[0]) | a2m2 if len(time) > 1 else a2m2 # minute
-        self._al2buf[1] = dectobcd(time[1]) | a2m3 if len(time) > 2 else a2m3 # hour
-        self._al2buf[2] = dectobcd(time[2]) | a2m4 | dydt if len(time) > 3 else a2m4 | dydt # day
+        self._al2buf[0] = self._dec_to_bcd(time[0]) | a2m2 # minute
+        self._al2buf[1] = (self._dec_to_bcd(time[1]) | a2m3) if len(time) > 1 else a2m3 # hour
+        self._al2buf[2] = (self._dec_to_bcd(time[2]) | a2m4 | dydt) if len(time) > 2 else a2m4 | dydt # day
 
-        self.i2c.writeto_mem(self.addr, ALARM2_REG, self._al2buf)
+        self._write(ALARM2_REG, self._al2buf)
 
         # Set the interrupt bits
         self.alarm_int(enable=int_en, alarm=2)
@@ -427,39 +521,79 @@ class DS3231_RTC:
         alarm : int, alarm nr (0 to set both interrupts)
         returns: the control register"""
         if alarm in (0, 1):
-            self.i2c.readfrom_mem_into(self.addr, CONTROL_REG, self._buf)
+            self._read_into(CONTROL_REG, self._buf)
             if enable:
-                self.i2c.writeto_mem(self.addr, CONTROL_REG, bytearray([(self._buf[0] & 0xfa) | 0x05]))
+                self._write(CONTROL_REG, bytearray([(self._buf[0] & 0xfa) | 0x05]))
             else:
-                self.i2c.writeto_mem(self.addr, CONTROL_REG, bytearray([self._buf[0] & 0xfe]))
+                self._write(CONTROL_REG, bytearray([self._buf[0] & 0xfe]))
 
         if alarm in (0, 2):
-            self.i2c.readfrom_mem_into(self.addr, CONTROL_REG, self._buf)
+            self._read_into(CONTROL_REG, self._buf)
             if enable:
-                self.i2c.writeto_mem(self.addr, CONTROL_REG, bytearray([(self._buf[0] & 0xf9) | 0x06]))
+                self._write(CONTROL_REG, bytearray([(self._buf[0] & 0xf9) | 0x06]))
             else:
-                self.i2c.writeto_mem(self.addr, CONTROL_REG, bytearray([self._buf[0] & 0xfd]))
+                self._write(CONTROL_REG, bytearray([self._buf[0] & 0xfd]))
 
-        return self.i2c.readfrom_mem(self.addr, CONTROL_REG, 1)
+        return self._read(CONTROL_REG, 1)
 
     def check_alarm(self, alarm):
         """Check if the alarm flag is set and clear the alarm flag"""
-        self.i2c.readfrom_mem_into(self.addr, STATUS_REG, self._buf)
+        self._read_into(STATUS_REG, self._buf)
         if (self._buf[0] & alarm) == 0:
             # Alarm flag not set
             return False
 
         # Clear alarm flag bit
-        self.i2c.writeto_mem(self.addr, STATUS_REG, bytearray([self._buf[0] & ~alarm]))
+        self._write(STATUS_REG, bytearray([self._buf[0] & ~alarm]))
         return True
 
+    @property
+    def aging(self) -> int:
+        """
+        Get the aging offset, the crystal trim in signed LSBs
+
+        :returns:   -128 to 127; one LSB is about 0.1 ppm, positive slows the clock
+        :rtype:     int
+        """
+        self._read_into(AGING_REG, self._buf)
+        value = self._buf[0]
+        return value - 256 if value & 0x80 else value
+
+    @aging.setter
+    def aging(self, value: int) -> None:
+        """
+        Set the aging offset and start a temperature conversion, so the new
+        trim is applied now instead of at the next automatic conversion.
+        """
+        value = max(-128, min(127, value))
+        self._write(AGING_REG, bytearray([value & 0xff]))
+        self._read_into(CONTROL_REG, self._buf)
+        if not self._is_busy():
+            self._write(CONTROL_REG, bytearray([self._buf[0] | 0x20])) # CONV
+
+    def temperature(self):
+        """
+        Read the on-die temperature sensor used by the oscillator compensation
+
+        The DS3231 converts it every 64 seconds on its own, so this is a
+        single 2-byte read that never waits.
+
+        :returns:   Temperature in degrees C, 0.25 degree resolution (+/-3 degrees)
+        :rtype:     float
+        """
+        self._read_into(TEMPERATURE_REG, self._tempbuf)
+        raw = (self._tempbuf[0] << 8 | self._tempbuf[1]) >> 6 # 10-bit two's complement
+        if raw & 0x200:
+            raw -= 0x400
+        return raw * 0.25
+
     def output_32kHz(self, enable=True):
         """Enable or disable the 32.768 kHz square wave output"""
-        status = self.i2c.readfrom_mem(self.addr, STATUS_REG, 1)[0]
+        status = self._read(STATUS_REG, 1)[0]
         if enable:
-            self.i2c.writeto_mem(self.addr, STATUS_REG, bytearray([status | (1 << 3)]))
+            self._write(STATUS_REG, bytearray([status | (1 << 3)]))
         else:
-            self.i2c.writeto_mem(self.addr, STATUS_REG, bytearray([status & (~(1 << 3))]))
+            self._write(STATUS_REG, bytearray([status & (~(1 << 3))]))
 
     def OSF(self):
         """Returns the oscillator stop flag (OSF).
@@ -468,16 +602,28 @@ class DS3231_RTC:
         period in the past and may be used to judge the validity of
         the time data.
         returns : bool"""
-        return bool(self.i2c.readfrom_mem(self.addr, STATUS_REG, 1)[0] >> 7)
+        return bool(self._read(STATUS_REG, 1)[0] >> 7)
 
     def _OSF_reset(self):
         """Clear the oscillator stop flag (OSF)"""
-        self.i2c.readfrom_mem_into(self.addr, STATUS_REG, self._buf)
-        self.i2c.writeto_mem(self.addr, STATUS_REG, bytearray([self._buf[0] & 0x7f]))
+        self._read_into(STATUS_REG, self._buf)
+        self._write(STATUS_REG, bytearray([self._buf[0] & 0x7f]))
 
     def _is_busy(self):
         """Returns True when device is busy doing TCXO management"""
-        return bool(self.i2c.readfrom_mem(self.addr, STATUS_REG, 1)[0] & (1 << 2))
+        return bool(self._read(STATUS_REG, 1)[0] & (1 << 2))
+
+    def _read_into(self, reg, buf):
+        self._transactions += 1
+        self.i2c.readfrom_mem_into(self._addr, reg, buf)
+
+    def _read(self, reg, nbytes):
+        self._transactions += 1
+        return self.i2c.readfrom_mem(self._addr, reg, nbytes)
+
+    def _write(self, reg, buf):
+        self._transactions += 1
+        self.i2c.writeto_mem(self._addr, reg, buf)
 
     def _dec_to_bcd(self, value: int) -> int:
         """
@@ -489,7 +635,7 @@ class DS3231_RTC:
         :returns:   Binary coded decimal (BCD) format
         :rtype:     int
         """
-        return (value // 10) << 4 | (value % 10)
+        return _BCD_ENCODE[value]
 
     def _bcd_to_dec(self, value: int) -> int:
         """
@@ -501,7 +647,17 @@ class DS3231_RTC:
         :returns:   Decimal value
         :rtype:     int
         """
-        return ((value >> 4) * 10) + (value & 0x0F)
+        return _BCD_DECODE[value]
 
-    def unix_epoch_time(self, value):
-        return value + 946684800    
\ No newline at end of file
+    def unix_epoch_time(self, value=None):
+        """
+        Unix timestamp of `value` (seconds since 2000-01-01, as returned by
+        time.time() on MicroPython), or of the RTC time if omitted, which
+        costs a single burst read and no call into time.
+
+        :returns:   Seconds since 1970-01-01
+        :rtype:     int
+        """
+        if value is None:
+            value = epoch_seconds(self.now())
+        return value + UNIX_EPOCH_OFFSET    
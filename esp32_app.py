@@ -6,15 +6,32 @@
 # Import necessary libraries from MicroPython, and existing project modules.
 # Standard Libraries
 import random
-from time import sleep, localtime, time
+from time import localtime
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
 
 # MicroPython Libraries
-from machine import Pin, I2C, ADC
+from machine import Pin, I2C, ADC, reset_cause, PWRON_RESET
 
 # Project-specific Modules
 from viewer import Viewer
-from Config import Config
+from Config import Config, CONFIG_CACHE_FILE
 from ds3231 import DS3231_RTC
+from drift import DriftLearner, DRIFT_FILE
+from ds18b20_sampler import DS18B20Sampler
+from rtc_thermometer import RtcThermometer
+from scheduler import Scheduler, ms_until, DAY_MS, HOUR_MS
+from profiler import LoopProfiler
+from uploader import Uploader, DROP_OLDEST
+from idle import IdleManager
+from alarms import AlarmCalendar
+from startup import BootPipeline
+from softclock import SquareWaveTick
+from warmstart import WarmStart
+from keypad import (KeyEventQueue, DigitalKeys, AdcKeySampler, LadderKeyDecoder,
+                    KEY_NONE, KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_CLICK)
 import onewire, ds18x20
 import ntptime
 
@@ -26,11 +43,27 @@ import ntptime
 # --- Analog Inputs (Potentiometers for menu control) ---
 # NOTE: These potentiometers simulate button presses.
 # A value > 2000 is considered a "press".
+# GPIO 12 and 4 are ADC2 channels, which cannot be read while WiFi is on
+# (uploads, time sync): those keys are ignored meanwhile. Wire them to free
+# ADC1 pins (GPIO 32-39) to keep them working during network activity.
 POT_UP_PIN = 34      # KEY 1 -> UP
 POT_DOWN_PIN = 35    # KEY 3 -> DOWN (Note: main.py has this as key 3, not 2)
 POT_RIGHT_PIN = 12   # KEY 4 -> SHIFT +1
 POT_LEFT_PIN = 4     # KEY 5 -> CLICK/ENTER
 POT_CLICK_PIN = 32   # KEY 2 -> SHIFT -1 (Note: main.py has this as key 2, not 5)
+ADC2_PINS = (0, 2, 4, 12, 13, 14, 15, 25, 26, 27)
+
+# --- Key Input Mode ---
+# "adc":     keys read through the ADC channels above (polled, debounced).
+# "digital": push buttons on KEY_PINS raise pin-change interrupts; nothing
+#            is sampled while idle. GPIO 34/35 need external pull-ups.
+# "ladder":  all five keys on a resistor ladder read through KEY_LADDER_PIN;
+#            windows are calibrated in Config (keyLadderWindows).
+KEY_MODE = "adc"
+KEY_LADDER_PIN = 36   # ADC1 input: ADC2 cannot be read while WiFi is on
+KEY_PINS = ((POT_UP_PIN, KEY_UP), (POT_CLICK_PIN, KEY_DOWN), (POT_LEFT_PIN, KEY_CLICK),
+            (POT_RIGHT_PIN, KEY_RIGHT), (POT_DOWN_PIN, KEY_LEFT))
+KEY_DEBOUNCE_MS = 50
 
 # --- OneWire Temperature Sensor ---
 DS18B20_PIN = 13
@@ -41,6 +74,78 @@ DS18B20_PIN = 13
 # I2C_SDA_PIN = 21
 # I2C_SCL_PIN = 22
 
+# --- Software Clock ---
+# The screen clock is interpolated with ticks_ms and re-read from the DS3231
+# every CLOCK_RESYNC_MS (see softclock.SoftClock).
+CLOCK_RESYNC_MS = 600000
+# "poll": Viewer.run checks the software clock for a new second.
+# "sqw":  the DS3231 drives INT/SQW (RTC_INT_PIN) at 1 Hz and a pin IRQ marks
+#         each second; the pin is then unavailable for idle-mode alarms.
+TICK_SOURCE = "poll"
+# Splash animation at power-on; it runs while the startup stages go on
+SHOW_SPLASH = False
+
+# --- Job Periods (milliseconds) ---
+# Scheduler job periods, shared by run() and run_async(), so a slow step
+# never shifts the timing of the others.
+INPUT_PERIOD_MS = 50          # Key polling
+SENSOR_PERIOD_MS = 5000       # Temperature sampling
+DISPLAY_PERIOD_MS = 100       # Screen refresh
+
+# --- Loop Profiler ---
+# Per-phase latency histograms, dumped (and restarted) every PROFILE_DUMP_MS
+# to the serial console, or appended to PROFILE_LOG_FILE on the SD card.
+PROFILE_PHASES = ("input", "temperature", "display", "menu", "network")
+PROFILE_DUMP_MS = 60000
+PROFILE_DUMP_TO_SD = False
+PROFILE_LOG_FILE = "profile.log"
+
+# --- Background Uploader ---
+# Web sends are queued and performed by a worker thread, so the main loop
+# never waits on WiFi connect, POST or disconnect. WiFi is then on while the
+# keys are polled: ADC2 key channels (ADC2_PINS) cannot be read meanwhile,
+# and AdcKeySampler skips those samples (see the analog inputs above).
+USE_UPLOAD_THREAD = True
+UPLOAD_QUEUE_SIZE = 16
+
+# --- Idle Mode ---
+# While the menu is closed the CPU light-sleeps between job deadlines and the
+# display/input jobs slow down; opening the menu restores full speed.
+# RTC_INT_PIN is wired to the DS3231 INT/SQW output and times long sleeps;
+# KEY_WAKE_PIN (digital key mode only) lets a key end a sleep. Both must be
+# RTC GPIOs. In ADC key modes the keys are still polled every INPUT_PERIOD_MS.
+IDLE_MODE = False
+RTC_INT_PIN = 14
+KEY_WAKE_PIN = None
+IDLE_DISPLAY_PERIOD_MS = 1000
+IDLE_INPUT_PERIOD_MS = 1000
+
+# --- Alarm Calendar ---
+# The light timer, the daily loading, the web sends and the filter cycle run
+# as DS3231 alarm 2 events (alarms.AlarmCalendar) instead of ticks-based
+# scheduler jobs, so they follow the RTC however long the board runs. The
+# "calendar" job only looks at the alarm flag: over I2C every
+# CALENDAR_POLL_MS, or just the flag set by the RTC_INT_PIN interrupt when
+# the pin is not used by the square wave.
+USE_ALARM_CALENDAR = False
+CALENDAR_POLL_MS = 1000
+
+# --- Boot Stages ---
+# Timeouts of the startup stages run after the first frame, and the period
+# at which the main loop steps them.
+BOOT_STEP_MS = 50
+BOOT_MENU_TIMEOUT_MS = 5000
+BOOT_SD_TIMEOUT_MS = 5000
+BOOT_SENSOR_TIMEOUT_MS = 2000
+BOOT_WIFI_TIMEOUT_MS = 20000
+BOOT_NTP_TIMEOUT_MS = 3000
+
+# --- Time Sync ---
+# After boot the RTC is re-synced from NTP at intervals learned by
+# drift.DriftLearner, which also trims the DS3231 aging offset; a failed
+# sync is retried after TIME_SYNC_RETRY_MS.
+TIME_SYNC_RETRY_MS = 3600000
+
 
 # ----------------------------
 # --- 3. APPLICATION CLASS ---
@@ -57,24 +162,71 @@ class PyTankApp:
         Constructor for the application. Initializes all components.
         """
         print("Initializing PyTank Application...")
-        
+        # Only what the first frame needs runs here; the rest of the startup
+        # is deferred to background stages stepped by the main loop.
+        self.boot = BootPipeline()
+
+        # --- Warm Restart ---
+        # After machine.reset() the state saved by save_warm_snapshot() is in
+        # RTC memory: the SD card, the bus scan and NTP can be skipped.
+        self.warm = WarmStart()
+        snapshot = self.warm.load() if reset_cause() != PWRON_RESET else None
+        self.warm.clear() # Used once: a later reset must not restore stale state
+        self.warm_boot = snapshot is not None
+
         # --- Configuration ---
-        # The Config class holds all runtime settings.
+        # The Config class holds all runtime settings, from the snapshot or
+        # the flash cache until the SD card has been read.
         self.config = Config()
+        if self.warm_boot:
+            self.boot.run("config", lambda: self.config.from_json(snapshot[0]))
+        else:
+            self.boot.run("config", lambda: self.config.load(CONFIG_CACHE_FILE))
 
         # --- Hardware Components ---
-        self._init_hardware()
+        self.boot.run("hardware", self._init_hardware)
         
         # --- Viewer / UI ---
         # The Viewer class manages the OLED display and the menu system.
-        self.viewer = Viewer(i2c=self.i2c, config=self.config)
+        relays = snapshot[1] if self.warm_boot else None
+        self.viewer = self.boot.run("display", lambda: Viewer(i2c=self.i2c, config=self.config,
+                                                              deferred=True, relays=relays))
+        self.viewer.clock.resync_ms = CLOCK_RESYNC_MS
+        if TICK_SOURCE == "sqw":
+            self.viewer.tick = SquareWaveTick(self.viewer.ds, Pin(RTC_INT_PIN, Pin.IN, Pin.PULL_UP), self.viewer.clock)
+        self.boot.run("first_frame", self.viewer.show_first_frame)
+        self.boot.timeline.mark_first_frame()
+        if SHOW_SPLASH and not self.warm_boot:
+            self.viewer.init_screen()
+        self.uploader = Uploader(self.viewer.conn, UPLOAD_QUEUE_SIZE, DROP_OLDEST)
+        self.viewer.uploader = self.uploader
 
         # --- Application State ---
-        self.menu_countdown = 0
+        self.profiler = LoopProfiler(PROFILE_PHASES)
+        self.scheduler = Scheduler(self.profiler)
+        self.idle = self._init_idle() if IDLE_MODE else None
+        self.calendar = self._init_calendar() if USE_ALARM_CALENDAR else None
         self.MENU_TIMEOUT_SECONDS = 10 # Hide menu after 10 seconds of inactivity
+        self._running = False
+        self._menu_open = False # Menu state the jobs are set up for, see _sync_menu_state()
+        self._wifi_started = False
         
-        # --- Sync Time ---
-        self._sync_time()
+        # --- Background Startup ---
+        self.boot.defer("menu", self._build_menu, BOOT_MENU_TIMEOUT_MS)
+        if self.warm_boot:
+            # The configuration already came from the SD card and the RTC kept the time
+            rom = snapshot[2]
+            self.boot.defer("sensors", lambda: self._attach_sensor(rom), BOOT_SENSOR_TIMEOUT_MS)
+        else:
+            self.boot.defer("sd", self._load_sd_configuration, BOOT_SD_TIMEOUT_MS)
+            self.boot.defer("sensors", self._scan_sensor_bus, BOOT_SENSOR_TIMEOUT_MS)
+            self.boot.defer("wifi", self._connect_wifi, BOOT_WIFI_TIMEOUT_MS)
+            self.boot.defer("ntp", self._sync_time, BOOT_NTP_TIMEOUT_MS, requires="wifi")
+            self.boot.defer("wifi_off", self._release_wifi, BOOT_WIFI_TIMEOUT_MS)
+        if self.warm_boot:
+            self._schedule_time_sync()
+        else:
+            self._schedule_time_sync(TIME_SYNC_RETRY_MS) # Replaced if the boot sync succeeds
 
     def _init_hardware(self):
         """
@@ -82,21 +234,39 @@ class PyTankApp:
         """
         print("Initializing hardware...")
         
-        # --- Analog Inputs for Menu Control ---
-        self.pot_up = ADC(Pin(POT_UP_PIN))
-        self.pot_up.atten(ADC.ATTN_11DB)
-        
-        self.pot_down = ADC(Pin(POT_DOWN_PIN))
-        self.pot_down.atten(ADC.ATTN_11DB)
-        
-        self.pot_click = ADC(Pin(POT_CLICK_PIN))
-        self.pot_click.atten(ADC.ATTN_11DB)
+        # --- Menu Keys ---
+        # Presses are posted to a preallocated event queue drained by _handle_input
+        self.key_events = KeyEventQueue()
+        if KEY_MODE == "digital":
+            self.keys = DigitalKeys(self.key_events, KEY_PINS, KEY_DEBOUNCE_MS)
+        elif KEY_MODE == "ladder":
+            self.key_ladder = ADC(Pin(KEY_LADDER_PIN))
+            self.key_ladder.atten(ADC.ATTN_11DB)
+            windows, hysteresis, samples = self.config.get_key_ladder()
+            self.keys = LadderKeyDecoder(self.key_events, self.key_ladder, windows, hysteresis, samples)
+        else:
+            self.pot_up = ADC(Pin(POT_UP_PIN))
+            self.pot_up.atten(ADC.ATTN_11DB)
+
+            self.pot_down = ADC(Pin(POT_DOWN_PIN))
+            self.pot_down.atten(ADC.ATTN_11DB)
+
+            self.pot_click = ADC(Pin(POT_CLICK_PIN))
+            self.pot_click.atten(ADC.ATTN_11DB)
+
+            self.pot_right = ADC(Pin(POT_RIGHT_PIN))
+            self.pot_right.atten(ADC.ATTN_11DB)
 
-        self.pot_right = ADC(Pin(POT_RIGHT_PIN))
-        self.pot_right.atten(ADC.ATTN_11DB)
+            self.pot_left = ADC(Pin(POT_LEFT_PIN))
+            self.pot_left.atten(ADC.ATTN_11DB)
 
-        self.pot_left = ADC(Pin(POT_LEFT_PIN))
-        self.pot_left.atten(ADC.ATTN_11DB)
+            self.keys = AdcKeySampler(self.key_events, (
+                (self.pot_up, KEY_UP),
+                (self.pot_click, KEY_DOWN),
+                (self.pot_left, KEY_CLICK),
+                (self.pot_right, KEY_RIGHT),
+                (self.pot_down, KEY_LEFT),
+            ), KEY_DEBOUNCE_MS)
 
         # --- I2C Bus for Display and RTC ---
         # Modify pins if needed for your board
@@ -106,127 +276,538 @@ class PyTankApp:
         # --- Real-Time Clock (RTC) ---
         print("Initializing DS3231 RTC...")
         self.rtc = DS3231_RTC(self.i2c)
+        self.drift = DriftLearner(self.rtc, DRIFT_FILE)
 
-        # --- Temperature Sensor (DS18B20) ---
+        # The DS3231 on-die sensor stands in while no DS18B20 is usable
+        self.backup_thermometer = RtcThermometer(self.rtc, self.config.get_rtc_temperature_offset())
+        self.temp_sampler = None # Created by the "sensors" boot stage
+        self.ds18b20_sensor = None
+        self.ds18b20_rom = None
+
+    # --- Background Boot Stages ---
+    # Each returns True when finished; anything else is polled again.
+    def _build_menu(self):
+        self.viewer.build_menu()
+        return True
+
+    def _load_sd_configuration(self):
+        self.viewer.load_sd_configuration()
+        self.viewer.show_rele_symbol(self.config.get_rele_list())
+        # Set up from the cached configuration before the SD card was read
+        self.backup_thermometer.offset = self.config.get_rtc_temperature_offset()
+        if KEY_MODE == "ladder":
+            self.keys.configure(*self.config.get_key_ladder())
+        registered = self.calendar.get("loading") if self.calendar is not None else self.scheduler.get("loading")
+        if registered is not None:
+            # The loop is already running: follow the timings read from the SD card
+            self._register_config_jobs()
+        return True
+
+    def _scan_sensor_bus(self):
+        """
+        Scans the OneWire bus for the DS18B20 sensor.
+        """
         print("Scanning for DS18B20 sensor...")
+        self.temp_sampler = None
+        self.ds18b20_rom = None
         try:
             ds_pin = Pin(DS18B20_PIN)
             self.ds18b20_sensor = ds18x20.DS18X20(onewire.OneWire(ds_pin))
             roms = self.ds18b20_sensor.scan()
             if roms:
-                self.ds18b20_rom = roms[0] # Use the first sensor found
+                self._attach_sensor(roms[0]) # Use the first sensor found
                 print(f"Found DS18B20 device: {self.ds18b20_rom}")
             else:
-                self.ds18b20_rom = None
                 print("Warning: DS18B20 sensor not found.")
         except Exception as e:
             self.ds18b20_sensor = None
-            self.ds18b20_rom = None
             print(f"Error initializing DS18B20: {e}")
+        return True
+
+    def _attach_sensor(self, rom):
+        """
+        Creates the sampler for a known DS18B20 ROM code, without scanning.
+        """
+        self.ds18b20_rom = rom
+        if rom is None:
+            return True
+        if self.ds18b20_sensor is None:
+            self.ds18b20_sensor = ds18x20.DS18X20(onewire.OneWire(Pin(DS18B20_PIN)))
+        self.temp_sampler = DS18B20Sampler(self.ds18b20_sensor, rom, self.config.get_ds18b20_resolution())
+        return True
+
+    def save_warm_snapshot(self):
+        """
+        Saves the configuration, relay states and sensor ROM to RTC memory and
+        latches the relays, so the next boot after machine.reset() is warm.
+        """
+        saved = self.warm.save(self.config.to_dict(), self.viewer.relay_mask(), self.ds18b20_rom)
+        self.viewer.hold_relays()
+        return saved
+
+    def _connect_wifi(self):
+        """
+        Takes the WiFi over from the uploader, waiting for an upload in
+        flight, then starts the connection and polls it. The wifi_off
+        stage gives it back.
+        """
+        if not self._wifi_started:
+            if not self.uploader.pause():
+                return False
+            self._wifi_started = True
+            return self.viewer.conn.begin_connect()
+        return self.viewer.conn.is_connected()
 
     def _sync_time(self):
         """
         Synchronizes the RTC time with an NTP server.
         """
-        # This part requires a network connection.
-        # Assuming ConnectionManaging.py handles the WiFi connection.
         print("Attempting to sync time from NTP server...")
         try:
-            # Make sure you are connected to WiFi before calling this.
+            ntptime.timeout = BOOT_NTP_TIMEOUT_MS // 1000
             ntptime.settime() 
             # Update the DS3231 RTC with the new time
             tm = localtime()
-            self.rtc.set_time(tm)
+            ppm = self.drift.record_sync(tm) # Before the RTC is corrected
+            self.rtc.datetime = tm
+            self.viewer.clock.resync()
+            if ppm is not None:
+                print(f"RTC drift {ppm:.2f} ppm, aging offset {self.drift.history[-1][3]}")
+            self._schedule_time_sync(self.drift.sync_interval_s() * 1000)
+            # The wall-clock jobs and pending events were computed from the old time
+            if self.calendar is not None:
+                self.calendar.clear()
+            self._register_config_jobs()
             print(f"Time synchronized successfully: {tm}")
         except Exception as e:
             print(f"Could not sync time from NTP: {e}. Using time from RTC.")
+        return True
+
+    def _schedule_time_sync(self, delay_ms=None):
+        """
+        Arms the next NTP sync, by default when the learned interval since
+        the last one runs out.
+        """
+        if delay_ms is None:
+            delay_ms = self.drift.seconds_to_sync(self.rtc.now()) * 1000
+        self.scheduler.add("time_sync", self._start_time_sync, delay_ms)
+
+    def _start_time_sync(self):
+        """
+        Runs the WiFi and NTP stages again in the background.
+        """
+        self._schedule_time_sync(TIME_SYNC_RETRY_MS) # Replaced if the sync succeeds
+        self._wifi_started = False
+        self.boot.defer("wifi", self._connect_wifi, BOOT_WIFI_TIMEOUT_MS)
+        self.boot.defer("ntp", self._sync_time, BOOT_NTP_TIMEOUT_MS, requires="wifi")
+        self.boot.defer("wifi_off", self._release_wifi, BOOT_WIFI_TIMEOUT_MS)
+        self.scheduler.add("boot", self._boot_step, 0, BOOT_STEP_MS)
+
+    def _release_wifi(self):
+        """
+        Turns the WiFi off after a time sync and lets the uploader use it
+        again. An upload still in flight (the wifi stage timed out waiting
+        for it) disconnects by itself when it ends.
+        """
+        if self.uploader.pause():
+            self.viewer.conn.disconnect()
+        self.uploader.resume()
+        return True
+
+    def _boot_step(self):
+        """
+        Advances the background startup; prints the boot timeline when done.
+        """
+        if not self.boot.step():
+            self.scheduler.cancel("boot")
+            for line in self.boot_report():
+                print(line)
+
+    def boot_report(self):
+        """
+        Returns the boot timeline, including the time to the first frame.
+        """
+        return self.boot.timeline.report()
+
+    def start_temperature_conversion(self):
+        """
+        Starts a DS18B20 conversion; the result is collected by read_temperature().
+        """
+        if self.temp_sampler:
+            return self.temp_sampler.start()
+        return False
 
     def read_temperature(self):
         """
-        Reads the temperature from the DS18B20 sensor.
-        """
-        if self.ds18b20_sensor and self.ds18b20_rom:
-            try:
-                self.ds18b20_sensor.convert_temp()
-                sleep(0.75) # Wait for conversion
-                temp = self.ds18b20_sensor.read_temp(self.ds18b20_rom)
-                if isinstance(temp, float):
-                    self.config.temperature = round(temp, 2)
-                    return self.config.temperature
-            except Exception as e:
-                print(f"Could not read temperature: {e}")
+        Collects the DS18B20 reading once the running conversion has finished.
+        Never waits for the sensor: returns None while no new value is ready.
+        Without a DS18B20, or if the read fails, the DS3231 sensor is read.
+        """
+        if self.temp_sampler:
+            errors = self.temp_sampler.errors
+            temp = self.temp_sampler.tick()
+            if temp is None and self.temp_sampler.errors != errors:
+                return self.read_backup_temperature()
+            return self._store_temperature(temp)
+        return self.read_backup_temperature()
+
+    def read_backup_temperature(self):
+        """
+        Reads the DS3231 on-die sensor, corrected by the configured offset.
+        """
+        return self._store_temperature(self.backup_thermometer.read())
+
+    def _store_temperature(self, temp):
+        """
+        Saves a valid reading in the configuration and returns it.
+        """
+        if isinstance(temp, float):
+            self.config.temperature = round(temp, 2)
+            return self.config.temperature
         return None
 
+    def _init_idle(self):
+        """
+        Creates the light-sleep idle manager and its wake-up pins.
+        """
+        int_pin = None
+        if RTC_INT_PIN is not None and TICK_SOURCE != "sqw":
+            int_pin = Pin(RTC_INT_PIN, Pin.IN, Pin.PULL_UP)
+        key_pin = None
+        if KEY_MODE == "digital" and KEY_WAKE_PIN is not None:
+            key_pin = Pin(KEY_WAKE_PIN, Pin.IN, Pin.PULL_UP)
+        return IdleManager(self.rtc, self.scheduler, int_pin, key_pin)
+
+    def _init_calendar(self):
+        """
+        Creates the alarm calendar. With the square wave on INT/SQW the alarm
+        must not drive the pin, and its flag is polled instead.
+        """
+        sqw = TICK_SOURCE == "sqw"
+        calendar = AlarmCalendar(self.rtc, alarm=2, int_en=not sqw)
+        if RTC_INT_PIN is not None and not sqw:
+            self.calendar_pin = Pin(RTC_INT_PIN, Pin.IN, Pin.PULL_UP)
+            self.calendar_pin.irq(trigger=Pin.IRQ_FALLING, handler=calendar.isr)
+            calendar.use_irq()
+        return calendar
+
+    def _set_interactive(self, interactive):
+        """
+        Runs the input and display jobs at full speed while the menu is open,
+        and at the idle rates otherwise (idle mode only).
+        """
+        phase = self.profiler.phase
+        fast = interactive or self.idle is None
+        self._set_periodic("display", self.viewer.run,
+                           DISPLAY_PERIOD_MS if fast else IDLE_DISPLAY_PERIOD_MS, phase("display"))
+        # Keys that cannot wake the CPU must keep being polled
+        slow_input = not fast and self.idle.key_wake
+        self._set_periodic("input", self._handle_input,
+                           IDLE_INPUT_PERIOD_MS if slow_input else INPUT_PERIOD_MS, phase("input"))
+
+    def _can_idle(self):
+        """
+        True if the loop may light-sleep: idle mode on, menu closed and no
+        web upload in flight.
+        """
+        return self.idle is not None and not self.viewer.is_enabled_menu and self.uploader.idle
+
+    def _idle_wait(self):
+        """
+        Light-sleeps until the next job; a key wake-up opens the menu even if
+        the press itself was not queued.
+        """
+        if self.idle.sleep_until_next():
+            if not self._handle_input():
+                self._process_key(KEY_NONE)
+        elif self.calendar is not None:
+            self.calendar.poll(force=True) # The alarm edge may have come during the sleep
+
     def _handle_input(self):
         """
-        Reads the potentiometers and translates them into menu actions.
-        """
-        key = 0
-        if self.pot_up.read() > 2000: key = 1 # UP
-        if self.pot_click.read() > 2000: key = 2 # DOWN (was key 3)
-        if self.pot_left.read() > 2000: key = 5 # CLICK
-        if self.pot_right.read() > 2000: key = 4 # SHIFT +1
-        if self.pot_down.read() > 2000: key = 3 # SHIFT -1 (was key 2)
-
-        if key != 0:
-            # If any key is pressed, reset the menu inactivity timer
-            self.menu_countdown = 0
-            if not self.viewer.is_enabled_menu:
-                # Activate menu on first key press
-                self.viewer.is_enabled_menu = True
-
-            # --- Process menu actions ---
-            if self.viewer.is_enabled_menu:
-                if key == 1: self.viewer.menu.move(-1)   # Move Up
-                if key == 2: self.viewer.menu.move(1)    # Move Down
-                if key == 5: self.viewer.menu.click()    # Click/Enter
-                if key == 4: self.viewer.menu.shift(1)   # Shift Right
-                if key == 3: self.viewer.menu.shift(-1)  # Shift Left
-            return True # Input was handled
-        return False # No input
+        Drains the key event queue and translates each press into a menu action.
+        In ADC mode the channels are sampled first; in digital mode the
+        presses were already queued by the pin interrupts.
+        """
+        self.keys.poll()
+        handled = False
+        key = self.key_events.get()
+        with self.viewer.display.frame(): # A burst of keys is one flush
+            while key:
+                self._process_key(key)
+                handled = True
+                key = self.key_events.get()
+        return handled
+
+    def _process_key(self, key):
+        """
+        Applies one key press to the menu.
+        """
+        if self.viewer.menu is None:
+            return # The menu is still being built by the boot stages
+        # If any key is pressed, reset the menu inactivity timer
+        self.scheduler.add("menu_timeout", self._update_menu_timeout, self.MENU_TIMEOUT_SECONDS * 1000,
+                           phase=self.profiler.phase("menu"))
+        if self.viewer.animator.busy:
+            self.viewer.animator.stop() # A key skips the splash or a transition
+        if not self.viewer.is_enabled_menu:
+            # Activate menu on first key press
+            self.viewer.is_enabled_menu = True
+            self._sync_menu_state()
+
+        # --- Process menu actions ---
+        if self.viewer.is_enabled_menu:
+            if key == KEY_UP: self.viewer.menu.move(-1)       # Move Up
+            if key == KEY_DOWN: self.viewer.menu.move(1)      # Move Down
+            if key == KEY_CLICK: self.viewer.menu.click()     # Click/Enter
+            if key == KEY_RIGHT: self.viewer.menu.shift(1)    # Shift Right
+            if key == KEY_LEFT: self.viewer.menu.shift(-1)    # Shift Left
+        self._sync_menu_state() # The BACK item closes the menu from inside click()
 
     def _update_menu_timeout(self):
         """
-        Manages the auto-hiding of the menu after a period of inactivity.
+        Hides the menu after a period of inactivity. Runs as a one-shot job
+        re-armed on every key press, MENU_TIMEOUT_SECONDS after the last one.
         """
         if self.viewer.is_enabled_menu:
-            self.menu_countdown += 1
-            # Assuming the main loop runs every 0.1s, 100 counts = 10 seconds
-            if self.menu_countdown > (self.MENU_TIMEOUT_SECONDS * 10):
-                self.menu_countdown = 0
-                self.viewer.is_enabled_menu = False
-                print("Menu timed out, hiding.")
-                # Here you might want to save the configuration
-                # e.g., self.sd_manager.set_configuration(self.config.to_dict())
+            self.viewer.is_enabled_menu = False
+            print("Menu timed out, hiding.")
+            self._sync_menu_state()
+
+    def _sync_menu_state(self):
+        """
+        Follows the menu opening and closing, however it happened (first key
+        press, timeout or the BACK item): job rates switch between
+        interactive and idle, and on close the timed jobs take the settings
+        changed in the menu.
+        """
+        is_open = bool(self.viewer.is_enabled_menu)
+        if is_open == self._menu_open:
+            return
+        self._menu_open = is_open
+        self._set_interactive(is_open)
+        if not is_open:
+            self.scheduler.cancel("menu_timeout")
+            # Settings may have changed in the menu: refresh the timed jobs
+            self._register_config_jobs()
+            # Here you might want to save the configuration
+            # e.g., self.sd_manager.set_configuration(self.config.to_dict())
+
+    def _upload_channels(self):
+        """
+        Returns the readings that can be sent to the web server as
+        (key, sending enabled, rate in hours, value) tuples.
+        """
+        return (
+            ("Temp", self.config.get_on_off_temperature_sending(),
+             self.config.get_freq_update_web_temperature(), self.config.temperature),
+            ("Ec", self.config.get_on_off_ec_sending(),
+             self.config.get_freq_update_web_ec(), self.viewer.ec),
+            ("PH", self.config.get_on_off_ph_sending(),
+             self.config.get_freq_update_web_ph(), self.viewer.ph),
+        )
+
+    def _send_reading(self, key):
+        """
+        Sends one reading to the web server if its sending is enabled.
+        """
+        for channel, enabled, freq, value in self._upload_channels():
+            if channel == key and enabled:
+                timestamp = str(self.viewer.ds.unix_epoch_time())
+                return self.viewer.upload(str(value), key, timestamp)
+        return False
+
+    # --- Scheduler Jobs ---
+    def _sample_temperature(self):
+        if self.start_temperature_conversion():
+            # Collect exactly when the conversion is done
+            self.scheduler.add("temperature_read", self._collect_temperature, self.temp_sampler.conversion_ms,
+                               phase=self.profiler.phase("temperature"))
+        elif not (self.temp_sampler and self.temp_sampler.is_converting):
+            # No DS18B20, or it failed to start: the backup has nothing to wait for
+            if self.read_backup_temperature() is not None:
+                print(f"Current Temperature: {self.config.temperature}°C ({self.backup_thermometer.label})")
+
+    def _collect_temperature(self):
+        if self.read_temperature() is not None:
+            print(f"Current Temperature: {self.config.temperature}°C")
+
+    def _light_timer(self, on):
+        if self.config.auto_enabled:
+            self.viewer.set_light(on)
+
+    def _filter_cycle(self):
+        if self.config.get_on_off_filter_auto():
+            self.viewer.toggle_on_off_filter()
+
+    def _daily_loading(self):
+        for key, enabled, freq, value in self._upload_channels():
+            if enabled:
+                self._send_reading(key)
+
+    def _wall_clock(self):
+        """
+        Current (hour, minute, second) from the RTC.
+        """
+        dt = self.rtc.datetime
+        return (dt[3], dt[4], dt[5])
+
+    def _set_periodic(self, name, callback, period_ms, phase=-1):
+        """
+        Registers a periodic job; an unchanged period keeps its deadline.
+        """
+        job = self.scheduler.get(name)
+        if job is None or job.period_ms != period_ms:
+            self.scheduler.every(name, callback, period_ms, phase)
+
+    def _set_calendar_periodic(self, name, callback, period_min):
+        """
+        Calendar counterpart of _set_periodic.
+        """
+        event = self.calendar.get(name)
+        if event is None or event.period_min != period_min:
+            self.calendar.every(name, period_min, callback)
+
+    def _register_calendar_events(self):
+        """
+        Registers the Config-driven tasks as alarm calendar events.
+        """
+        for key, enabled, freq, value in self._upload_channels():
+            self._set_calendar_periodic("web_" + key, lambda k=key: self._send_reading(k), int(freq) * 60)
+        self._set_calendar_periodic("filter", self._filter_cycle, int(self.config.get_freq_filter()) * 60)
+
+        start_h, start_m, end_h, end_m = self.config.get_timer_time()
+        self.calendar.daily("light_on", start_h, start_m, lambda: self._light_timer(True))
+        self.calendar.daily("light_off", end_h, end_m, lambda: self._light_timer(False))
+        self.calendar.daily("loading", self.config.hour_loading, self.config.min_loading, self._daily_loading)
+
+    def _register_config_jobs(self):
+        """
+        Registers the jobs whose timing comes from Config: web sends,
+        filter cycle, light timer and the daily loading time.
+        """
+        if self.calendar is not None:
+            return self._register_calendar_events()
+        network = self.profiler.phase("network")
+        for key, enabled, freq, value in self._upload_channels():
+            self._set_periodic("web_" + key, lambda k=key: self._send_reading(k), int(freq) * HOUR_MS, network)
+        self._set_periodic("filter", self._filter_cycle, int(self.config.get_freq_filter()) * HOUR_MS)
+
+        # Wall-clock jobs are re-anchored to the RTC on every registration
+        now = self._wall_clock()
+        start_h, start_m, end_h, end_m = self.config.get_timer_time()
+        self.scheduler.add("light_on", lambda: self._light_timer(True), ms_until(now, start_h, start_m), DAY_MS)
+        self.scheduler.add("light_off", lambda: self._light_timer(False), ms_until(now, end_h, end_m), DAY_MS)
+        self.scheduler.add("loading", self._daily_loading,
+                           ms_until(now, self.config.hour_loading, self.config.min_loading), DAY_MS, network)
+
+    def _start_uploader(self):
+        """
+        Starts the background uploader (USE_UPLOAD_THREAD). It keeps WiFi
+        on while the keys are polled, which relies on AdcKeySampler
+        skipping the ADC2 reads that fail meanwhile; the keys affected are
+        reported.
+        """
+        if not USE_UPLOAD_THREAD:
+            return
+        if KEY_MODE == "adc":
+            pins = [pin for pin in (POT_UP_PIN, POT_DOWN_PIN, POT_CLICK_PIN, POT_RIGHT_PIN, POT_LEFT_PIN)
+                    if pin in ADC2_PINS]
+            if pins:
+                print(f"Keys on ADC2 pins {pins} are ignored while WiFi is on")
+        self.uploader.start()
+
+    def _register_jobs(self):
+        """
+        Registers every job run by the main loop; both runtimes use them.
+        """
+        phase = self.profiler.phase
+        self._menu_open = bool(self.viewer.is_enabled_menu)
+        self._set_interactive(self._menu_open)
+        # Animation frames become scheduler jobs instead of display refreshes
+        self.viewer.animator.attach(self.scheduler, "animation", phase("display"))
+        self.scheduler.add("temperature", self._sample_temperature, 0, SENSOR_PERIOD_MS, phase("temperature"))
+        self.scheduler.every("profile_dump", self.dump_profile, PROFILE_DUMP_MS)
+        if not self.boot.done:
+            self.scheduler.add("boot", self._boot_step, 0, BOOT_STEP_MS)
+        if self.calendar is not None:
+            self.scheduler.every("calendar", self.calendar.poll, CALENDAR_POLL_MS, phase("network"))
+        self._register_config_jobs()
+
+    def profile_snapshot(self):
+        """
+        Returns the per-phase loop latency statistics of the current window.
+        """
+        return self.profiler.snapshot()
+
+    def dump_profile(self):
+        """
+        Writes the loop latency statistics to serial or the SD card and
+        starts a new measurement window.
+        """
+        lines = self.profiler.report()
+        if PROFILE_DUMP_TO_SD and self.viewer.sd is not None:
+            self.viewer.sd.append_lines(PROFILE_LOG_FILE, lines)
+        else:
+            for line in lines:
+                print(line)
+        self.profiler.reset()
+
+    async def _scheduler_task(self):
+        """
+        Runs the scheduler jobs, awaiting the next deadline so that other
+        asyncio tasks run meanwhile.
+        """
+        while self._running:
+            self.scheduler.run_pending()
+            delay = self.scheduler.time_to_next()
+            await asyncio.sleep((INPUT_PERIOD_MS if delay is None else delay) / 1000)
+
+    async def run_async(self):
+        """
+        Cooperative runtime: the same scheduler jobs as run(), stepped by an
+        asyncio task, so the application can share the CPU with other
+        coroutines. The loop awaits instead of light-sleeping in idle mode.
+        Works with both uasyncio and CPython asyncio.
+        """
+        print("Starting async application tasks...")
+        self._running = True
+        self._start_uploader()
+        self._register_jobs()
+        try:
+            await self._scheduler_task()
+        finally:
+            self._running = False
+
+    def stop(self):
+        """
+        Asks the async runtime to finish after its current pass.
+        """
+        self._running = False
+
+    def start_async(self):
+        """
+        Entry point for the async runtime mode.
+        """
+        asyncio.run(self.run_async())
 
     def run(self):
         """
         The main application loop.
+        Input, display, sensor sampling, menu timeout and the Config-driven
+        tasks are scheduler jobs with absolute deadlines; the loop runs the
+        due ones and sleeps exactly until the next deadline, light-sleeping
+        in idle mode while the menu is closed.
         """
         print("Starting main application loop...")
-        loop_count = 0
+        self._start_uploader()
+        self._register_jobs()
         while True:
-            # --- 1. Handle User Input ---
-            self._handle_input()
-            
-            # --- 2. Update Application Logic ---
-            # This is where you would place recurring tasks.
-            
-            # Example: Read temperature every 5 seconds
-            if loop_count % 50 == 0: # 50 loops * 0.1s = 5 seconds
-                self.read_temperature()
-                print(f"Current Temperature: {self.config.temperature}°C")
-
-            # --- 3. Update the Display ---
-            # The viewer's run method handles drawing the screen.
-            self.viewer.run()
-
-            # --- 4. Handle Menu Timeout ---
-            self._update_menu_timeout()
-
-            # --- 5. Housekeeping ---
-            loop_count += 1
-            sleep(0.1) # Main loop delay.
+            self.scheduler.run_pending()
+            if self._can_idle():
+                self._idle_wait()
+            else:
+                self.scheduler.sleep_until_next()
 
 # ---------------------------------
 # --- 4. APPLICATION ENTRYPOINT ---
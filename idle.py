@@ -0,0 +1,99 @@
+from machine import lightsleep, wake_reason, EXT1_WAKE
+import esp32
+import time
+
+# Sleeps shorter than this are not worth the light-sleep entry/exit cost
+MIN_LIGHTSLEEP_MS = 10
+# From this length on, the wake-up is timed by a DS3231 alarm instead of the
+# ESP32 RC slow clock, which can drift by several percent
+ALARM_MIN_MS = 2000
+# The sleep timer is kept as a backstop this long after the alarm
+ALARM_GUARD_MS = 1500
+
+
+class IdleManager:
+    """
+    Light-sleeps the CPU until the scheduler's next deadline.
+
+    Long sleeps are ended by alarm 1 of the DS3231, whose open-drain INT/SQW
+    output wakes the ESP32 through ext0; a key wired to an RTC GPIO can wake
+    it through ext1. Both pins must be RTC-capable (0, 2, 4, 12-15, 25-27,
+    32-39). The alarm flag is cleared on wake, which releases the INT line.
+    """
+
+    def __init__(self, rtc, scheduler, int_pin=None, key_pin=None):
+        """
+        Args:
+            rtc (DS3231_RTC): Clock used for the wake-up alarm.
+            scheduler (Scheduler): Source of the next deadline.
+            int_pin (Pin): Input connected to the DS3231 INT/SQW output, or None
+                to time every sleep with the ESP32 timer.
+            key_pin (Pin): Key input (active low) allowed to wake the CPU, or None.
+        """
+        self._rtc = rtc
+        self._scheduler = scheduler
+        self._int_pin = int_pin
+        self._key_pin = key_pin
+        self._sleeps = 0
+        self._slept_ms = 0
+        self._alarm_wakes = 0
+        self._key_wakes = 0
+        if int_pin is not None:
+            esp32.wake_on_ext0(pin=int_pin, level=esp32.WAKEUP_ALL_LOW)
+        if key_pin is not None:
+            esp32.wake_on_ext1(pins=(key_pin,), level=esp32.WAKEUP_ALL_LOW)
+
+    @property
+    def key_wake(self):
+        """True if a key press can end a light sleep."""
+        return self._key_pin is not None
+
+    def set_alarm(self, delay_ms):
+        """
+        Programs alarm 1 for the wall-clock second `delay_ms` from now,
+        rounded down so the alarm never fires after the deadline.
+        """
+        dt = self._rtc.datetime
+        target = (dt[3] * 3600 + dt[4] * 60 + dt[5] + delay_ms // 1000) % 86400
+        self._rtc.alarm1((target % 60, target // 60 % 60, target // 3600), match=self._rtc.AL1_MATCH_HMS)
+
+    def sleep_until_next(self, max_ms=None):
+        """
+        Sleeps until the next deadline (bounded by max_ms if given).
+        Returns True if a key press woke the CPU.
+        """
+        delay = self._scheduler.time_to_next()
+        if delay is None or (max_ms is not None and delay > max_ms):
+            delay = max_ms
+        if delay is None:
+            delay = 86400000 # Nothing scheduled: wait for a key or the alarm
+        if delay < MIN_LIGHTSLEEP_MS:
+            if delay:
+                time.sleep_ms(delay)
+            return False
+
+        use_alarm = self._int_pin is not None and delay >= ALARM_MIN_MS
+        if use_alarm:
+            self.set_alarm(delay)
+            delay += ALARM_GUARD_MS
+        start = time.ticks_ms()
+        lightsleep(delay)
+        self._sleeps += 1
+        self._slept_ms += time.ticks_diff(time.ticks_ms(), start)
+
+        if use_alarm:
+            if self._rtc.check_alarm(1):
+                self._alarm_wakes += 1
+            self._rtc.alarm_int(enable=False, alarm=1)
+        if self._key_pin is not None and wake_reason() == EXT1_WAKE:
+            self._key_wakes += 1
+            return True
+        return False
+
+    def stats(self):
+        return {
+            "sleeps": self._sleeps,
+            "slept_ms": self._slept_ms,
+            "alarm_wakes": self._alarm_wakes,
+            "key_wakes": self._key_wakes,
+        }
@@ -0,0 +1,231 @@
+from machine import Pin
+from array import array
+import time
+
+# Key codes, as consumed by PyTankApp._handle_input
+KEY_NONE = 0
+KEY_UP = 1      # Menu.move(-1)
+KEY_DOWN = 2    # Menu.move(1)
+KEY_LEFT = 3    # Menu.shift(-1)
+KEY_RIGHT = 4   # Menu.shift(1)
+KEY_CLICK = 5   # Menu.click()
+
+ADC_PRESS_THRESHOLD = 2000
+
+# Default resistor-ladder windows (raw 12-bit readings at ATTN_11DB) for
+# KEY_UP, KEY_DOWN, KEY_LEFT, KEY_RIGHT, KEY_CLICK; idle reads near 4095.
+LADDER_WINDOWS = ((0, 300), (550, 950), (1250, 1650), (1950, 2350), (2650, 3050))
+LADDER_HYSTERESIS = 100
+LADDER_SAMPLES = 3
+
+
+class KeyEventQueue:
+    """
+    Preallocated ring queue of key presses, safe to fill from an interrupt.
+
+    There is one producer (the ISR or the sampler) and one consumer (the
+    main loop); each side only writes its own index, so no lock is needed
+    and put() never allocates.
+    """
+
+    def __init__(self, capacity=16):
+        self._keys = array('B', bytes(capacity))
+        self._capacity = capacity
+        self._head = 0 # Next slot to read, written by the consumer
+        self._tail = 0 # Next slot to write, written by the producer
+        self.overflows = 0
+
+    def put(self, key):
+        """Queues a key press. Returns False if the queue was full."""
+        tail = self._tail
+        nxt = tail + 1
+        if nxt == self._capacity:
+            nxt = 0
+        if nxt == self._head:
+            self.overflows += 1
+            return False
+        self._keys[tail] = key
+        self._tail = nxt
+        return True
+
+    def get(self):
+        """Returns the oldest key press, or KEY_NONE if the queue is empty."""
+        head = self._head
+        if head == self._tail:
+            return KEY_NONE
+        key = self._keys[head]
+        head += 1
+        self._head = 0 if head == self._capacity else head
+        return key
+
+    def __len__(self):
+        return (self._tail - self._head) % self._capacity
+
+    def clear(self):
+        self._head = self._tail
+
+
+class DigitalKeys:
+    """
+    Push buttons on digital pins (active low), read through pin-change IRQs.
+
+    Presses are debounced in the handler: an edge is accepted only if the
+    pin still reads pressed and the previous accepted press of that key is
+    at least debounce_ms old. Nothing runs while no key is touched.
+    """
+
+    def __init__(self, queue, keys, debounce_ms=50, pull=Pin.PULL_UP):
+        """
+        Args:
+            queue (KeyEventQueue): Queue receiving the presses.
+            keys (tuple): (pin number, key code) pairs. GPIO 34-39 have no
+                internal pull-up and need an external resistor.
+            debounce_ms (int): Minimum time between two presses of a key.
+        """
+        self._queue = queue
+        self._debounce_ms = debounce_ms
+        self._pins = [Pin(number, Pin.IN, pull) for number, key in keys]
+        self._codes = array('B', [key for number, key in keys])
+        start = (time.ticks_ms() - debounce_ms) & 0x3FFFFFFF
+        self._last = array('I', [start] * len(keys))
+        self._handler = self._isr # Bind once: no allocation inside the IRQ
+        for pin in self._pins:
+            pin.irq(trigger=Pin.IRQ_FALLING, handler=self._handler)
+
+    def _isr(self, pin):
+        now = time.ticks_ms() & 0x3FFFFFFF
+        for i in range(len(self._pins)):
+            if self._pins[i] is pin:
+                if pin.value() == 0 and ((now - self._last[i]) & 0x3FFFFFFF) >= self._debounce_ms:
+                    self._last[i] = now
+                    self._queue.put(self._codes[i])
+                return
+
+    def poll(self):
+        """Nothing to sample: presses arrive through the IRQ."""
+        pass
+
+    def disable(self):
+        for pin in self._pins:
+            pin.irq(handler=None)
+
+
+class AdcKeySampler:
+    """
+    Fallback for keys wired to ADC inputs, which cannot raise interrupts.
+
+    poll() samples each channel once; a press is posted on the released to
+    pressed transition (so even a single-sample press is not lost) unless
+    the key changed state less than debounce_ms ago.
+
+    On the ESP32 an ADC2 channel cannot be read while WiFi is on: a failed
+    read skips that sample and the key keeps its state.
+    """
+
+    def __init__(self, queue, channels, debounce_ms=50, threshold=ADC_PRESS_THRESHOLD):
+        """
+        Args:
+            queue (KeyEventQueue): Queue receiving the presses.
+            channels (tuple): (ADC object, key code) pairs.
+            debounce_ms (int): Minimum time between two state changes of a key.
+            threshold (int): Raw reading above which a key is pressed.
+        """
+        self._queue = queue
+        self._adcs = [adc for adc, key in channels]
+        self._codes = array('B', [key for adc, key in channels])
+        self._pressed = array('B', bytes(len(channels)))
+        start = (time.ticks_ms() - debounce_ms) & 0x3FFFFFFF
+        self._changed = array('I', [start] * len(channels))
+        self._debounce_ms = debounce_ms
+        self._threshold = threshold
+        self.read_errors = 0
+
+    def poll(self):
+        now = time.ticks_ms() & 0x3FFFFFFF
+        for i in range(len(self._adcs)):
+            try:
+                pressed = 1 if self._adcs[i].read() > self._threshold else 0
+            except OSError: # ADC2 channel while WiFi is active
+                self.read_errors += 1
+                continue
+            if pressed != self._pressed[i] and ((now - self._changed[i]) & 0x3FFFFFFF) >= self._debounce_ms:
+                self._pressed[i] = pressed
+                self._changed[i] = now
+                if pressed:
+                    self._queue.put(self._codes[i])
+
+
+class LadderKeyDecoder:
+    """
+    Five keys on a resistor ladder, decoded from a single ADC pin.
+
+    Each key pulls the pin into its own window of raw readings. poll() takes
+    a short burst of samples and moves to a new state only when a majority of
+    them agree; readings between windows do not vote. While a key is held its
+    window is widened by the hysteresis, so noise on a window edge does not
+    release it. A press is posted when the decoded key changes to a key.
+    """
+
+    def __init__(self, queue, adc, windows=LADDER_WINDOWS, hysteresis=LADDER_HYSTERESIS, samples=LADDER_SAMPLES):
+        """
+        Args:
+            queue (KeyEventQueue): Queue receiving the presses.
+            adc (ADC): Channel connected to the ladder.
+            windows (tuple): (low, high) raw readings for KEY_UP, KEY_DOWN,
+                KEY_LEFT, KEY_RIGHT and KEY_CLICK, in this order.
+            hysteresis (int): Readings a held key may drift outside its window.
+            samples (int): ADC readings voting on every poll.
+        """
+        self._queue = queue
+        self._adc = adc
+        self._key = KEY_NONE
+        self.configure(windows, hysteresis, samples)
+
+    def configure(self, windows, hysteresis, samples):
+        """
+        Replaces the calibration, e.g. once the configuration is read from
+        the SD card.
+        """
+        self._low = array('H', [w[0] for w in windows])
+        self._high = array('H', [w[1] for w in windows])
+        self._idle = max(self._high) + hysteresis # Released above this
+        self._hysteresis = hysteresis
+        self._samples = samples
+        self._votes = array('B', bytes(len(windows) + 1)) # Indexed by key code
+
+    @property
+    def key(self):
+        """Key currently held, or KEY_NONE."""
+        return self._key
+
+    def classify(self, raw):
+        """
+        Returns the key code for a raw reading, KEY_NONE if it is clearly
+        above every window, or -1 if it falls between windows.
+        """
+        held = self._key
+        if held != KEY_NONE:
+            i = held - 1
+            if self._low[i] - self._hysteresis <= raw <= self._high[i] + self._hysteresis:
+                return held
+        for i in range(len(self._low)):
+            if self._low[i] <= raw <= self._high[i]:
+                return i + 1
+        return KEY_NONE if raw > self._idle else -1
+
+    def poll(self):
+        votes = self._votes
+        for i in range(len(votes)):
+            votes[i] = 0
+        for _ in range(self._samples):
+            key = self.classify(self._adc.read())
+            if key >= 0:
+                votes[key] += 1
+        majority = self._samples // 2 + 1
+        for key in range(len(votes)):
+            if votes[key] >= majority:
+                if key != self._key:
+                    self._key = key
+                    if key != KEY_NONE:
+                        self._queue.put(key)
+                return
@@ -3,11 +3,16 @@ import machine
 import time
 import gc
 
+# Set to True to run the application jobs inside an asyncio task, so other
+# coroutines can share the CPU, instead of the blocking polling loop.
+USE_ASYNC_RUNTIME = False
+
 def main():
     """
     Main application entry point for the PyTank project.
     """
     print("Starting PyTank Application...")
+    app = None
     
     try:
         # Initialize the main application
@@ -15,13 +20,22 @@ def main():
         app = PyTankApp()
         
         # Main Loop
-        app.run()
+        if USE_ASYNC_RUNTIME:
+            app.start_async()
+        else:
+            app.run()
             
     except KeyboardInterrupt:
         print("Application stopped by user.")
     except Exception as e:
         print(f"Critical Error: {e}")
         # In a production environment, you might want to log this to a file on the SD card
+        if app is not None:
+            # Keep the configuration and relay states across the reset
+            try:
+                app.save_warm_snapshot()
+            except Exception as snapshot_error:
+                print(f"Warm-start snapshot not saved: {snapshot_error}")
         print("Restarting in 5 seconds...")
         time.sleep(5)
         machine.reset()
@@ -0,0 +1,112 @@
+import time
+from array import array
+
+
+class LoopProfiler:
+    """
+    Per-phase latency profiler for the main loop.
+
+    Durations are measured with time.ticks_us() into fixed-size log2
+    histograms (bucket i counts durations in [2^i, 2^(i+1)) us), so recording
+    a sample only updates preallocated arrays and never allocates.
+    snapshot() derives worst-case, mean and p99 latency from them.
+    Values are kept below 2^30 so reading them back never creates a long
+    int; call reset() once per reporting window (the app does it on dump).
+    """
+
+    def __init__(self, phases, buckets=20, late_ms=20):
+        """
+        Args:
+            phases (tuple): Phase names; phase(name) returns the index to record with.
+            buckets (int): Histogram buckets per phase (20 covers up to ~1 s).
+            late_ms (int): A job that starts later than this misses its deadline.
+        """
+        self._names = tuple(phases)
+        self._buckets = buckets
+        self.late_ms = late_ms
+        n = len(self._names)
+        self._hist = array('I', bytes(4 * n * buckets))
+        self._count = array('I', bytes(4 * n))
+        self._total = array('I', bytes(4 * n))
+        self._max = array('I', bytes(4 * n))
+        self._missed = array('I', bytes(4 * n))
+        self._start = array('I', bytes(4 * n))
+
+    @property
+    def phases(self):
+        return self._names
+
+    def phase(self, name):
+        """Returns the index of a phase name."""
+        return self._names.index(name)
+
+    def start(self, idx):
+        self._start[idx] = time.ticks_us() & 0x3FFFFFFF
+
+    def stop(self, idx):
+        """Records the duration since start(idx)."""
+        now = time.ticks_us() & 0x3FFFFFFF
+        self.record(idx, (now - self._start[idx]) & 0x3FFFFFFF)
+
+    def record(self, idx, us):
+        """Adds one duration (in microseconds) to a phase."""
+        bucket = 0
+        d = us
+        while d > 1 and bucket < self._buckets - 1:
+            d >>= 1
+            bucket += 1
+        self._hist[idx * self._buckets + bucket] += 1
+        self._count[idx] += 1
+        self._total[idx] = (self._total[idx] + us) & 0x3FFFFFFF
+        if us > self._max[idx]:
+            self._max[idx] = us
+
+    def miss(self, idx):
+        """Counts a missed deadline for a phase."""
+        self._missed[idx] += 1
+
+    def percentile(self, idx, pct):
+        """
+        Upper bound (us) of the histogram bucket holding the pct-th
+        percentile, capped at the worst case seen.
+        """
+        count = self._count[idx]
+        if not count:
+            return 0
+        target = (count * pct + 99) // 100
+        seen = 0
+        base = idx * self._buckets
+        for bucket in range(self._buckets):
+            seen += self._hist[base + bucket]
+            if seen >= target:
+                return min((2 << bucket) - 1, self._max[idx])
+        return self._max[idx]
+
+    def snapshot(self):
+        """
+        Returns {phase: {count, mean_us, p99_us, max_us, missed}}.
+        """
+        result = {}
+        for idx, name in enumerate(self._names):
+            count = self._count[idx]
+            result[name] = {
+                "count": count,
+                "mean_us": self._total[idx] // count if count else 0,
+                "p99_us": self.percentile(idx, 99),
+                "max_us": self._max[idx],
+                "missed": self._missed[idx],
+            }
+        return result
+
+    def report(self):
+        """Returns the snapshot as printable lines."""
+        lines = []
+        for name, s in self.snapshot().items():
+            lines.append("{}: n={} mean={}us p99={}us max={}us missed={}".format(
+                name, s["count"], s["mean_us"], s["p99_us"], s["max_us"], s["missed"]))
+        return lines
+
+    def reset(self):
+        for buf in (self._hist, self._count, self._total, self._max, self._missed):
+            for i in range(len(buf)):
+                buf[i] = 0
@@ -883,18 +883,25 @@ class Menu:
             screen.parent = self.parent
             self.main_screen = screen
 
+    def _frame(self):
+        # One flush per user action, whatever the screens draw on the way
+        return self.current_screen.display.frame()
+
     def move(self, direction: int = 1):
-        self.current_screen.up() if direction < 0 else self.current_screen.down()
-        self.draw()
+        with self._frame():
+            self.current_screen.up() if direction < 0 else self.current_screen.down()
+            self.draw()
 
     def shift(self, direction: int = 1):
-        self.current_screen.right() if direction < 0 else self.current_screen.left()
-        self.draw()
+        with self._frame():
+            self.current_screen.right() if direction < 0 else self.current_screen.left()
+            self.draw()
 
     def click(self):
-        self.current_screen = self.current_screen.select()
-        if self.current_screen is not None:
-            self.current_screen=self.current_screen.click()
+        with self._frame():
+            self.current_screen = self.current_screen.select()
+            if self.current_screen is not None:
+                self.current_screen=self.current_screen.click()
             
     def reset(self):
         self.current_screen = self.main_screen
@@ -902,4 +909,5 @@ class Menu:
 
 
     def draw(self):
-        return self.current_screen.draw()
\ No newline at end of file
+        with self._frame():
+            return self.current_screen.draw()
\ No newline at end of file
@@ -0,0 +1,77 @@
+class RtcThermometer:
+    """
+    Backup temperature sensor: the DS3231 on-die thermometer.
+
+    It is less accurate than the DS18B20 (+/-3 degrees, 0.25 degree steps)
+    and reads the board rather than the water, so it is corrected by a
+    calibration offset. A reading is a single 2-byte I2C read that never
+    blocks, so it can stand in whenever the DS18B20 is missing or fails.
+    """
+
+    def __init__(self, rtc, offset=0.0, label="DS3231"):
+        """
+        Initialize the sensor.
+
+        Args:
+            rtc (DS3231_RTC): The RTC driver instance.
+            offset (float): Degrees added to every reading.
+            label (str): A human-readable label for the sensor.
+        """
+        self._rtc = rtc
+        self._label = label
+        self._offset = offset
+        self._value = None
+        self._samples = 0
+        self._errors = 0
+
+    @property
+    def label(self):
+        """Get the sensor label."""
+        return self._label
+
+    @property
+    def value(self):
+        """Get the last read value."""
+        return self._value
+
+    @property
+    def offset(self):
+        """Get the calibration offset."""
+        return self._offset
+
+    @offset.setter
+    def offset(self, value):
+        """Set the calibration offset."""
+        self._offset = value
+
+    def calibrate(self, reference):
+        """
+        Sets the offset so that the current reading matches `reference`,
+        e.g. a DS18B20 value taken at the same time.
+        """
+        try:
+            self._offset = reference - self._rtc.temperature()
+        except OSError as e:
+            print(f"Could not calibrate {self._label}: {e}")
+        return self._offset
+
+    def read(self):
+        """
+        Reads the temperature. Returns the corrected value, or None on error.
+        """
+        try:
+            temp = self._rtc.temperature() + self._offset
+        except OSError as e:
+            self._errors += 1
+            print(f"Could not read {self._label}: {e}")
+            return None
+        self._value = temp
+        self._samples += 1
+        return temp
+
+    def stats(self):
+        """Returns the sensor metrics."""
+        return {"samples": self._samples, "errors": self._errors, "offset": self._offset}
+
+    def __str__(self):
+        return f"[{self._label}] Value: {self._value}"
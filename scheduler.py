@@ -0,0 +1,176 @@
+import time
+try:
+    import heapq
+except ImportError:
+    import uheapq as heapq
+
+DAY_MS = 86400000
+HOUR_MS = 3600000
+
+
+def ms_until(now, hour, minute):
+    """
+    Milliseconds from the wall-clock time `now` (hour, minute, second) to the
+    next occurrence of hour:minute. An occurrence equal to now is a day away.
+    """
+    seconds = (hour * 3600 + minute * 60) - (now[0] * 3600 + now[1] * 60 + now[2])
+    seconds %= 86400
+    return (seconds or 86400) * 1000
+
+
+class Job:
+    """
+    A callback with an absolute deadline and an optional repeat period.
+    """
+
+    def __init__(self, name, callback, deadline, period_ms=0, phase=-1):
+        self.name = name
+        self.callback = callback
+        self.deadline = deadline
+        self.period_ms = period_ms
+        self.phase = phase
+        self.cancelled = False
+
+    def __str__(self):
+        return f"[{self.name}] deadline: {self.deadline} period: {self.period_ms}"
+
+
+class Scheduler:
+    """
+    Deadline-based job scheduler backed by a min-heap.
+
+    Deadlines are absolute times on a monotonic millisecond clock built from
+    time.ticks_ms(), so they never drift with the loop duration and survive
+    the ticks counter wrapping around. Periodic jobs are re-armed from their
+    previous deadline, not from the time they actually ran.
+
+    If a profiler (see profiler.LoopProfiler) is set, jobs registered with a
+    phase index have their run time recorded and late starts counted as
+    missed deadlines.
+    """
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler
+        self._heap = []
+        self._jobs = {}
+        self._seq = 0
+        self._last_ticks = time.ticks_ms()
+        self._now = 0
+
+    def now(self):
+        """
+        Current time in milliseconds on the scheduler's monotonic clock.
+        """
+        ticks = time.ticks_ms()
+        self._now += time.ticks_diff(ticks, self._last_ticks)
+        self._last_ticks = ticks
+        return self._now
+
+    def add(self, name, callback, delay_ms=0, period_ms=0, phase=-1):
+        """
+        Schedules `callback` to run in `delay_ms`, then every `period_ms` if
+        given. A job with the same name is replaced.
+        """
+        return self._push(Job(name, callback, self.now() + delay_ms, period_ms, phase))
+
+    def every(self, name, callback, period_ms, phase=-1):
+        """
+        Schedules `callback` every `period_ms`, first run one period from now.
+        """
+        return self.add(name, callback, period_ms, period_ms, phase)
+
+    def get(self, name):
+        """
+        Returns the active job with this name, or None.
+        """
+        return self._jobs.get(name)
+
+    def cancel(self, name):
+        """
+        Cancels the job with this name. Returns True if it existed.
+        """
+        job = self._jobs.pop(name, None)
+        if job is None:
+            return False
+        job.cancelled = True # Removed lazily from the heap
+        return True
+
+    def reschedule(self, name, delay_ms):
+        """
+        Moves an existing job's next deadline to `delay_ms` from now.
+        """
+        job = self._jobs.get(name)
+        if job is None:
+            return None
+        return self.add(name, job.callback, delay_ms, job.period_ms, job.phase)
+
+    def time_to_next(self):
+        """
+        Milliseconds until the earliest deadline (0 if already due),
+        or None if nothing is scheduled.
+        """
+        job = self._peek()
+        if job is None:
+            return None
+        return max(0, job.deadline - self.now())
+
+    def run_pending(self):
+        """
+        Runs every job whose deadline has passed, in deadline order.
+        Returns the number of jobs run. The loop allocates nothing: a
+        periodic job is re-armed in its own heap entry.
+        """
+        count = 0
+        heap = self._heap
+        due = self.now() # Jobs falling due during the pass wait for the next one
+        while True:
+            job = self._peek()
+            if job is None or job.deadline > due:
+                return count
+            now = self.now() # After the previous job, so its run time counts as lateness
+            entry = heapq.heappop(heap)
+            late = now - job.deadline
+            if job.period_ms:
+                # Re-arm from the old deadline; skip periods that were missed entirely
+                job.deadline += job.period_ms
+                if job.deadline <= now:
+                    job.deadline += ((now - job.deadline) // job.period_ms + 1) * job.period_ms
+                self._seq += 1
+                entry[0] = job.deadline # The job's own heap entry, reused
+                entry[1] = self._seq
+                heapq.heappush(heap, entry)
+            else:
+                self._jobs.pop(job.name, None)
+            profiler = self.profiler
+            if profiler is not None and job.phase >= 0:
+                if late > profiler.late_ms:
+                    profiler.miss(job.phase)
+                profiler.start(job.phase)
+                job.callback()
+                profiler.stop(job.phase)
+            else:
+                job.callback()
+            count += 1
+
+    def sleep_until_next(self, max_ms=None):
+        """
+        Sleeps exactly until the next deadline (bounded by max_ms if given).
+        """
+        delay = self.time_to_next()
+        if delay is None or (max_ms is not None and delay > max_ms):
+            delay = max_ms
+        if delay:
+            time.sleep_ms(delay)
+
+    def _push(self, job):
+        self.cancel(job.name)
+        self._jobs[job.name] = job
+        self._seq += 1
+        heapq.heappush(self._heap, [job.deadline, self._seq, job])
+        return job
+
+    def _peek(self):
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
@@ -47,6 +47,23 @@ class sdCardManager():
         # Unmount the filesystem
         uos.umount("/sd")
 
+    def append_lines(self, file_name, lines):
+        # Append text lines to a log file on the SD card
+        try:
+            uos.mount(self._vfs,'/sd')
+        except OSError as e:
+            print(f"Errore: {e}")
+            return
+        try:
+            with open("/sd/" + file_name, "a") as file:
+                for line in lines:
+                    file.write(line + "\n")
+        except OSError as e:
+            print(f"Errore: {e}")
+        finally:
+            # A failed write must not leave the card mounted for the next mount
+            uos.umount("/sd")
+
     def if_exist_configuration(self):
         uos.mount(self._vfs,'/sd')
         file_path = "/sd/data.json"
@@ -0,0 +1,161 @@
+from machine import Pin
+import time
+
+
+class SoftClock:
+    """
+    Wall clock derived from time.ticks_ms() between DS3231 reads.
+
+    The RTC is read once, then the current time is the anchor plus the
+    elapsed ticks, so asking for the time costs no I2C traffic. The clock
+    re-anchors every resync_ms, and on a new day so the date follows the
+    RTC. At each re-anchor the difference between the interpolated time and
+    the RTC is recorded as drift.
+
+    The RTC only has second resolution and the anchor read can happen
+    anywhere within a second, so the anchor is taken at mid-second: the
+    interpolated time is within +/-500 ms of the RTC plus the accumulated
+    drift, and single drift samples carry the same quantization.
+    """
+
+    def __init__(self, rtc, resync_ms=600000):
+        """
+        Args:
+            rtc (DS3231_RTC): Reference clock.
+            resync_ms (int): Re-anchor period.
+        """
+        self._rtc = rtc
+        self.resync_ms = resync_ms
+        self._date = None
+        self._anchor_ms = 0 # Milliseconds since midnight at the anchor
+        self._anchor_ticks = 0
+        self._resyncs = 0
+        self._last_drift_ms = 0
+        self._max_drift_ms = 0
+        self._drift_ppm = 0
+
+    def resync(self):
+        """
+        Re-anchors to the RTC now. Call it after setting DS3231_RTC.datetime.
+        """
+        predicted = None
+        if self._date is not None:
+            elapsed = time.ticks_diff(time.ticks_ms(), self._anchor_ticks)
+            predicted = self._anchor_ms + elapsed
+        dt = self._rtc.now()
+        ticks = time.ticks_ms()
+        anchor_ms = (dt[3] * 3600 + dt[4] * 60 + dt[5]) * 1000 + 500
+        if predicted is not None and dt[:3] == self._date:
+            drift = anchor_ms - predicted
+            self._last_drift_ms = drift
+            if abs(drift) > abs(self._max_drift_ms):
+                self._max_drift_ms = drift
+            elapsed = predicted - self._anchor_ms
+            if elapsed > 0:
+                self._drift_ppm = drift * 1000000 // elapsed
+        self._date = dt[:3]
+        self._weekday = dt[6]
+        self._yearday = dt[7]
+        self._anchor_ms = anchor_ms
+        self._anchor_ticks = ticks
+        self._resyncs += 1
+
+    def align(self, ticks):
+        """
+        Snaps the interpolated time at `ticks` (a ticks_ms() value) to the
+        nearest whole second. Call it with the time of a 1 Hz SQW edge, when
+        the RTC seconds register changed.
+        """
+        self._ms_of_day() # Make sure the anchor is valid
+        ms = self._anchor_ms + time.ticks_diff(ticks, self._anchor_ticks)
+        self._anchor_ms = (ms + 500) // 1000 * 1000
+        self._anchor_ticks = ticks
+
+    def _ms_of_day(self):
+        if self._date is None:
+            self.resync()
+        elapsed = time.ticks_diff(time.ticks_ms(), self._anchor_ticks)
+        if elapsed >= self.resync_ms or self._anchor_ms + elapsed >= 86400000:
+            self.resync()
+            elapsed = time.ticks_diff(time.ticks_ms(), self._anchor_ticks)
+        return self._anchor_ms + elapsed
+
+    def seconds(self):
+        """
+        Seconds since midnight. Cheap enough to poll for a changed second.
+        """
+        return self._ms_of_day() // 1000
+
+    def now(self):
+        """
+        Same tuple as DS3231_RTC.now(), without I2C traffic between re-anchors.
+        """
+        s = self.seconds()
+        return self._date + (s // 3600, s // 60 % 60, s % 60, self._weekday, self._yearday)
+
+    @property
+    def time(self) -> str:
+        s = self.seconds()
+        return "{0:02d}:{1:02d}:{2:02d}".format(s // 3600, s // 60 % 60, s % 60)
+
+    def stats(self):
+        """
+        Returns {resyncs, last_drift_ms, max_drift_ms, drift_ppm}; a positive
+        drift means the ticks clock runs slower than the RTC.
+        """
+        return {
+            "resyncs": self._resyncs,
+            "last_drift_ms": self._last_drift_ms,
+            "max_drift_ms": self._max_drift_ms,
+            "drift_ppm": self._drift_ppm,
+        }
+
+
+class SquareWaveTick:
+    """
+    One-second tick from the DS3231 1 Hz square wave.
+
+    The SQW output is open drain and its falling edge marks the seconds
+    register update; a pin IRQ counts the edges and the main loop consumes
+    them with pending(), so nothing is polled over I2C. SQW and the alarm
+    interrupts share the INT/SQW pin: alarms cannot wake the CPU while the
+    square wave is on, but their flags can still be read with check_alarm().
+    """
+
+    def __init__(self, rtc, pin, clock=None):
+        """
+        Args:
+            rtc (DS3231_RTC): Clock whose SQW output is enabled at 1 Hz.
+            pin (Pin): Input wired to INT/SQW, with a pull-up.
+            clock (SoftClock): Aligned to each edge if given.
+        """
+        self._rtc = rtc
+        self._pin = pin
+        self._clock = clock
+        self._edges = 0 # Only written by the IRQ handler
+        self._edge_ticks = 0
+        self._seen = 0
+        self._handler = self._isr # Bind once: no allocation inside the IRQ
+        rtc.square_wave(rtc.FREQ_1)
+        pin.irq(trigger=Pin.IRQ_FALLING, handler=self._handler)
+
+    def _isr(self, pin):
+        self._edge_ticks = time.ticks_ms()
+        self._edges += 1
+
+    def pending(self):
+        """
+        True once per batch of edges since the last call; edges missed by a
+        slow loop are coalesced into one.
+        """
+        edges = self._edges
+        if edges == self._seen:
+            return False
+        self._seen = edges
+        if self._clock is not None:
+            self._clock.align(self._edge_ticks)
+        return True
+
+    def disable(self):
+        self._pin.irq(handler=None)
+        self._rtc.square_wave(False)
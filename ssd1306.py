@@ -22,12 +22,93 @@ SET_DISP_CLK_DIV    = const(0xd5)
 SET_PRECHARGE       = const(0xd9)
 SET_VCOM_DESEL      = const(0xdb)
 SET_CHARGE_PUMP     = const(0x8d)
+# continuous scrolling
+SET_HSCROLL_RIGHT   = const(0x26)
+SET_HSCROLL_LEFT    = const(0x27)
+SET_VHSCROLL_RIGHT  = const(0x29)
+SET_VHSCROLL_LEFT   = const(0x2a)
+SET_VSCROLL_AREA    = const(0xa3)
+SET_SCROLL_OFF      = const(0x2e)
+SET_SCROLL_ON       = const(0x2f)
+
+# Frames between two scroll steps and the interval code selecting them
+SCROLL_INTERVALS = ((2, 0x07), (3, 0x04), (4, 0x05), (5, 0x00), (25, 0x06), (64, 0x01), (128, 0x02), (256, 0x03))
+
+
+# Scaled font glyphs already rendered, see glyph()
+GLYPH_CACHE_SIZE = 48
+_glyphs = {}
+_palette = None
+
+
+def glyph(char, size):
+    """
+    Sprite of one character of the built-in 8x8 font scaled `size` times,
+    as a MONO_VLSB FrameBuffer of 8*size pixels squared. Sprites are cached
+    per (char, size) for all the displays.
+    """
+    key = (char, size)
+    sprite = _glyphs.get(key)
+    if sprite is not None:
+        return sprite
+    source = bytearray(8) # MONO_VLSB 8x8: one byte per column, bit 0 at the top
+    framebuf.FrameBuffer(source, 8, 8, framebuf.MONO_VLSB).text(char, 0, 0, 1)
+    cell = 8 * size
+    data = bytearray(cell * size)
+    fill = (1 << size) - 1
+    for col in range(8):
+        bits = source[col]
+        stretched = 0 # The column with every pixel repeated `size` times
+        for row in range(8):
+            if bits >> row & 1:
+                stretched |= fill << (row * size)
+        x = col * size
+        for page in range(size):
+            value = stretched >> (page * 8) & 0xFF
+            base = page * cell + x
+            for n in range(size):
+                data[base + n] = value
+    sprite = framebuf.FrameBuffer(data, cell, cell, framebuf.MONO_VLSB)
+    if len(_glyphs) >= GLYPH_CACHE_SIZE:
+        _glyphs.clear()
+    _glyphs[key] = sprite
+    return sprite
+
+
+def _inverse_palette():
+    # Blit palette drawing a glyph in color 0 on color 1
+    global _palette
+    if _palette is None:
+        _palette = framebuf.FrameBuffer(bytearray((0x80,)), 2, 1, framebuf.MONO_HLSB)
+    return _palette
+
+
+class FrameTransaction:
+    """
+    Context manager returned by SSD1306.frame(): show() calls inside it are
+    deferred, and one flush happens when the outermost frame exits.
+    """
+
+    def __init__(self, display):
+        self._display = display
+
+    def __enter__(self):
+        self._display._frame_depth += 1
+        return self._display
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        display = self._display
+        display._frame_depth -= 1
+        if display._frame_depth == 0 and display._show_pending:
+            display._show_pending = False
+            display.show()
+        return False
 
 
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
-    def __init__(self, width, height, external_vcc):
+    def __init__(self, width, height, external_vcc, shadow=False):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
@@ -41,19 +122,33 @@ class SSD1306(framebuf.FrameBuffer):
         self.buffer = bytearray((self.pages * self.width) + 1)
         self.buffer[0] = 0x40  # Set first byte of data buffer to Co=0, D/C=1
         super().__init__(memoryview(self.buffer)[1:], self.width, self.height, framebuf.MONO_VLSB)
-        # Provide methods for accessing FrameBuffer graphics primitives. This is a
+        # Keep the FrameBuffer graphics primitives bound under private names: the
+        # public ones below record what they touch before drawing. This is a
         # workround because inheritance from a native class is currently unsupported.
         # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
-        self.fill = super().fill
-        self.pixel = super().pixel
-        self.hline = super().hline
-        self.vline = super().vline
-        self.line = super().line
-        self.rect = super().rect
-        self.fill_rect = super().fill_rect
-        self.text = super().text
-        self.scroll = super().scroll
-        self.blit = super().blit
+        self._fill = super().fill
+        self._pixel = super().pixel
+        self._hline = super().hline
+        self._vline = super().vline
+        self._line = super().line
+        self._rect = super().rect
+        self._fill_rect = super().fill_rect
+        self._text = super().text
+        self._scroll = super().scroll
+        self._blit = super().blit
+        # Dirty column span of each page, first > last when the page is clean
+        self._dirty_x0 = bytearray(self.pages)
+        self._dirty_x1 = bytearray(self.pages)
+        self._clean()
+        self._shadow = None # Copy of the panel RAM, see the shadow property
+        self._shadow_valid = False
+        self.shadow = shadow
+        self._window = None # Address window the panel is set to, see window_commands()
+        self._frame = FrameTransaction(self) # Reused by every frame()
+        self._frame_depth = 0
+        self._show_pending = False
+        self._hw_scroll = False
+        self.reset_stats()
         self.poweron()
         self.init_display()
 
@@ -62,8 +157,11 @@ class SSD1306(framebuf.FrameBuffer):
         return self._char_dimension   
 
     def init_display(self):
-        for cmd in (
+        self._window = None
+        self._hw_scroll = False
+        self.write_cmds((
             SET_DISP | 0x00,  # off
+            SET_SCROLL_OFF,  # a soft reset of the board leaves the panel scrolling
             # address setting
             SET_MEM_ADDR, 0x00,  # horizontal
             # resolution and layout
@@ -83,8 +181,7 @@ class SSD1306(framebuf.FrameBuffer):
             SET_NORM_INV,  # not inverted
             # charge pump
             SET_CHARGE_PUMP, 0x10 if self.external_vcc else 0x14,
-            SET_DISP | 0x01,):  # on
-            self.write_cmd(cmd)
+            SET_DISP | 0x01,))  # on
         self.fill(0)
         self.show()
  
@@ -95,8 +192,12 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_DISP | 0x01)
  
     def contrast(self, contrast):
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds((SET_CONTRAST, contrast))
+
+    def write_cmds(self, cmds):
+        """Sends a sequence of commands; the interfaces batch them in one transfer."""
+        for cmd in cmds:
+            self.write_cmd(cmd)
  
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
@@ -106,12 +207,12 @@ class SSD1306(framebuf.FrameBuffer):
         - image array byte in hex 
         """
         buf_temp = framebuf.FrameBuffer(img, w, h, framebuf.MONO_HLSB)
-        self.blit(buf_temp, 0, 0)
+        self.blit(buf_temp, 0, 0, w=w, h=h)
         self.show()  
 
     def show_custom_char(self, img, x, y):
         fb = framebuf.FrameBuffer(img, 8, 8, framebuf.MONO_HLSB)
-        self.blit(fb, x, y)
+        self.blit(fb, x, y, w=8, h=8)
         #self.show()
     
     def show_fill_button_with_text(self, _text, _x, _y, _w , _h):
@@ -130,7 +231,7 @@ class SSD1306(framebuf.FrameBuffer):
         y_pixel = _y +(int((_h - 8)/2) if _h > 0 else 0)
         self.text(_text, x_pixel , y_pixel, 1)    
 
-    def write_text(self, _text, x, y, size):
+    def write_text(self, _text, x, y, size, c=1):
         ''' Method to write Text on OLED/LCD Displays with a variable font size
 
             Args:
@@ -138,71 +239,296 @@ class SSD1306(framebuf.FrameBuffer):
                 x: x co-ordinate of starting position
                 y: y co-ordinate of starting position
                 size: font size of text
-                color: color of text to be displayed
+                c: color of text to be displayed
+
+            Every character is one blit of a cached glyph (see glyph()) drawn
+            opaque over its cell, so the rest of the screen is left as it is.
         '''
-        background = 0
-        # clear screen
-        self.fill(background)
-        info = []
-        # Creating reference characters to read their values
-        self.text(_text, x, y)
-        for i in range(x, x + (8 * len(_text))):
-            for j in range(y, y + 8):
-                # Fetching and saving details of pixels, such as
-                # x co-ordinate, y co-ordinate, and color of the pixel
-                px_color = self.pixel(i, j)                
-                info.append((i, j, px_color))
-        # Clearing the reference characters from the screen
-        self.text(_text, x, y, background)        
-        # Writing the custom-sized font characters on screen
-        for px_info in info:
-            self.fill_rect(size * px_info[0] - (size - 1) * x,
-                           size * px_info[1] - (size - 1) * y,
-                           size, size, px_info[2])
+        cell = self._char_dimension * size
+        self._mark(x, y, len(_text) * cell, cell)
+        palette = None if c else _inverse_palette()
+        for char in _text:
+            if palette is None:
+                self._blit(glyph(char, size), x, y)
+            else:
+                self._blit(glyph(char, size), x, y, -1, palette)
+            x += cell
+
+    # --- Drawing primitives with dirty-region tracking ---
+
+    def fill(self, c):
+        self._mark_all()
+        self._fill(c)
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return self._pixel(x, y)
+        self._mark(x, y, 1, 1)
+        self._pixel(x, y, c)
+
+    def hline(self, x, y, w, c):
+        self._mark(x, y, w, 1)
+        self._hline(x, y, w, c)
+
+    def vline(self, x, y, h, c):
+        self._mark(x, y, 1, h)
+        self._vline(x, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        self._mark(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+        self._line(x1, y1, x2, y2, c)
+
+    def rect(self, x, y, w, h, c):
+        self._mark(x, y, w, h)
+        self._rect(x, y, w, h, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._mark(x, y, w, h)
+        self._fill_rect(x, y, w, h, c)
+
+    def text(self, s, x, y, c=1):
+        self._mark(x, y, len(s) * self._char_dimension, self._char_dimension)
+        self._text(s, x, y, c)
+
+    def scroll(self, xstep, ystep):
+        self._mark_all()
+        self._scroll(xstep, ystep)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None, w=None, h=None):
+        """
+        w and h give the size of fbuf (a FrameBuffer does not expose it);
+        without them the whole screen is marked as changed.
+        """
+        if w is None or h is None:
+            self._mark_all()
+        else:
+            self._mark(x, y, w, h)
+        if palette is None:
+            self._blit(fbuf, x, y, key)
+        else:
+            self._blit(fbuf, x, y, key, palette)
+
+    def mark_dirty(self, x, y, w, h):
+        """For code writing self.buffer directly: the area to send at the next show()."""
+        self._mark(x, y, w, h)
+
+    def _mark(self, x, y, w, h):
+        x0 = x if x > 0 else 0
+        x1 = x + w - 1 if x + w <= self.width else self.width - 1
+        y0 = y if y > 0 else 0
+        y1 = y + h - 1 if y + h <= self.height else self.height - 1
+        if x0 > x1 or y0 > y1:
+            return
+        dirty_x0 = self._dirty_x0
+        dirty_x1 = self._dirty_x1
+        for page in range(y0 >> 3, (y1 >> 3) + 1):
+            if x0 < dirty_x0[page]:
+                dirty_x0[page] = x0
+            if x1 > dirty_x1[page]:
+                dirty_x1[page] = x1
+
+    def _clean(self):
+        for page in range(self.pages):
+            self._dirty_x0[page] = 255
+            self._dirty_x1[page] = 0
+
+    def _mark_all(self):
+        for page in range(self.pages):
+            self._dirty_x0[page] = 0
+            self._dirty_x1[page] = self.width - 1
+
+    def invalidate(self):
+        """Sends the whole frame at the next show(), e.g. after the panel lost its RAM."""
+        self._mark_all()
+        self._shadow_valid = False
+        self._window = None
+
+    @property
+    def shadow(self):
+        """
+        With a shadow copy of the last frame sent (one more framebuffer of
+        RAM), show() compares each dirty page with it and leaves out the
+        pages redrawn with the same content.
+        """
+        return self._shadow is not None
+
+    @shadow.setter
+    def shadow(self, value):
+        if value and self._shadow is None:
+            self._shadow = bytearray(len(self.buffer))
+            self._shadow_valid = False
+        elif not value:
+            self._shadow = None
+
+    def dirty_windows(self):
+        """
+        Windows to send, as (x0, x1, first page, last page): runs of
+        consecutive changed pages, each with the union of their column spans.
+        """
+        windows = []
+        dirty_x0 = self._dirty_x0
+        dirty_x1 = self._dirty_x1
+        page = 0
+        while page < self.pages:
+            if dirty_x0[page] > dirty_x1[page]:
+                page += 1
+                continue
+            first = page
+            x0 = dirty_x0[page]
+            x1 = dirty_x1[page]
+            page += 1
+            while page < self.pages and dirty_x0[page] <= dirty_x1[page]:
+                x0 = min(x0, dirty_x0[page])
+                x1 = max(x1, dirty_x1[page])
+                page += 1
+            windows.append((x0, x1, first, page - 1))
+        return windows
+
+    def frame(self):
+        """
+        Groups the drawing of a whole screen into one flush:
+
+            with display.frame():
+                menu.draw() # Its show() is deferred to the end of the block
+
+        Frames can be nested; only the outermost one flushes.
+        """
+        return self._frame
 
     def show(self):
-        x0 = 0
-        x1 = self.width - 1
+        """
+        Sends only what changed since the last show(): each dirty window is
+        selected with SET_COL_ADDR/SET_PAGE_ADDR and written on its own.
+        With the shadow copy, pages redrawn unchanged are left out too.
+        Nothing is sent when nothing changed. Inside frame() the flush waits
+        for the end of the frame. Drawing during a hardware scroll stops it.
+        """
+        if self._frame_depth:
+            self._show_pending = True
+            self.flushes_deferred += 1
+            return
+        if self._hw_scroll:
+            # The RAM must not be written while the controller scrolls it
+            if not self.dirty_windows():
+                self.flushes_skipped += 1
+                return
+            self.hw_scroll_stop()
+        if self._shadow is not None and not self._shadow_valid:
+            self._mark_all()
+        windows = self.dirty_windows()
+        self._clean()
+        if windows and self._shadow is not None:
+            windows = self._changed_windows(windows)
+        if not windows:
+            self.flushes_skipped += 1
+            return
+        self.flushes += 1
+        for x0, x1, p0, p1 in windows:
+            self.windows += 1
+            self.pages_sent += p1 - p0 + 1
+            self.bytes_sent += (x1 - x0 + 1) * (p1 - p0 + 1)
+            self.write_window(x0, x1, p0, p1)
+
+    def _changed_windows(self, windows):
+        """
+        Splits the dirty windows into the runs of pages that differ from the
+        shadow copy, which is updated with them. Each span is compared and
+        copied with slice operations, which run in C; memoryview slices do
+        not compare by content on MicroPython, so bytearray slices are used.
+        """
+        buffer = self.buffer
+        shadow = self._shadow
+        if not self._shadow_valid:
+            shadow[:] = buffer
+            self._shadow_valid = True
+            return windows
+        width = self.width
+        changed = []
+        for x0, x1, p0, p1 in windows:
+            first = None
+            for page in range(p0, p1 + 2):
+                if page <= p1:
+                    start = 1 + page * width + x0
+                    end = 2 + page * width + x1
+                    if buffer[start:end] != shadow[start:end]:
+                        shadow[start:end] = buffer[start:end]
+                        if first is None:
+                            first = page
+                        continue
+                if first is not None:
+                    changed.append((x0, x1, first, page - 1))
+                    first = None
+        return changed
+
+    def window_commands(self, x0, x1, p0, p1):
+        """
+        SET_COL_ADDR/SET_PAGE_ADDR commands selecting a window, or None when
+        the panel already has it: after a whole window is written the
+        address pointer wraps back to its first byte, so the next flush of
+        the same window needs no commands.
+        """
+        window = (x0, x1, p0, p1)
+        if window == self._window:
+            self.windows_reused += 1
+            return None
+        self._window = window
         if self.width == 64:
             # displays with width of 64 pixels are shifted by 32
             x0 += 32
             x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_framebuf()
+        return (SET_COL_ADDR, x0, x1, SET_PAGE_ADDR, p0, p1)
+
+    def window_slices(self, x0, x1, p0, p1):
+        """
+        Framebuffer bytes of a window as memoryview slices, one per page, or
+        a single slice when the window spans the whole width.
+        """
+        view = memoryview(self.buffer)
+        width = self.width
+        if x0 == 0 and x1 == width - 1:
+            return [view[1 + p0 * width:1 + (p1 + 1) * width]]
+        return [view[1 + page * width + x0:2 + page * width + x1] for page in range(p0, p1 + 1)]
+
+    def stats(self):
+        return {"flushes": self.flushes, "skipped": self.flushes_skipped, "deferred": self.flushes_deferred,
+                "windows": self.windows,
+                "reused": self.windows_reused, "pages": self.pages_sent, "bytes": self.bytes_sent}
+
+    def reset_stats(self):
+        self.flushes = 0
+        self.flushes_skipped = 0 # show() calls that sent nothing
+        self.flushes_deferred = 0 # show() calls merged into the flush of a frame()
+        self.windows = 0
+        self.windows_reused = 0 # Windows flushed without address commands
+        self.pages_sent = 0
+        self.bytes_sent = 0
 
     def scroll_portion(self, screen, _w, _h):
         self.text(screen[0][2], screen[0][0], screen[0][1])
-        self.show()        
+        self.show()
         # Scroll a portion of the screen
         for i in range(_h):
             self.fill(0)
             self.text(screen[0][2], screen[0][0], screen[0][1] + i)
             self.show()
-            time.sleep(0.05)
+            time.sleep_ms(50)
 
         self.text(screen[1][2], screen[1][0], screen[1][1])
         self.show()
-         
+
         for j in range(_h):
             self.fill(0)
             self.text(screen[0][2], screen[0][0], _h)
             self.text(screen[1][2], screen[1][0], screen[1][1] - j)
             self.show()
-            time.sleep(0.05)
+            time.sleep_ms(50)
     
     def clear_portion(self, x, y, w, h):
         '''
             Clear the same portion
         '''    
-        for i in range(x, x + w):    
-            for j in range(y, y + h):
-                self.pixel(i, j, 0)
-                self.show()
+        self.fill_rect(x, y, w, h, 0)
+        self.show()
  
     def head(self, _text):
         text_size = len(_text)
@@ -227,6 +553,65 @@ class SSD1306(framebuf.FrameBuffer):
             self.show_fill_button_with_text("=>", 105, 54, 25 , 13)
         #self.oled.show()
 
+    # --- Hardware scrolling ---
+
+    @property
+    def hw_scrolling(self):
+        return self._hw_scroll
+
+    def _scroll_interval(self, frames):
+        for step, code in SCROLL_INTERVALS:
+            if frames <= step:
+                return code
+        return SCROLL_INTERVALS[-1][1]
+
+    def _start_hw_scroll(self, setup):
+        # Whatever was drawn must reach the RAM before the controller moves it
+        self.show()
+        self.write_cmds((SET_SCROLL_OFF,) + setup + (SET_SCROLL_ON,))
+        self._hw_scroll = True
+
+    def hw_scroll_h(self, direction=1, start_page=0, end_page=None, frames=5):
+        """
+        Starts the controller's continuous horizontal scroll of pages
+        start_page..end_page, one column every `frames` display frames (2,
+        3, 4, 5, 25, 64, 128 or 256), to the right or (direction < 0) to the
+        left, wrapping around. It costs no bus traffic and no CPU until
+        hw_scroll_stop() or the next show() with something new drawn.
+        Call it outside frame().
+        """
+        end_page = self.pages - 1 if end_page is None else end_page
+        self._start_hw_scroll((SET_HSCROLL_RIGHT if direction > 0 else SET_HSCROLL_LEFT, 0x00,
+                               start_page, self._scroll_interval(frames), end_page, 0x00, 0xFF))
+
+    def hw_scroll_v(self, rows=1, top=0, area=None, start_page=0, end_page=0, direction=1, frames=5):
+        """
+        Starts the continuous vertical scroll of the `area` rows below the
+        fixed `top` rows, `rows` rows up every `frames` display frames. The
+        command always moves pages start_page..end_page sideways as well:
+        point them at a blank page for a purely vertical movement.
+        """
+        area = self.height - top if area is None else area
+        self._start_hw_scroll((SET_VSCROLL_AREA, top, area,
+                               SET_VHSCROLL_RIGHT if direction > 0 else SET_VHSCROLL_LEFT, 0x00,
+                               start_page, self._scroll_interval(frames), end_page, rows))
+
+    def hw_scroll_stop(self):
+        """
+        Stops a hardware scroll. The controller leaves its RAM shifted, so the
+        next show() sends the whole frame again.
+        """
+        self.write_cmd(SET_SCROLL_OFF)
+        self._hw_scroll = False
+        self.invalidate()
+
+    def _text_pages(self, screen):
+        used = 0
+        for line in screen:
+            for page in range(max(line[1], 0) >> 3, min((line[1] + 7) >> 3, self.pages - 1) + 1):
+                used |= 1 << page
+        return used
+
     def scroll_out_screen(self, speed):
         """
         Scroll out horizontally
@@ -234,17 +619,20 @@ class SSD1306(framebuf.FrameBuffer):
         The speed must be a divisor of 128 (oled_width).
         - speed is a number
         """
-        for i in range ((self.width+1)/speed):
-            for j in range (self.height):
-                self.pixel(i, j, 0)
+        for i in range ((self.width+1)//speed):
+            self.vline(i, 0, self.height, 0)
             self.scroll(speed,0)
             self.show()
 
-    def scroll_screen_in_out(self, screen):
+    def scroll_screen_in_out(self, screen, hardware=True):
         """
         Continuous horizontal scroll
         If you want to scroll the screen in and out continuously,
         you can use the scroll_screen_in_out(screen) function instead.
+        With hardware=True the rows are drawn once and the controller
+        scrolls them until hw_scroll_stop(); otherwise, or when no row is
+        on the screen, the text makes one pass, redrawn and sent for every
+        pixel.
         
         - screen = [[0, 0 , screen1_row1], [0, 16, screen1_row2], [0, 32, screen1_row3]]
         Each list of the list contains the x coordinate,
@@ -256,6 +644,14 @@ class SSD1306(framebuf.FrameBuffer):
         screen1_row3 = "Screen 1, row 3"
 
         """
+        used = self._text_pages(screen)
+        pages = [page for page in range(self.pages) if used >> page & 1]
+        if hardware and pages:
+            self.fill(0)
+            for line in screen:
+                self.text(line[2], line[0], line[1])
+            self.hw_scroll_h(1, pages[0], pages[-1])
+            return
         for i in range (0, (self.width+1)*2, 1):
             for line in screen:
                 self.text(line[2], -self.width+i, line[1])
@@ -284,19 +680,28 @@ class SSD1306(framebuf.FrameBuffer):
         the scrolling speed that must be a number divisor of 64 (oled_height).
         - speed is a number 
         """
-        for i in range ((self.height+1)/speed):
-            for j in range (self.width):
-                self.pixel(j, i, 0)
+        for i in range ((self.height+1)//speed):
+            self.hline(0, i, self.width, 0)
             self.scroll(0,speed)
             self.show()  
 
-    def scroll_screen_in_out_v(self, screen):
+    def scroll_screen_in_out_v(self, screen, hardware=True):
         """
         Continuous vertical scroll
         If you want to scroll the screen in and out vertically continuously,
         you can use the scroll_in_out_screen_v(screen) function.
         - screen is a list of [x, y, message]
+        The hardware scroll needs a page without text for the sideways part
+        of the command; without one the software scroll is used.
         """
+        used = self._text_pages(screen)
+        blank = [page for page in range(self.pages) if not used >> page & 1]
+        if hardware and blank:
+            self.fill(0)
+            for line in screen:
+                self.text(line[2], line[0], line[1])
+            self.hw_scroll_v(1, start_page=blank[0], end_page=blank[0])
+            return
         for i in range (0, (self.height*2+1), 1):
             for line in screen:
                 self.text(line[2], line[0], -self.height+i+line[1])
@@ -307,24 +712,45 @@ class SSD1306(framebuf.FrameBuffer):
      
 
 class SSD1306_I2C(SSD1306):
-    def __init__(self, width, height, i2c, addr=0x3c, external_vcc=False):
+    def __init__(self, width, height, i2c, addr=0x3c, external_vcc=False, shadow=False):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
-        super().__init__(width, height, external_vcc)
+        self._window_cache = {} # Window commands already framed for the bus
+        super().__init__(width, height, external_vcc, shadow)
  
     def write_cmd(self, cmd):
         self.temp[0] = 0x80 # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        # Co=0, D/C#=0: every byte after the control byte is a command
+        self.i2c.writeto(self.addr, b"\x00" + bytes(cmds))
+
     def write_framebuf(self):
         # Blast out the frame buffer using a single I2C transaction to support
         # hardware I2C interfaces.
         self.i2c.writeto(self.addr, self.buffer)
 
+    def write_window(self, x0, x1, p0, p1):
+        # One transaction: the window commands, each with Co=1, then the data
+        # control byte (Co=0, D/C#=1) and the page slices
+        vector = [b"\x40"] + self.window_slices(x0, x1, p0, p1)
+        cmds = self.window_commands(x0, x1, p0, p1)
+        if cmds is not None:
+            framed = self._window_cache.get(cmds)
+            if framed is None:
+                if len(self._window_cache) >= 16:
+                    self._window_cache = {}
+                framed = bytes(b for cmd in cmds for b in (0x80, cmd))
+                self._window_cache[cmds] = framed
+            vector.insert(0, framed)
+        self.i2c.writevto(self.addr, vector)
+
     def write_data(self, buf):
+        self._window = None # The address pointer moves
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)    
 
@@ -332,7 +758,7 @@ class SSD1306_I2C(SSD1306):
         pass    
 
 class SSD1306_SPI(SSD1306):
-    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
+    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False, shadow=False):
         self.rate = 10 * 1024 * 1024
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
@@ -343,7 +769,7 @@ class SSD1306_SPI(SSD1306):
         self.cs = cs
         self.buffer = bytearray((height // 8) * width)
         self.framebuf = framebuf.FrameBuffer1(self.buffer, width, height)
-        super().__init__(width, height, external_vcc)
+        super().__init__(width, height, external_vcc, shadow)
 
     def write_cmd(self, cmd):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
@@ -361,6 +787,26 @@ class SSD1306_SPI(SSD1306):
         self.spi.write(self.buffer)
         self.cs.high()
 
+    def write_cmds(self, cmds):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs.high()
+        self.dc.low()
+        self.cs.low()
+        self.spi.write(bytes(cmds))
+        self.cs.high()
+
+    def write_window(self, x0, x1, p0, p1):
+        cmds = self.window_commands(x0, x1, p0, p1)
+        if cmds is not None:
+            self.write_cmds(cmds)
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs.high()
+        self.dc.high()
+        self.cs.low()
+        for part in self.window_slices(x0, x1, p0, p1):
+            self.spi.write(part)
+        self.cs.high()
+
     def poweron(self):
         self.res.high()
         time.sleep_ms(1)
@@ -0,0 +1,138 @@
+import time
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+STATUS_SKIPPED = "skipped"
+
+
+class BootTimeline:
+    """
+    Start time, duration and outcome of every boot stage, relative to the
+    moment the timeline was created, plus the time to the first frame.
+    """
+
+    def __init__(self):
+        self._t0 = time.ticks_ms()
+        self._stages = []
+        self.first_frame_ms = None
+
+    def elapsed(self):
+        """Milliseconds since boot started."""
+        return time.ticks_diff(time.ticks_ms(), self._t0)
+
+    def record(self, name, start_ms, duration_ms, status):
+        """
+        Records a finished stage run. Only the latest run of each stage is
+        kept, so stages repeated after boot (the periodic time sync) do
+        not grow the timeline.
+        """
+        stages = self._stages
+        for i in range(len(stages)):
+            if stages[i][0] == name:
+                del stages[i]
+                break
+        stages.append((name, start_ms, duration_ms, status))
+
+    def mark_first_frame(self):
+        self.first_frame_ms = self.elapsed()
+
+    def status(self, name):
+        """Outcome of the latest run of a finished stage, or None."""
+        for stage in self._stages:
+            if stage[0] == name:
+                return stage[3]
+        return None
+
+    @property
+    def stages(self):
+        return self._stages
+
+    def report(self):
+        """Returns the timeline as printable lines."""
+        lines = ["boot: first frame at {} ms".format(self.first_frame_ms)]
+        for name, start, duration, status in self._stages:
+            lines.append("boot: {} @{} ms took {} ms: {}".format(name, start, duration, status))
+        return lines
+
+
+class BootPipeline:
+    """
+    Startup split into foreground and background stages.
+
+    Foreground stages (run()) block and must succeed: they bring up what the
+    first frame needs. Background stages (defer()) run one at a time from the
+    main loop through step(). A stage step returns True when it is finished,
+    anything else to be called again on the next step, so slow operations
+    can be polled instead of waited for. A stage still pending after its
+    timeout, or one raising an exception, is abandoned and the next begins.
+    """
+
+    def __init__(self, timeline=None):
+        self.timeline = timeline or BootTimeline()
+        self._pending = []
+        self._current = None
+        self._started = 0
+
+    def run(self, name, callback):
+        """
+        Runs a foreground stage and returns its result. Exceptions are
+        recorded and re-raised.
+        """
+        start = self.timeline.elapsed()
+        try:
+            result = callback()
+        except Exception:
+            self.timeline.record(name, start, self.timeline.elapsed() - start, STATUS_FAILED)
+            raise
+        self.timeline.record(name, start, self.timeline.elapsed() - start, STATUS_OK)
+        return result
+
+    def defer(self, name, step, timeout_ms, requires=None):
+        """
+        Queues a background stage. If `requires` names another stage that
+        did not succeed, this one is skipped.
+        """
+        self._pending.append((name, step, timeout_ms, requires))
+
+    @property
+    def done(self):
+        return self._current is None and not self._pending
+
+    def step(self):
+        """
+        Advances the current background stage by one step.
+        Returns False once every stage has finished.
+        """
+        if self._current is None:
+            if not self._pending:
+                return False
+            self._current = self._pending.pop(0)
+            self._started = self.timeline.elapsed()
+            requires = self._current[3]
+            if requires is not None and self.timeline.status(requires) != STATUS_OK:
+                return self._finish(STATUS_SKIPPED)
+
+        name, step, timeout_ms, requires = self._current
+        try:
+            finished = step()
+        except Exception as e:
+            print(f"Boot stage {name} failed: {e}")
+            return self._finish(STATUS_FAILED)
+        if finished is True:
+            return self._finish(STATUS_OK)
+        if self.timeline.elapsed() - self._started >= timeout_ms:
+            return self._finish(STATUS_TIMEOUT)
+        return True
+
+    def run_all(self, step_ms=50):
+        """Runs the background stages to completion, blocking."""
+        while self.step():
+            if self._current is not None:
+                time.sleep_ms(step_ms) # A stage is waiting on something
+
+    def _finish(self, status):
+        start = self._started
+        self.timeline.record(self._current[0], start, self.timeline.elapsed() - start, status)
+        self._current = None
+        return not self.done
@@ -0,0 +1,51 @@
+"""
+I2C transactions and host time per DS3231_RTC call, measured on the
+register emulator. Run from the repository root:
+
+    python test/bench_ds3231.py
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from micropython_fakes import FakeTime, HOST_TIME, install_micropython_mocks
+
+install_micropython_mocks()
+
+import ds3231
+from ds3231 import DS3231_RTC
+from ds3231_emulator import DS3231Emulator
+
+CALLS = 2000
+
+
+def bench(name, rtc, device, call):
+    call() # Warm-up, e.g. the first oscillator stop flag check
+    device.reset_counters()
+    t0 = HOST_TIME.perf_counter()
+    for _ in range(CALLS):
+        call()
+    elapsed = HOST_TIME.perf_counter() - t0
+    print("{:<20} {:>6.2f} transactions/call {:>8.1f} us/call".format(
+        name, device.transactions / CALLS, elapsed / CALLS * 1e6))
+
+
+def main():
+    ds3231.time = FakeTime() # ticks_ms for the oscillator stop flag interval
+    device = DS3231Emulator()
+    rtc = DS3231_RTC(device)
+    rtc.datetime = (2025, 3, 14, 15, 9, 26, 5)
+    bench("now()", rtc, device, rtc.now)
+    bench("datetime", rtc, device, lambda: rtc.datetime)
+    bench("time", rtc, device, lambda: rtc.time)
+    bench("hour", rtc, device, lambda: rtc.hour)
+    bench("unix_epoch_time()", rtc, device, rtc.unix_epoch_time)
+    bench("temperature()", rtc, device, rtc.temperature)
+    bench("check_alarm(2)", rtc, device, lambda: rtc.check_alarm(2))
+    bench("alarm2()", rtc, device, lambda: rtc.alarm2((0, 8, 1)))
+
+
+if __name__ == "__main__":
+    main()
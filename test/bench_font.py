@@ -0,0 +1,80 @@
+"""
+Cost of drawing scaled text with SSD1306.write_text: the former renderer,
+which cleared the screen, read every pixel of the string back and drew one
+fill_rect per pixel, against one blit per character from the glyph cache.
+Counts the FrameBuffer calls per string (what costs on the board) and the
+host time. Run from the repository root:
+
+    python test/bench_font.py
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from micropython_fakes import install_fake_framebuf, install_micropython_mocks
+
+install_micropython_mocks('machine')
+install_fake_framebuf()
+
+import ssd1306
+from ssd1306_emulator import SSD1306Emulator
+
+STRINGS = (("25", 2), ("530", 2), ("7.12", 2), ("12:30", 3))
+REPEAT = 20
+PRIMITIVES = ("_fill", "_pixel", "_text", "_fill_rect", "_blit")
+
+
+def legacy_write_text(display, _text, x, y, size):
+    """write_text as it was before the glyph cache."""
+    background = 0
+    display.fill(background)
+    info = []
+    display.text(_text, x, y)
+    for i in range(x, x + (8 * len(_text))):
+        for j in range(y, y + 8):
+            px_color = display.pixel(i, j)
+            info.append((i, j, px_color))
+    display.text(_text, x, y, background)
+    for px_info in info:
+        display.fill_rect(size * px_info[0] - (size - 1) * x,
+                          size * px_info[1] - (size - 1) * y,
+                          size, size, px_info[2])
+
+
+def count_calls(display):
+    """Wraps the bound FrameBuffer primitives with a shared call counter."""
+    calls = [0]
+    for name in PRIMITIVES:
+        native = getattr(display, name)
+        def counted(*args, native=native):
+            calls[0] += 1
+            return native(*args)
+        setattr(display, name, counted)
+    return calls
+
+
+def bench(name, draw):
+    display = ssd1306.SSD1306_I2C(128, 64, SSD1306Emulator())
+    calls = count_calls(display)
+    for text, size in STRINGS:
+        ssd1306._glyphs.clear()
+        draw(display, text, 0, 0, size) # Builds the glyphs
+        calls[0] = 0
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            draw(display, text, 0, 0, size)
+        elapsed = (time.perf_counter() - start) * 1000 / REPEAT
+        print("{:<12} {:<6} x{} {:>6.0f} calls/string {:>8.2f} ms/string (host)".format(
+            name, text, size, calls[0] / REPEAT, elapsed))
+
+
+def main():
+    bench("fill_rect", legacy_write_text)
+    bench("glyph cache", lambda display, *args: display.write_text(*args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Bytes on the I2C wire and flush time of SSD1306_I2C.show() for the main
+screen clock and for menu screens, measured on the controller emulator:
+full frame, dirty windows only, and dirty windows diffed against the
+shadow copy. Run from the repository root:
+
+    python test/bench_ssd1306.py
+"""
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from micropython_fakes import install_fake_framebuf, install_fake_time, install_micropython_mocks
+
+install_micropython_mocks('machine', 'network', 'urequests', 'ntptime', 'sdcard', 'uos', '_thread')
+install_fake_framebuf()
+clock = install_fake_time() # The clock and the RTC only move when the bench says so
+
+import ssd1306
+import viewer
+from Config import Config
+from ds3231_emulator import DS3231Emulator
+from ssd1306_emulator import SSD1306Emulator
+
+FRAMES = 20
+
+
+class Bus:
+    """Routes each transaction to the emulated device at its address."""
+
+    def __init__(self, *devices):
+        self.devices = {device.addr: device for device in devices}
+
+    def __getattr__(self, name):
+        devices = self.devices
+        return lambda addr, *args: getattr(devices[addr], name)(addr, *args)
+
+
+MODES = ("full", "dirty", "shadow")
+
+
+def make_viewer(mode):
+    panel = SSD1306Emulator()
+    view = viewer.Viewer(i2c=Bus(panel, DS3231Emulator()), config=Config(), deferred=True)
+    view.display.shadow = mode == "shadow"
+    view.build_menu()
+    view.show_first_frame()
+    panel.reset_counters()
+    return view, panel
+
+
+def before_frame(display, mode):
+    if mode == "full":
+        display.invalidate() # What every show() sent before the dirty tracking
+
+
+def report(name, panel, mode):
+    print("{:<20} {:<7} {:>7.0f} bytes/frame {:>5.1f} transactions/frame {:>6.2f} ms/frame".format(
+        name, mode, panel.bytes / FRAMES, panel.transactions / FRAMES, panel.wire_time_us / FRAMES / 1000))
+
+
+def bench_main_screen_clock(mode):
+    view, panel = make_viewer(mode)
+    for _ in range(FRAMES):
+        clock.advance(1000)
+        before_frame(view.display, mode)
+        view.run()
+    return panel
+
+
+def bench_menu_navigation(mode):
+    view, panel = make_viewer(mode)
+    menu = view.menu
+    for step in range(FRAMES):
+        before_frame(view.display, mode)
+        menu.move(1 if step % 4 else -1)
+    return panel
+
+
+def bench_menu_no_op_shift(mode):
+    view, panel = make_viewer(mode)
+    menu = view.menu
+    menu.draw()
+    panel.reset_counters()
+    for _ in range(FRAMES):
+        before_frame(view.display, mode)
+        menu.shift(1) # A list ignores left/right but redraws
+    return panel
+
+
+def bench_monitoring_update(mode):
+    view, panel = make_viewer(mode)
+    monitor = viewer.MenuMonitoringSensor(view.display, 'MONITORING')
+    monitor.click()
+    panel.reset_counters()
+    for _ in range(FRAMES):
+        before_frame(view.display, mode)
+        monitor.updatingValues(530, 25) # Same reading as before
+    return panel
+
+
+def bench_init():
+    panel = SSD1306Emulator()
+    ssd1306.SSD1306_I2C(128, 64, panel)
+    print("{:<28} {:>7} bytes       {:>5} transactions       {:>6.2f} ms".format(
+        "init display", panel.bytes, panel.transactions, panel.wire_time_us / 1000))
+
+
+def main():
+    bench_init()
+    for bench in (bench_main_screen_clock, bench_menu_navigation, bench_menu_no_op_shift, bench_monitoring_update):
+        for mode in MODES:
+            log = io.StringIO()
+            with redirect_stdout(log): # Relay and RTC messages from the viewer
+                panel = bench(mode)
+            report(bench.__name__[6:].replace("_", " "), panel, mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# Import the host fakes before any test module runs: test modules replace
+# sys.modules['time'] at import time, and micropython_fakes keeps a handle on
+# the real host time module for tests that need wall-clock time (e.g. threads).
+import micropython_fakes  # noqa: F401
@@ -0,0 +1,216 @@
+"""
+Register-level emulator of a DS3231 on an I2C bus, for host tests and
+benchmarks of ds3231.DS3231_RTC.
+
+It implements the machine.I2C memory methods the driver uses, so
+DS3231_RTC(DS3231Emulator()) works unchanged. The time registers follow a
+virtual clock that only moves with advance(); alarms, the INT/SQW output
+and the status flags behave as described in the datasheet, and every bus
+transaction is counted.
+"""
+from datetime import datetime, timedelta
+
+DS3231_ADDR = 0x68
+REGISTER_COUNT = 19
+
+SECONDS_REG = 0x00
+WEEKDAY_REG = 0x03
+ALARM1_REG = 0x07
+ALARM2_REG = 0x0B
+CONTROL_REG = 0x0E
+STATUS_REG = 0x0F
+AGING_REG = 0x10
+TEMPERATURE_REG = 0x11
+
+# Control register bits
+A1IE = 0x01
+A2IE = 0x02
+INTCN = 0x04
+RS_MASK = 0x18
+CONV = 0x20
+# Status register bits
+A1F = 0x01
+A2F = 0x02
+BSY = 0x04
+EN32KHZ = 0x08
+OSF = 0x80
+
+_MASK = 0x80 # Alarm register "don't care" bit
+_DYDT = 0x40 # Alarm day register: weekday (1) or date (0)
+
+
+def to_bcd(value):
+    return (value // 10) << 4 | value % 10
+
+
+def from_bcd(value):
+    return (value >> 4) * 10 + (value & 0x0F)
+
+
+class DS3231Emulator:
+    """
+    In-memory DS3231.
+
+    regs is the whole register file and can be inspected or poked directly;
+    the time registers are kept in sync with the virtual clock. The device
+    powers up as a real one does: oscillator stop flag set, INTCN set, the
+    32 kHz output on, time 2000-01-01 00:00:00.
+    """
+
+    def __init__(self, start=None, addr=DS3231_ADDR):
+        self.addr = addr
+        self.regs = bytearray(REGISTER_COUNT)
+        self.regs[CONTROL_REG] = INTCN | RS_MASK
+        self.regs[STATUS_REG] = OSF | EN32KHZ
+        self.reads = 0
+        self.writes = 0
+        self.register_reads = [0] * REGISTER_COUNT # Reads per starting register
+        self.sqw_edges = 0 # 1 Hz square-wave falling edges
+        self.conversions = 0 # Temperature conversions forced through CONV
+        self._weekday = 1
+        self._now = start or datetime(2000, 1, 1)
+        self._sync_time_registers()
+        self.temperature = 25.0
+
+    # --- Virtual clock ---
+
+    @property
+    def now(self):
+        """Current emulated time as a datetime."""
+        return self._now
+
+    def set_time(self, value, weekday=None):
+        """Sets the clock directly, bypassing the bus (e.g. a battery-backed start)."""
+        self._now = value
+        if weekday is not None:
+            self._weekday = weekday
+        self._sync_time_registers()
+
+    def advance(self, seconds=1):
+        """
+        Moves the clock forward one second at a time, raising the alarm
+        flags and counting square-wave edges as the device would.
+        """
+        for _ in range(seconds):
+            day = self._now.day
+            self._now += timedelta(seconds=1)
+            if self._now.day != day:
+                self._weekday = self._weekday % 7 + 1
+            self._sync_time_registers()
+            self._check_alarms()
+            if not self.regs[CONTROL_REG] & INTCN and not self.regs[CONTROL_REG] & RS_MASK:
+                self.sqw_edges += 1
+
+    @property
+    def temperature(self):
+        raw = (self.regs[TEMPERATURE_REG] << 8 | self.regs[TEMPERATURE_REG + 1]) >> 6
+        if raw & 0x200:
+            raw -= 0x400
+        return raw * 0.25
+
+    @temperature.setter
+    def temperature(self, value):
+        raw = int(round(value * 4)) & 0x3FF
+        self.regs[TEMPERATURE_REG] = raw >> 2
+        self.regs[TEMPERATURE_REG + 1] = (raw & 0x03) << 6
+
+    @property
+    def int_asserted(self):
+        """True while the open-drain INT output pulls the line low."""
+        control = self.regs[CONTROL_REG]
+        status = self.regs[STATUS_REG]
+        if not control & INTCN:
+            return False
+        return bool((control & A1IE and status & A1F) or (control & A2IE and status & A2F))
+
+    @property
+    def transactions(self):
+        return self.reads + self.writes
+
+    def reset_counters(self):
+        self.reads = 0
+        self.writes = 0
+        self.register_reads = [0] * REGISTER_COUNT
+        self.sqw_edges = 0
+
+    # --- machine.I2C interface ---
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        self._select(addr, reg)
+        self.reads += 1
+        self.register_reads[reg] += 1
+        for i in range(len(buf)):
+            buf[i] = self.regs[(reg + i) % REGISTER_COUNT]
+
+    def readfrom_mem(self, addr, reg, nbytes):
+        buf = bytearray(nbytes)
+        self.readfrom_mem_into(addr, reg, buf)
+        return bytes(buf)
+
+    def writeto_mem(self, addr, reg, buf):
+        self._select(addr, reg)
+        self.writes += 1
+        time_written = False
+        for i, value in enumerate(buf):
+            r = (reg + i) % REGISTER_COUNT
+            if r == STATUS_REG:
+                # Flags can only be cleared; OSF, A1F, A2F are write-zero, BSY is read-only
+                value = (value & EN32KHZ) | (self.regs[r] & value & (OSF | A1F | A2F)) | (self.regs[r] & BSY)
+            elif r == CONTROL_REG and value & CONV:
+                value &= ~CONV # The conversion completes at once
+                self.conversions += 1
+            elif r >= TEMPERATURE_REG:
+                continue # Read-only
+            self.regs[r] = value
+            time_written = time_written or r <= 6
+        if time_written:
+            self._load_time_registers()
+
+    def _select(self, addr, reg):
+        if addr != self.addr:
+            raise OSError(19) # ENODEV, as machine.I2C reports a missing device
+        if not 0 <= reg < REGISTER_COUNT:
+            raise OSError(5)
+
+    # --- Internals ---
+
+    def _sync_time_registers(self):
+        now = self._now
+        regs = self.regs
+        regs[0] = to_bcd(now.second)
+        regs[1] = to_bcd(now.minute)
+        if regs[2] & 0x40: # 12 hour mode
+            hour = now.hour % 12 or 12
+            regs[2] = 0x40 | (0x20 if now.hour >= 12 else 0) | to_bcd(hour)
+        else:
+            regs[2] = to_bcd(now.hour)
+        regs[3] = self._weekday
+        regs[4] = to_bcd(now.day)
+        regs[5] = to_bcd(now.month)
+        regs[6] = to_bcd(now.year % 100)
+
+    def _load_time_registers(self):
+        regs = self.regs
+        if regs[2] & 0x40:
+            hour = from_bcd(regs[2] & 0x1F) % 12 + (12 if regs[2] & 0x20 else 0)
+        else:
+            hour = from_bcd(regs[2] & 0x3F)
+        self._weekday = regs[3] & 0x07
+        self._now = datetime(2000 + from_bcd(regs[6]), from_bcd(regs[5] & 0x1F), from_bcd(regs[4] & 0x3F),
+                             hour, from_bcd(regs[1] & 0x7F), from_bcd(regs[0] & 0x7F))
+
+    def _day_matches(self, value):
+        if value & _DYDT:
+            return value & 0x0F == self._weekday
+        return value & 0x3F == self.regs[4]
+
+    def _check_alarms(self):
+        regs = self.regs
+        s, m, h, d = regs[ALARM1_REG:ALARM1_REG + 4]
+        if ((s & _MASK or s & 0x7F == regs[0]) and (m & _MASK or m & 0x7F == regs[1])
+                and (h & _MASK or h & 0x3F == regs[2] & 0x3F) and (d & _MASK or self._day_matches(d))):
+            regs[STATUS_REG] |= A1F
+        m, h, d = regs[ALARM2_REG:ALARM2_REG + 3]
+        if regs[0] == 0 and (m & _MASK or m & 0x7F == regs[1]) \
+                and (h & _MASK or h & 0x3F == regs[2] & 0x3F) and (d & _MASK or self._day_matches(d)):
+            regs[STATUS_REG] |= A2F
@@ -0,0 +1,125 @@
+"""
+Pure-Python stand-in for MicroPython's framebuf module, for host tests and
+benchmarks of ssd1306.
+
+Only the monochrome formats the project uses are implemented. text() draws
+a deterministic 8x8 pattern per character instead of the real font: tests
+compare buffers with each other, never with the ROM glyphs.
+"""
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+
+
+def _glyph_row(char, row):
+    if char == " ":
+        return 0
+    return (ord(char) * (row + 3) * 37 + row) & 0xFF or 0x18
+
+
+class FrameBuffer:
+
+    def __init__(self, buffer, width, height, format, stride=None):
+        self._buf = buffer
+        self._width = width
+        self._height = height
+        self._format = format
+        self._stride = stride or width
+
+    def _get(self, x, y):
+        if self._format == MONO_VLSB:
+            return (self._buf[(y >> 3) * self._stride + x] >> (y & 7)) & 1
+        index = (y * self._stride + x) >> 3
+        if self._format == MONO_HLSB:
+            return (self._buf[index] >> (7 - (x & 7))) & 1
+        return (self._buf[index] >> (x & 7)) & 1
+
+    def _set(self, x, y, c):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return
+        if self._format == MONO_VLSB:
+            index, bit = (y >> 3) * self._stride + x, 1 << (y & 7)
+        elif self._format == MONO_HLSB:
+            index, bit = (y * self._stride + x) >> 3, 0x80 >> (x & 7)
+        else:
+            index, bit = (y * self._stride + x) >> 3, 1 << (x & 7)
+        if c:
+            self._buf[index] |= bit
+        else:
+            self._buf[index] &= ~bit & 0xFF
+
+    def fill(self, c):
+        value = 0xFF if c else 0x00
+        for i in range(len(self._buf)):
+            self._buf[i] = value
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            if 0 <= x < self._width and 0 <= y < self._height:
+                return self._get(x, y)
+            return None
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        for yy in range(max(y, 0), min(y + h, self._height)):
+            for xx in range(max(x, 0), min(x + w, self._width)):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        sx, sy = (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+        err = dx + dy
+        while True:
+            self._set(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def text(self, s, x, y, c=1):
+        for n, char in enumerate(s):
+            for row in range(8):
+                bits = _glyph_row(char, row)
+                for col in range(8):
+                    if bits & (0x80 >> col):
+                        self._set(x + n * 8 + col, y + row, c)
+
+    def scroll(self, xstep, ystep):
+        w, h = self._width, self._height
+        xs = range(w - 1, -1, -1) if xstep > 0 else range(w)
+        ys = range(h - 1, -1, -1) if ystep > 0 else range(h)
+        for y in ys:
+            for x in xs:
+                sx, sy = x - xstep, y - ystep
+                if 0 <= sx < w and 0 <= sy < h:
+                    self._set(x, y, self._get(sx, sy))
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for sy in range(fbuf._height):
+            for sx in range(fbuf._width):
+                c = fbuf._get(sx, sy)
+                if palette is not None:
+                    c = palette.pixel(c, 0)
+                if c != key:
+                    self._set(x + sx, y + sy, c)
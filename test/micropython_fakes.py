@@ -0,0 +1,126 @@
+"""
+Host-side stand-ins for the MicroPython modules used by PyTank.
+
+The test files install these into sys.modules before importing the module
+under test, following the same pattern used in test_pytest_ConnectionManaging.py.
+"""
+import sys
+import time as _host_time
+from unittest.mock import MagicMock
+
+# The real CPython time module, for tests that need real elapsed time.
+HOST_TIME = _host_time
+
+
+class FakeTime:
+    """
+    Controllable replacement for MicroPython's time module.
+
+    The clock only moves when a test calls advance() or one of the sleep
+    functions, so timing-based code can be tested deterministically.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, ms=0):
+        self._us = int(ms * 1000)
+        self.sleeps = []
+
+    def advance(self, ms):
+        self._us += int(ms * 1000)
+
+    def advance_us(self, us):
+        self._us += int(us)
+
+    def ticks_ms(self):
+        return self._us // 1000
+
+    def ticks_us(self):
+        return self._us
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def ticks_add(self, a, b):
+        return a + b
+
+    def sleep_ms(self, ms):
+        self.sleeps.append(ms)
+        self.advance(ms)
+
+    def sleep_us(self, us):
+        self.sleeps.append(us / 1000)
+        self.advance_us(us)
+
+    def sleep(self, seconds):
+        self.sleep_ms(seconds * 1000)
+
+    def time(self):
+        return self._us // 1000000
+
+    def localtime(self, secs=None):
+        return _host_time.localtime(secs)
+
+    def mktime(self, value):
+        return int(_host_time.mktime(tuple(value[:6]) + (0, 0, -1)))
+
+
+FAKE_TIME = FakeTime()
+
+
+class HostTicks:
+    """
+    MicroPython-style ticks/sleep functions backed by the real host clock.
+    """
+
+    @staticmethod
+    def ticks_ms():
+        return int(_host_time.monotonic() * 1000)
+
+    @staticmethod
+    def ticks_us():
+        return int(_host_time.monotonic() * 1000000)
+
+    @staticmethod
+    def ticks_diff(a, b):
+        return a - b
+
+    @staticmethod
+    def sleep_ms(ms):
+        _host_time.sleep(ms / 1000)
+
+    @staticmethod
+    def sleep(seconds):
+        _host_time.sleep(seconds)
+
+
+def install_fake_time():
+    """Installs the shared FakeTime instance as the 'time' module."""
+    sys.modules['time'] = FAKE_TIME
+    return FAKE_TIME
+
+
+def install_micropython_mocks(*names):
+    """
+    Installs MagicMock modules for MicroPython-only imports.
+
+    'micropython' always gets a working const() so drivers that use it at
+    class level can be imported on CPython.
+    """
+    micropython = sys.modules.get('micropython')
+    if micropython is None:
+        micropython = MagicMock()
+        micropython.const = lambda value: value
+        sys.modules['micropython'] = micropython
+    for name in names:
+        if name not in sys.modules:
+            sys.modules[name] = MagicMock()
+    return micropython
+
+
+def install_fake_framebuf():
+    """Installs the pure-Python framebuf stand-in (see fake_framebuf.py)."""
+    import fake_framebuf
+    sys.modules['framebuf'] = fake_framebuf
+    return fake_framebuf
@@ -0,0 +1,135 @@
+"""
+I2C-level emulator of an SSD1306 OLED controller, for host tests and
+benchmarks of ssd1306.SSD1306_I2C.
+
+It decodes the control bytes (Co and D/C#) of every transaction, keeps the
+display RAM and the column/page address window as the controller does in
+horizontal addressing mode, and counts transactions and bytes on the wire.
+"""
+
+SSD1306_ADDR = 0x3C
+
+# Arguments following each multi-byte command
+_ARGS = {
+    0x20: 1, 0x21: 2, 0x22: 2, 0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5, 0x81: 1, 0x8D: 1,
+    0xA3: 2, 0xA8: 1, 0xD3: 1, 0xD5: 1, 0xD9: 1, 0xDA: 1, 0xDB: 1,
+}
+
+
+class SSD1306Emulator:
+    """
+    In-memory SSD1306 with 128 columns and 8 pages of display RAM.
+
+    ram holds one byte per column and page (bit 0 at the top), like the
+    MONO_VLSB framebuffer, so tests can compare it with the driver buffer.
+    """
+
+    def __init__(self, width=128, height=64, addr=SSD1306_ADDR):
+        self.addr = addr
+        self.width = width
+        self.pages = height // 8
+        self.ram = bytearray(128 * self.pages)
+        self.commands = [] # Every complete command as a tuple
+        self._pending = [] # Command bytes still waiting for their arguments
+        self.col_start, self.col_end = 0, 127
+        self.page_start, self.page_end = 0, self.pages - 1
+        self._col = 0
+        self._page = 0
+        self.on = False
+        self.inverted = False
+        self.scrolling = False
+        self.scroll_setup = None # Last horizontal or diagonal scroll command
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes = 0 # Including the address byte of each transaction
+        self.data_bytes = 0
+        self.command_bytes = 0
+        self.writes_while_scrolling = 0 # RAM writes the datasheet forbids
+
+    @property
+    def wire_time_us(self):
+        """Time on a 400 kHz bus: 9 clocks per byte plus start and stop."""
+        return (self.bytes * 9 + self.transactions * 2) * 1000000 // 400000
+
+    def page_bytes(self, page, col0=0, col1=None):
+        """RAM of one page as bytes, optionally limited to a column range."""
+        col1 = self.width - 1 if col1 is None else col1
+        base = page * 128
+        return bytes(self.ram[base + col0:base + col1 + 1])
+
+    def frame(self, offset=0):
+        """Whole visible RAM in framebuffer order (offset 32 for 64-wide panels)."""
+        return b"".join(self.page_bytes(p, offset, offset + self.width - 1) for p in range(self.pages))
+
+    # --- machine.I2C interface ---
+
+    def writeto(self, addr, buf, stop=True):
+        self.writevto(addr, [buf], stop)
+
+    def writevto(self, addr, vector, stop=True):
+        if addr != self.addr:
+            raise OSError(19)
+        self.transactions += 1
+        self.bytes += 1
+        data = b"".join(bytes(part) for part in vector)
+        self.bytes += len(data)
+        i = 0
+        while i < len(data):
+            control = data[i]
+            i += 1
+            if control & 0x80: # Co=1: a single byte follows, then another control byte
+                if i < len(data):
+                    self._byte(control, data[i])
+                    i += 1
+            else: # Co=0: every remaining byte is of the same kind
+                for value in data[i:]:
+                    self._byte(control, value)
+                return
+
+    # --- Internals ---
+
+    def _byte(self, control, value):
+        if control & 0x40:
+            self.data_bytes += 1
+            self._data(value)
+        else:
+            self.command_bytes += 1
+            self._command_byte(value)
+
+    def _data(self, value):
+        if self.scrolling:
+            self.writes_while_scrolling += 1
+        self.ram[self._page * 128 + self._col] = value
+        if self._col < self.col_end:
+            self._col += 1
+            return
+        self._col = self.col_start
+        self._page = self._page + 1 if self._page < self.page_end else self.page_start
+
+    def _command_byte(self, value):
+        pending = self._pending
+        pending.append(value)
+        if len(pending) - 1 < _ARGS.get(pending[0], 0):
+            return
+        command = tuple(pending)
+        self._pending = []
+        self.commands.append(command)
+        op = command[0]
+        if op == 0x21:
+            self.col_start, self.col_end = command[1], command[2]
+            self._col = self.col_start
+        elif op == 0x22:
+            self.page_start, self.page_end = command[1], command[2]
+            self._page = self.page_start
+        elif op in (0xAE, 0xAF):
+            self.on = op == 0xAF
+        elif op in (0xA6, 0xA7):
+            self.inverted = op == 0xA7
+        elif op in (0x26, 0x27, 0x29, 0x2A):
+            self.scroll_setup = command
+        elif op == 0x2F:
+            self.scrolling = True
+        elif op == 0x2E:
+            self.scrolling = False
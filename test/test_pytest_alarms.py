@@ -0,0 +1,166 @@
+import sys
+import os
+from datetime import datetime
+import pytest
+
+# Add the project root to the path to allow importing alarms from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks()
+
+import ds3231
+from ds3231 import DS3231_RTC
+from ds3231_emulator import DS3231Emulator
+from alarms import AlarmCalendar, minute_stamp, stamp_to_date, DAY_MINUTES
+
+# --- Helpers ---
+
+class AlarmRtc:
+    """DS3231 stand-in: a settable time, the last alarm 2 setting and its flag."""
+    AL1_MATCH_DHMS = 0
+    AL2_MATCH_DHM = 0
+
+    def __init__(self, dt):
+        self.dt = dt
+        self.alarm = None
+        self.writes = 0
+        self.flag_reads = 0
+        self.fired = False
+
+    def now(self):
+        return self.dt
+
+    def alarm2(self, time, match=0, int_en=True):
+        self.alarm = time
+        self.writes += 1
+
+    def alarm_int(self, enable=True, alarm=0):
+        self.alarm = None
+
+    def check_alarm(self, alarm):
+        self.flag_reads += 1
+        fired, self.fired = self.fired, False
+        return fired
+
+    def set(self, dt):
+        """Moves the time and raises the flag if the alarm matches."""
+        self.dt = dt
+        if self.alarm == (dt[4], dt[3], dt[2]):
+            self.fired = True
+
+
+def dt(day, hour, minute, yearday=None):
+    return (2025, 3, day, hour, minute, 0, 0, yearday or 59 + day)
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def rtc():
+    return AlarmRtc(dt(14, 7, 0))
+
+@pytest.fixture
+def calendar(rtc):
+    return AlarmCalendar(rtc)
+
+# --- Test Cases ---
+
+class TestMinuteStamp:
+    """Group tests for the minute stamp conversions."""
+
+    def test_round_trip(self):
+        for date in ((2000, 1, 1, 0, 0), (2024, 2, 29, 23, 59), (2025, 12, 31, 12, 30), (2099, 3, 1, 1, 2)):
+            year, month, day, hour, minute = date
+            yearday = sum((31, 29 if year % 4 == 0 else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30)[:month - 1]) + day
+            stamp = minute_stamp((year, month, day, hour, minute, 0, 0, yearday))
+            assert stamp_to_date(stamp) == date
+
+    def test_epoch(self):
+        assert minute_stamp((2000, 1, 1, 0, 0, 0, 0, 1)) == 0
+        assert minute_stamp((2001, 1, 1, 0, 1, 0, 0, 1)) == 366 * DAY_MINUTES + 1
+
+
+class TestAlarmCalendar:
+    """Group tests for the DS3231 alarm-driven event queue."""
+
+    def test_earliest_event_is_programmed(self, rtc, calendar):
+        calendar.daily("light_off", 20, 0, lambda: None)
+        assert rtc.alarm == (0, 20, 14)
+        calendar.daily("light_on", 8, 0, lambda: None)
+        assert rtc.alarm == (0, 8, 14)
+        calendar.daily("loading", 6, 30, lambda: None) # Already past: tomorrow
+        assert rtc.alarm == (0, 8, 14)
+        assert calendar.next_event().name == "light_on"
+
+    def test_poll_runs_nothing_until_the_alarm_fires(self, rtc, calendar):
+        ran = []
+        calendar.daily("light_on", 8, 0, lambda: ran.append("on"))
+        rtc.set(dt(14, 7, 59))
+        assert calendar.poll() == 0
+
+        rtc.set(dt(14, 8, 0))
+        assert calendar.poll() == 1
+        assert ran == ["on"]
+        assert rtc.alarm == (0, 8, 15) # Rolled to the next day
+
+    def test_events_roll_across_month_end(self, rtc, calendar):
+        rtc.set(dt(31, 23, 0))
+        calendar.daily("loading", 6, 0, lambda: None)
+        assert rtc.alarm == (0, 6, 1)
+
+    def test_periodic_event_and_cancel(self, rtc, calendar):
+        ran = []
+        calendar.every("web_Temp", 120, lambda: ran.append(1))
+        assert rtc.alarm == (0, 9, 14)
+        rtc.set(dt(14, 9, 0))
+        calendar.poll()
+        assert ran == [1]
+        assert rtc.alarm == (0, 11, 14)
+
+        assert calendar.cancel("web_Temp")
+        assert rtc.alarm is None
+        assert calendar.next_event() is None
+
+    def test_same_time_is_not_rewritten(self, rtc, calendar):
+        calendar.daily("light_on", 8, 0, lambda: None)
+        calendar.daily("light_on", 8, 0, lambda: None)
+        assert rtc.writes == 1
+
+    def test_irq_mode_skips_the_flag_read(self, rtc, calendar):
+        ran = []
+        calendar.use_irq()
+        calendar.daily("light_on", 8, 0, lambda: ran.append(1))
+        rtc.set(dt(14, 8, 0))
+        assert calendar.poll() == 0
+        assert rtc.flag_reads == 0
+
+        calendar.isr(None)
+        assert calendar.poll() == 1
+        assert ran == [1]
+
+    def test_forced_poll_catches_a_missed_alarm(self, rtc, calendar):
+        ran = []
+        calendar.every("filter", 60, lambda: ran.append(1))
+        rtc.dt = dt(14, 10, 30) # Alarm flag never seen
+        assert calendar.poll(force=True) == 1
+        assert ran == [1] # Missed occurrences collapse into one
+        assert rtc.alarm == (0, 11, 14)
+
+    def test_events_fire_through_the_driver(self, monkeypatch):
+        """End to end on the register emulator: alarm 2 date match and roll-over."""
+        monkeypatch.setattr(ds3231, 'time', FakeTime())
+        device = DS3231Emulator(datetime(2025, 1, 31, 23, 58))
+        device.regs[0x0F] &= 0x7F # Oscillator stop flag: the time is valid
+        calendar = AlarmCalendar(DS3231_RTC(device))
+        ran = []
+        calendar.daily("loading", 0, 1, lambda: ran.append(calendar.next_event()))
+
+        device.advance(120)
+        assert calendar.poll() == 0 # 00:00, alarm not yet
+        device.advance(60)
+        assert device.int_asserted
+        assert calendar.poll() == 1
+        assert not device.int_asserted
+        assert device.regs[0x0B:0x0E] == bytearray([0x01, 0x00, 0x02]) # Next: Feb 2, 00:01
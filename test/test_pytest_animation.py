@@ -0,0 +1,170 @@
+import sys
+import os
+import pytest
+
+# Add the project root to the path to allow importing animation from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_fake_framebuf, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks()
+install_fake_framebuf()
+
+import animation
+import scheduler
+import ssd1306
+from animation import Animator, ease_in, ease_in_out, ease_out, linear, progress, scroll_portion, wipe
+from scheduler import Scheduler
+from ssd1306 import SSD1306_I2C
+from ssd1306_emulator import SSD1306Emulator
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(animation, 'time', fake)
+    monkeypatch.setattr(scheduler, 'time', fake)
+    return fake
+
+@pytest.fixture
+def panel():
+    return SSD1306Emulator()
+
+@pytest.fixture
+def display(panel, clock):
+    oled = SSD1306_I2C(128, 64, panel, shadow=True)
+    oled.reset_stats()
+    return oled
+
+def run_for(sched, clock, ms, step_ms=10):
+    for _ in range(ms // step_ms):
+        clock.advance(step_ms)
+        sched.run_pending()
+
+def hold_and_count(display, frames, hold_ms=0):
+    display.text("0", 0, 0, 1)
+    yield hold_ms
+    for n in range(1, frames):
+        display.fill_rect(0, 0, 8, 8, 0)
+        display.text(str(n), 0, 0, 1)
+        yield
+
+# --- Test Cases ---
+
+class TestEasing:
+    """Group tests for the easing curves and the time-based progress."""
+
+    def test_curves_start_and_end_in_place(self):
+        for easing in (linear, ease_in, ease_out, ease_in_out):
+            assert easing(0.0) == 0.0
+            assert easing(1.0) == 1.0
+        assert ease_in(0.5) < 0.5 < ease_out(0.5)
+        assert ease_in_out(0.5) == 0.5
+
+    def test_progress_follows_elapsed_time(self, clock):
+        steps = progress(100)
+        assert next(steps) == 0.0
+        clock.advance(40)
+        assert next(steps) == pytest.approx(0.4)
+        clock.advance(500) # A late frame jumps to the end
+        assert next(steps) == 1.0
+        with pytest.raises(StopIteration):
+            next(steps)
+
+
+class TestAnimator:
+    """Group tests for the scheduler-driven animation runner."""
+
+    def test_frames_are_scheduler_jobs_and_holds_do_not_block(self, display, clock):
+        sched = Scheduler()
+        animator = Animator(display, fps=20)
+        animator.attach(sched)
+        done = []
+        animator.start("count", hold_and_count(display, 5, hold_ms=1000), lambda: done.append(True))
+        sched.run_pending()
+        assert display.flushes == 1
+        assert sched.time_to_next() == 1000 # Holding the first frame: nothing to do until then
+
+        run_for(sched, clock, 1000)
+        assert display.flushes == 2
+        assert sched.time_to_next() == 50
+
+        run_for(sched, clock, 500)
+        assert done == [True]
+        assert not animator.busy
+        assert sched.get("animation") is None
+        assert animator.frames == 5
+
+    def test_animations_share_one_flush_per_frame(self, display, clock):
+        sched = Scheduler()
+        animator = Animator(display)
+        animator.attach(sched)
+        animator.start("a", hold_and_count(display, 3))
+        animator.start("b", (display.text("B", 64, 32, 1) for _ in range(3)))
+        sched.run_pending()
+        assert display.flushes == 1
+        assert display.flushes_deferred == 1 # The animator show(), merged into the frame
+
+    def test_without_scheduler_the_frame_rate_is_capped(self, display, clock):
+        animator = Animator(display, fps=10)
+        animator.start("count", hold_and_count(display, 10))
+        for _ in range(10): # 10 calls in 50 ms
+            clock.advance(5)
+            animator.step()
+        assert animator.frames == 1
+
+    def test_stop_completes_a_wipe(self, display, panel, clock):
+        display.fill(1)
+        display.show()
+        animator = Animator(display)
+        done = []
+        def draw():
+            display.fill(0)
+            display.text("MAIN", 0, 0, 1)
+            display.show()
+        animator.start("screen", wipe(display, draw, 400), lambda: done.append(True))
+        clock.advance(50)
+        animator.step()
+        assert panel.frame() == bytes(display.buffer[1:])
+        assert display.pixel(127, 63) == 1 # Not revealed yet
+
+        animator.stop()
+        assert done == [True]
+        assert display.pixel(127, 63) == 0
+        assert panel.frame() == bytes(display.buffer[1:])
+
+    def test_wipe_reveals_the_new_screen_in_time(self, display, clock):
+        display.fill(1)
+        display.show()
+        animator = Animator(display, fps=25)
+        animator.start("screen", wipe(display, lambda: display.fill(0), 200))
+        while animator.busy:
+            clock.advance(40)
+            animator.step()
+        assert display.pixel(0, 0) == 0 and display.pixel(127, 63) == 0
+        assert animator.frames <= 7
+
+
+class TestScrollPortion:
+    """Group tests for the animation version of SSD1306.scroll_portion."""
+
+    def test_frames_end_with_both_rows_in_place(self, display, clock):
+        screen = [[39, 0, "PIA12"], [28, 57, "AQUARIUM"]]
+        frames = 0
+        for _ in scroll_portion(display, screen, 20, duration_ms=200):
+            clock.advance(40)
+            frames += 1
+        expected = SSD1306_I2C(128, 64, SSD1306Emulator())
+        expected.fill(0)
+        expected.text("PIA12", 39, 20)
+        expected.text("AQUARIUM", 28, 37)
+        assert display.buffer == expected.buffer
+        assert frames <= 14
+
+    def test_blocking_version_sleeps_between_frames(self, display, clock, monkeypatch):
+        monkeypatch.setattr(ssd1306, 'time', clock)
+        display.scroll_portion([[39, 0, "A"], [28, 57, "B"]], 128, 4)
+        assert clock.sleeps
+        assert clock.ticks_ms() >= 400
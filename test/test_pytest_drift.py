@@ -0,0 +1,119 @@
+import sys
+import os
+from datetime import datetime, timedelta
+import pytest
+
+# Add the project root to the path to allow importing drift from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks()
+
+import ds3231
+from ds3231 import DS3231_RTC
+from ds3231_emulator import DS3231Emulator
+import drift
+from drift import DriftLearner
+
+# --- Helpers ---
+
+START = datetime(2025, 3, 1, 12, 0, 0)
+
+
+def as_tuple(value):
+    """NTP time as returned by time.localtime()."""
+    yearday = value.toordinal() - datetime(value.year, 1, 1).toordinal() + 1
+    return (value.year, value.month, value.day, value.hour, value.minute, value.second, value.weekday(), yearday)
+
+
+def sync(learner, rtc, device, reference):
+    """Records a sync against `reference` and corrects the RTC like PyTankApp does."""
+    ppm = learner.record_sync(as_tuple(reference))
+    rtc.datetime = as_tuple(reference)
+    return ppm
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def device(monkeypatch):
+    monkeypatch.setattr(ds3231, 'time', FakeTime())
+    return DS3231Emulator(START)
+
+@pytest.fixture
+def rtc(device):
+    return DS3231_RTC(device)
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "drift.json")
+
+# --- Test Cases ---
+
+class TestDriftLearner:
+    """Group tests for the NTP-based aging offset trim."""
+
+    def test_first_sync_only_sets_the_reference(self, rtc, device, path):
+        learner = DriftLearner(rtc, path)
+        assert sync(learner, rtc, device, START) is None
+        assert learner.last_sync is not None
+        assert learner.sync_interval_s() == drift.MIN_SYNC_S
+        assert rtc.aging == 0
+
+    def test_fast_rtc_raises_the_aging_offset(self, rtc, device, path):
+        learner = DriftLearner(rtc, path)
+        sync(learner, rtc, device, START)
+        later = START + timedelta(days=5)
+        device.set_time(later + timedelta(seconds=1)) # One second fast after five days
+
+        ppm = sync(learner, rtc, device, later)
+        assert ppm == pytest.approx(2.3148, abs=1e-3)
+        assert rtc.aging == 23
+        assert device.conversions == 1 # The new trim is applied at once
+        assert learner.history == [[learner.last_sync, 1, 2.31, 23]]
+        assert learner.sync_interval_s() > 5 * 86400 # The next sync can wait longer
+
+    def test_slow_rtc_lowers_the_aging_offset(self, rtc, device, path):
+        learner = DriftLearner(rtc, path)
+        rtc.aging = 10
+        sync(learner, rtc, device, START)
+        later = START + timedelta(days=2)
+        device.set_time(later - timedelta(seconds=1))
+
+        sync(learner, rtc, device, later)
+        assert rtc.aging == 10 - 58
+
+    def test_short_interval_lost_time_and_jumps_are_not_learned(self, rtc, device, path, capsys):
+        learner = DriftLearner(rtc, path)
+        sync(learner, rtc, device, START)
+        device.set_time(START + timedelta(hours=2, seconds=1))
+        assert sync(learner, rtc, device, START + timedelta(hours=2)) is None # Too short
+
+        device.set_time(START + timedelta(days=3, minutes=5))
+        assert sync(learner, rtc, device, START + timedelta(days=3)) is None # Not drift
+        assert "not drift" in capsys.readouterr().out
+
+        device.regs[0x0F] |= 0x80 # Oscillator stopped
+        assert sync(learner, rtc, device, START + timedelta(days=6)) is None
+        assert rtc.aging == 0
+        assert learner.history == []
+
+    def test_history_survives_a_restart(self, rtc, device, path):
+        learner = DriftLearner(rtc, path)
+        sync(learner, rtc, device, START)
+        later = START + timedelta(days=5)
+        device.set_time(later + timedelta(seconds=1))
+        sync(learner, rtc, device, later)
+
+        restored = DriftLearner(rtc, path)
+        assert restored.history == learner.history
+        assert restored.last_sync == learner.last_sync
+        assert restored.sync_interval_s() == learner.sync_interval_s()
+        assert restored.seconds_to_sync(as_tuple(later + timedelta(days=1))) == \
+            learner.sync_interval_s() - 86400
+
+    def test_missing_history_file(self, rtc, tmp_path):
+        learner = DriftLearner(rtc, str(tmp_path / "missing" / "drift.json"))
+        assert learner.last_sync is None
+        assert learner.seconds_to_sync(as_tuple(START)) == 0
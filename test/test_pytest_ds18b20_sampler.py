@@ -0,0 +1,96 @@
+import sys
+import os
+from unittest.mock import MagicMock
+import pytest
+
+# Add the project root to the path to allow importing ds18b20_sampler from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime
+
+import ds18b20_sampler
+from ds18b20_sampler import DS18B20Sampler
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture to provide a controllable clock for the sampler module."""
+    fake = FakeTime()
+    monkeypatch.setattr(ds18b20_sampler, 'time', fake)
+    return fake
+
+@pytest.fixture
+def sensor():
+    """Fixture to provide a mocked ds18x20 driver."""
+    mock_sensor = MagicMock()
+    mock_sensor.read_temp.return_value = 25.0625
+    mock_sensor.read_scratch.return_value = bytearray([0x50, 0x05, 0x4B, 0x46, 0x7F, 0xFF, 0x0C, 0x10, 0x1C])
+    return mock_sensor
+
+# --- Test Cases ---
+
+class TestDS18B20Sampler:
+    """Group tests for the two-phase DS18B20 sampler."""
+
+    def test_result_is_collected_after_conversion_time(self, clock, sensor):
+        """tick() returns nothing until the conversion time has passed."""
+        sampler = DS18B20Sampler(sensor, b'rom')
+
+        assert sampler.start() is True
+        assert sampler.start() is False  # Already converting
+        clock.advance(749)
+        assert sampler.tick() is None
+        clock.advance(1)
+        assert sampler.tick() == 25.0625
+        assert sampler.tick() is None
+        sensor.convert_temp.assert_called_once()
+        assert clock.sleeps == []
+
+    @pytest.mark.parametrize("bits, conversion_ms, config_byte", [
+        (9, 94, 0x1F),
+        (10, 188, 0x3F),
+        (11, 375, 0x5F),
+    ])
+    def test_conversion_time_follows_resolution(self, clock, sensor, bits, conversion_ms, config_byte):
+        """The configuration register and the wait time follow the resolution."""
+        sampler = DS18B20Sampler(sensor, b'rom', resolution=bits)
+
+        assert sampler.conversion_ms == conversion_ms
+        sensor.write_scratch.assert_called_once_with(b'rom', bytearray([0x4B, 0x46, config_byte]))
+        sampler.start()
+        clock.advance(conversion_ms)
+        assert sampler.tick() == 25.0625
+
+    def test_default_resolution_does_not_touch_the_sensor(self, clock, sensor):
+        """12 bits is the power-on default, so no scratchpad write is needed."""
+        DS18B20Sampler(sensor, b'rom')
+        sensor.write_scratch.assert_not_called()
+
+    def test_invalid_resolution(self, clock, sensor):
+        """Only 9-12 bit resolutions are accepted."""
+        with pytest.raises(ValueError):
+            DS18B20Sampler(sensor, b'rom', resolution=8)
+
+    def test_stats_report_recovered_loop_time(self, clock, sensor):
+        """Each sample recovers the conversion time the blocking read slept for."""
+        sampler = DS18B20Sampler(sensor, b'rom')
+        for _ in range(3):
+            sampler.start()
+            clock.advance(750)
+            sampler.tick()
+
+        stats = sampler.stats()
+        assert stats["samples"] == 3
+        assert stats["recovered_ms"] == 3 * 750
+
+    def test_read_error_returns_to_idle(self, clock, sensor):
+        """A failed read is counted and the sampler can start again."""
+        sensor.read_temp.side_effect = OSError("CRC error")
+        sampler = DS18B20Sampler(sensor, b'rom')
+        sampler.start()
+        clock.advance(750)
+
+        assert sampler.tick() is None
+        assert sampler.stats()["errors"] == 1
+        assert sampler.start() is True
@@ -0,0 +1,178 @@
+import sys
+import os
+import calendar
+from datetime import date, timedelta
+import pytest
+
+# Add the project root to the path to allow importing ds3231 from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks()
+
+import ds3231
+from ds3231 import DS3231_RTC, STATUS_REG, days_since_2000, date_from_days, epoch_seconds
+from ds3231_emulator import DS3231Emulator
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(ds3231, 'time', fake)
+    return fake
+
+@pytest.fixture
+def rtc(clock):
+    device = DS3231_RTC(DS3231Emulator())
+    device.datetime = (2025, 3, 14, 15, 9, 26, 5)
+    device.reset_i2c_transactions()
+    return device
+
+# --- Test Cases ---
+
+class TestDS3231Snapshot:
+    """Group tests for the single-transaction time snapshot."""
+
+    def test_now_decodes_every_field(self, rtc):
+        assert rtc.now() == (2025, 3, 14, 15, 9, 26, 5, 73)
+        assert rtc.datetime == rtc.now()
+
+    def test_now_is_one_burst_read_between_osf_checks(self, rtc, clock):
+        rtc.now() # First read also checks the oscillator stop flag
+        assert rtc.i2c_transactions == 2
+
+        rtc.reset_i2c_transactions()
+        for _ in range(10):
+            rtc.now()
+        assert rtc.i2c_transactions == 10
+
+        clock.advance(rtc.osf_check_ms)
+        rtc.reset_i2c_transactions()
+        rtc.now()
+        assert rtc.i2c_transactions == 2
+
+    def test_time_costs_a_single_transaction(self, rtc):
+        rtc.now()
+        rtc.reset_i2c_transactions()
+        assert rtc.time == "15:09:26"
+        assert rtc.i2c_transactions == 1 # Was 6: three datetime reads, each with an OSF read
+
+    def test_osf_warning_still_reported(self, rtc, capsys):
+        rtc.i2c.regs[STATUS_REG] = 0x80
+        rtc.now()
+        assert "Oscillator stop flag" in capsys.readouterr().out
+
+    def test_field_properties(self, rtc):
+        assert (rtc.hour, rtc.minute, rtc.second) == (15, 9, 26)
+        assert rtc.weekday == 5
+        assert rtc.yearday == 73
+
+    def test_alarm2_writes_minute_hour_and_date(self, rtc):
+        rtc.alarm2((30, 7, 15), match=rtc.AL2_MATCH_DHM)
+        assert rtc.i2c.regs[0x0b:0x0e] == bytearray([0x30, 0x07, 0x15])
+
+        rtc.alarm2((45,), match=rtc.AL2_MATCH_M)
+        assert rtc.i2c.regs[0x0b:0x0e] == bytearray([0x45, 0x80, 0x80])
+
+
+class TestDS3231CalendarMath:
+    """Group tests for the table-driven BCD and date conversions."""
+
+    def test_bcd_tables_match_the_arithmetic(self, rtc):
+        for value in range(100):
+            bcd = (value // 10) << 4 | value % 10
+            assert rtc._dec_to_bcd(value) == bcd
+            assert rtc._bcd_to_dec(bcd) == value
+
+    def test_every_day_2000_to_2099(self, rtc):
+        day = date(2000, 1, 1)
+        hours = 0
+        for days in range(36525):
+            yearday = day.toordinal() - date(day.year, 1, 1).toordinal() + 1
+            assert rtc.day_of_year(day.year, day.month, day.day) == yearday
+            assert days_since_2000(day.year, yearday) == days
+            assert date_from_days(days) == (day.year, day.month, day.day, yearday)
+
+            hours = (hours + 7) % 24
+            rtc.datetime = (day.year, day.month, day.day, hours, 59, 58, day.weekday())
+            now = rtc.now()
+            assert now == (day.year, day.month, day.day, hours, 59, 58, day.weekday(), yearday)
+            unix = calendar.timegm((day.year, day.month, day.day, hours, 59, 58))
+            assert epoch_seconds(now) + 946684800 == unix
+            day += timedelta(days=1)
+        assert day == date(2100, 1, 1)
+
+    def test_unix_epoch_time_reads_the_rtc(self, rtc):
+        assert rtc.unix_epoch_time() == calendar.timegm((2025, 3, 14, 15, 9, 26))
+        assert rtc.unix_epoch_time(0) == 946684800
+
+    def test_leap_year_rule(self, rtc):
+        assert rtc.is_leap_year(2024)
+        assert rtc.is_leap_year(2000)
+        assert not rtc.is_leap_year(2100)
+        assert rtc.day_of_year(2024, 2, 1) == 32
+        assert rtc.day_of_year(2024, 3, 1) == 61
+
+    def test_temperature_is_one_two_byte_read(self, rtc):
+        rtc.i2c.regs[0x11:0x13] = bytearray([0x19, 0xC0])
+        assert rtc.temperature() == 25.75
+        assert rtc.i2c_transactions == 1
+
+        rtc.i2c.regs[0x11:0x13] = bytearray([0xFC, 0xC0])
+        assert rtc.temperature() == -3.25
+
+
+class TestDS3231Alarms:
+    """Group tests for the alarm, interrupt and square-wave registers."""
+
+    def test_alarm1_daily_match_sets_flag_and_int(self, rtc):
+        device = rtc.i2c
+        rtc.alarm1((30, 9, 15), match=rtc.AL1_MATCH_HMS)
+        device.advance(3)
+        assert not device.int_asserted
+        device.advance(1) # 15:09:30
+        assert device.int_asserted
+        assert rtc.check_alarm(1) is True
+        assert not device.int_asserted
+        assert rtc.check_alarm(1) is False
+
+    def test_alarm2_fires_on_the_minute(self, rtc):
+        device = rtc.i2c
+        rtc.alarm2((10, 15, 14), match=rtc.AL2_MATCH_DHM)
+        device.advance(33) # 15:09:59
+        assert rtc.check_alarm(2) is False
+        device.advance(1)
+        assert rtc.check_alarm(2) is True
+
+    def test_alarm2_weekday_match(self, rtc):
+        device = rtc.i2c
+        rtc.alarm2((0, 0, 6), match=rtc.AL2_MATCH_DHM, weekday=True)
+        device.advance(9 * 3600 - 9 * 60 - 26) # Midnight: weekday 5 -> 6
+        assert rtc.now()[6] == 6
+        assert rtc.check_alarm(2) is True
+
+    def test_square_wave_replaces_alarm_interrupt(self, rtc):
+        device = rtc.i2c
+        rtc.square_wave(rtc.FREQ_1)
+        device.advance(5)
+        assert device.sqw_edges == 5
+        rtc.alarm1((0,), match=rtc.AL1_EVERY_S, int_en=False)
+        device.advance(1)
+        assert device.sqw_edges == 6 # INT not enabled: the square wave keeps running
+        assert rtc.check_alarm(1) is True
+
+    def test_clock_rolls_over_year_end(self, rtc):
+        rtc.datetime = (2099, 12, 31, 23, 59, 59, 3)
+        rtc.i2c.advance(1)
+        assert rtc.now() == (2000, 1, 1, 0, 0, 0, 4, 1)
+
+    def test_aging_offset_is_signed_and_forces_a_conversion(self, rtc):
+        rtc.aging = -5
+        assert rtc.i2c.regs[0x10] == 0xFB
+        assert rtc.aging == -5
+        assert rtc.i2c.conversions == 1
+        rtc.aging = 300
+        assert rtc.aging == 127
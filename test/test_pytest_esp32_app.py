@@ -0,0 +1,405 @@
+import sys
+import os
+import asyncio
+from unittest.mock import MagicMock, patch
+import pytest
+
+# Add the project root to the path to allow importing esp32_app from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import install_fake_time, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the class under test.
+fake_time = install_fake_time()
+install_micropython_mocks('machine', 'esp32', 'onewire', 'ds18x20', 'ntptime')
+mock_viewer_module = MagicMock()
+sys.modules['viewer'] = mock_viewer_module
+
+import esp32_app
+import ds18b20_sampler
+import scheduler
+import keypad
+import startup
+import warmstart
+from esp32_app import PyTankApp
+
+# --- Helpers ---
+
+class FakeRtcMemory:
+    """Stand-in for machine.RTC() keeping the user memory between boots."""
+
+    def __init__(self):
+        self.data = b""
+
+    def memory(self, data=None):
+        if data is None:
+            return self.data
+        self.data = bytes(data)
+
+
+def make_app(monkeypatch, rtc_memory, cause='SOFT_RESET', tmp_path=None):
+    """Builds a PyTankApp with mocked hardware and runs its boot stages."""
+    fake_time.reset()
+    monkeypatch.setattr(esp32_app, 'DRIFT_FILE', str(tmp_path / "drift.json") if tmp_path else "")
+    monkeypatch.setattr(ds18b20_sampler, 'time', fake_time)
+    monkeypatch.setattr(scheduler, 'time', fake_time)
+    monkeypatch.setattr(keypad, 'time', fake_time)
+    monkeypatch.setattr(startup, 'time', fake_time)
+    monkeypatch.setattr(warmstart, 'RTC', lambda: rtc_memory)
+    monkeypatch.setattr(esp32_app, 'reset_cause', lambda: cause)
+    with patch.object(esp32_app, 'ADC', side_effect=lambda pin: MagicMock(**{'read.return_value': 0})), \
+         patch.object(esp32_app, 'DS3231_RTC') as mock_rtc, \
+         patch.object(esp32_app, 'ds18x20') as mock_ds18x20:
+        mock_rtc.return_value.now.return_value = (2025, 1, 1, 12, 0, 0, 2, 1)
+        mock_rtc.return_value.OSF.return_value = False
+        mock_rtc.return_value.aging = 0
+        mock_ds18x20.DS18X20.return_value.scan.return_value = [b'rom']
+        mock_ds18x20.DS18X20.return_value.read_temp.return_value = 24.567
+        application = PyTankApp()
+        application.viewer.conn.begin_connect.return_value = True
+        application.boot.run_all()
+    return application
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def app(monkeypatch):
+    """Fixture to provide a PyTankApp with mocked hardware."""
+    application = make_app(monkeypatch, FakeRtcMemory())
+    application.viewer = MagicMock()
+    application.viewer.is_enabled_menu = False
+    application.rtc.datetime = (2025, 1, 1, 12, 0, 0, 0, 1)
+    return application
+
+
+def run_for(app, monkeypatch, ms):
+    """
+    Runs the async runtime for `ms` of fake time: every await of the
+    scheduler task advances the fake clock instead of sleeping.
+    """
+    real_sleep = asyncio.sleep
+    until = fake_time.ticks_ms() + ms
+    async def fake_sleep(seconds):
+        fake_time.advance(min(int(seconds * 1000), max(until - fake_time.ticks_ms(), 0)))
+        if fake_time.ticks_ms() >= until:
+            app.stop()
+        await real_sleep(0)
+    monkeypatch.setattr(esp32_app, 'USE_UPLOAD_THREAD', False)
+    monkeypatch.setattr(esp32_app.asyncio, 'sleep', fake_sleep)
+    asyncio.run(app.run_async())
+
+# --- Test Cases ---
+
+class TestAsyncRuntime:
+    """Group tests for the asyncio runtime mode of PyTankApp."""
+
+    def test_runs_the_same_jobs_as_the_polling_loop(self, app, monkeypatch):
+        """The Config-driven jobs are registered as in run()."""
+        run_for(app, monkeypatch, 100)
+
+        for name in ("input", "display", "temperature", "light_on", "light_off", "loading", "filter", "web_Temp"):
+            assert app.scheduler.get(name) is not None
+
+    def test_uploads_go_through_the_viewer(self, app, monkeypatch):
+        """Web sends use Viewer.upload, so the background uploader gets them."""
+        app.config.set_on_off_ec(True)
+        app.config.set_on_off_ec_sending(True)
+        monkeypatch.setattr(esp32_app, 'INPUT_PERIOD_MS', 600000)
+        monkeypatch.setattr(esp32_app, 'DISPLAY_PERIOD_MS', 600000)
+
+        run_for(app, monkeypatch, 3600 * 1000 + 1)
+
+        app.viewer.upload.assert_called_once()
+        assert app.viewer.upload.call_args[0][1] == "Ec"
+
+    def test_sensor_job_stores_reading(self, app, monkeypatch):
+        """The conversion is collected by a later job, without blocking the loop."""
+        app.temp_sampler.conversion_ms = 10
+
+        run_for(app, monkeypatch, 100)
+
+        assert app.config.temperature == 24.57
+
+    def test_other_coroutines_run_between_jobs(self, app, monkeypatch):
+        """The scheduler task yields to the event loop after each pass."""
+        ran = []
+        async def other():
+            while app._running:
+                ran.append(1)
+                await asyncio.sleep(0)
+        async def both():
+            await asyncio.gather(app.run_async(), other())
+        real_sleep = asyncio.sleep
+        async def fake_sleep(seconds):
+            fake_time.advance(int(seconds * 1000))
+            if len(ran) >= 5:
+                app.stop()
+            await real_sleep(0)
+        monkeypatch.setattr(esp32_app, 'USE_UPLOAD_THREAD', False)
+        monkeypatch.setattr(esp32_app.asyncio, 'sleep', fake_sleep)
+        asyncio.run(both())
+
+        assert len(ran) >= 5
+        assert app.viewer.run.call_count >= 1
+
+    def test_sync_loop_never_sleeps_for_the_sensor(self, app):
+        """read_temperature collects the reading on a later tick without sleeping."""
+        assert app.start_temperature_conversion() is True
+        assert app.read_temperature() is None
+
+        fake_time.advance(750)
+        assert app.read_temperature() == 24.57
+        assert fake_time.sleeps == []
+
+
+class TestScheduledLoop:
+    """Group tests for the scheduler jobs driving the polling loop."""
+
+    def test_menu_timeout_follows_last_key_press(self, app):
+        """The menu hides MENU_TIMEOUT_SECONDS after the last key, however long the loop runs."""
+        app.pot_up.read.return_value = 4095
+        app._handle_input()
+        app.pot_up.read.return_value = 0
+        assert app.viewer.is_enabled_menu is True
+
+        fake_time.advance(9999)
+        app.scheduler.run_pending()
+        assert app.viewer.is_enabled_menu is True
+
+        fake_time.advance(1)
+        app.scheduler.run_pending()
+        assert app.viewer.is_enabled_menu is False
+
+    def test_short_press_between_polls_is_not_lost(self, app):
+        """Each press is queued as an event and applied to the menu once."""
+        app.pot_click.read.return_value = 4095 # DOWN
+        app._handle_input()
+        app.pot_click.read.return_value = 0
+        fake_time.advance(100)
+        app._handle_input()
+
+        app.viewer.menu.move.assert_called_once_with(1)
+
+    def test_idle_mode_slows_jobs_until_menu_opens(self, app):
+        """With the menu closed the loop light-sleeps; a key press restores full speed."""
+        app.idle = MagicMock(key_wake=True)
+        app._register_jobs()
+        assert app.scheduler.get("display").period_ms == esp32_app.IDLE_DISPLAY_PERIOD_MS
+        assert app.scheduler.get("input").period_ms == esp32_app.IDLE_INPUT_PERIOD_MS
+        assert app._can_idle()
+
+        app.idle.sleep_until_next.return_value = True # Woken by a key
+        app._idle_wait()
+
+        assert app.viewer.is_enabled_menu
+        assert not app._can_idle()
+        assert app.scheduler.get("display").period_ms == esp32_app.DISPLAY_PERIOD_MS
+        assert app.scheduler.get("input").period_ms == esp32_app.INPUT_PERIOD_MS
+
+    def test_back_item_exit_applies_menu_settings(self, app):
+        """Leaving with BACK is handled like a timeout: idle rates and the new settings."""
+        app.idle = MagicMock(key_wake=True)
+        app._register_jobs()
+        app.key_events.put(esp32_app.KEY_DOWN) # Opens the menu
+        app._handle_input()
+        assert app.scheduler.get("display").period_ms == esp32_app.DISPLAY_PERIOD_MS
+
+        app.config.set_freq_update_web_temperature(3) # 4 hours
+        app.viewer.menu.click.side_effect = lambda: setattr(app.viewer, 'is_enabled_menu', False) # BACK
+        app.key_events.put(esp32_app.KEY_CLICK)
+        app._handle_input()
+
+        assert app.scheduler.get("web_Temp").period_ms == 4 * esp32_app.HOUR_MS
+        assert app.scheduler.get("display").period_ms == esp32_app.IDLE_DISPLAY_PERIOD_MS
+        assert app.scheduler.get("menu_timeout") is None
+        assert app._can_idle()
+
+    def test_upload_thread_reports_the_adc2_keys(self, app, capsys):
+        """The uploader keeps WiFi on while ADC keys are polled: keys on ADC2 pins are named."""
+        app.uploader = MagicMock()
+        app._start_uploader()
+
+        app.uploader.start.assert_called_once()
+        assert "[12, 4]" in capsys.readouterr().out
+
+    def test_boot_defers_slow_stages_after_first_frame(self, app):
+        """Menu, SD, sensor scan, WiFi and NTP run after the first frame, in order."""
+        timeline = app.boot.timeline
+        names = [stage[0] for stage in timeline.stages]
+        assert names == ["config", "hardware", "display", "first_frame",
+                         "menu", "sd", "sensors", "wifi", "ntp", "wifi_off"]
+        assert timeline.first_frame_ms is not None
+        assert timeline.status("ntp") == "ok"
+        assert app.boot_report()[0].startswith("boot: first frame at")
+
+    def test_time_sync_re_anchors_the_wall_clock_jobs(self, app, monkeypatch):
+        """Jobs armed from a wrong RTC time move once NTP gives the right one."""
+        app._register_jobs()
+        before = app.scheduler.get("light_on").deadline - app.scheduler.now()
+
+        monkeypatch.setattr(esp32_app, 'localtime', lambda: (2025, 1, 1, 13, 0, 0, 2, 1)) # RTC was 1 h behind
+        app._sync_time()
+
+        after = app.scheduler.get("light_on").deadline - app.scheduler.now()
+        assert (before - after) % esp32_app.DAY_MS == esp32_app.HOUR_MS
+
+    def test_time_resync_reruns_wifi_and_ntp(self, app):
+        """The boot NTP sync arms the next one; a resync runs in the background and releases WiFi."""
+        job = app.scheduler.get("time_sync")
+        assert job.deadline - app.scheduler.now() == app.drift.sync_interval_s() * 1000
+
+        app.viewer.conn.begin_connect.return_value = True
+        app._start_time_sync()
+        assert app.scheduler.get("time_sync").deadline - app.scheduler.now() == esp32_app.TIME_SYNC_RETRY_MS
+        app.boot.run_all()
+        names = [stage[0] for stage in app.boot.timeline.stages]
+        assert names[-3:] == ["wifi", "ntp", "wifi_off"]
+        assert app.boot.timeline.status("ntp") == "ok"
+        assert app.scheduler.get("time_sync").deadline - app.scheduler.now() == app.drift.sync_interval_s() * 1000
+        app.viewer.conn.disconnect.assert_called_once()
+
+    def test_time_sync_waits_for_the_upload_in_flight(self, app):
+        """The uploader keeps the WiFi until its upload ends, then stays off it until wifi_off."""
+        app.uploader._busy = True # The worker is sending a reading
+        app._start_time_sync()
+        app.boot.step()
+        app.viewer.conn.begin_connect.assert_not_called()
+        assert app.uploader.paused
+
+        app.uploader._busy = False
+        app.uploader.submit("25", "Temp", "0")
+        app.boot.step()
+        app.viewer.conn.begin_connect.assert_called_once()
+        assert app.uploader.process_one() is False # No upload while NTP uses the WiFi
+
+        app.boot.run_all()
+        assert not app.uploader.paused
+        assert app.uploader.process_one() is True
+
+    def test_temperature_is_collected_when_conversion_ends(self, app):
+        """The read is scheduled exactly conversion_ms after the conversion starts."""
+        app._register_jobs()
+
+        app.scheduler.run_pending()
+        app.ds18b20_sensor.convert_temp.assert_called_once()
+        assert app.scheduler.time_to_next() == 50 # Next input poll
+
+        fake_time.advance(750)
+        app.scheduler.run_pending()
+        assert app.config.temperature == 24.57
+
+    def test_backup_thermometer_without_ds18b20(self, app):
+        """Without a DS18B20 every sample comes from the DS3231 sensor."""
+        app.temp_sampler = None
+        app.rtc.temperature.return_value = 26.0
+        app.backup_thermometer.offset = -1.25
+        app._register_jobs()
+
+        app.scheduler.run_pending()
+        assert app.config.temperature == 24.75
+        assert app.scheduler.get("temperature_read") is None # Nothing to wait for
+
+    def test_backup_thermometer_on_ds18b20_read_error(self, app):
+        """A failed DS18B20 read falls back to the DS3231 sensor."""
+        app.rtc.temperature.return_value = 23.5
+        app.ds18b20_sensor.read_temp.side_effect = OSError("crc")
+        app._register_jobs()
+
+        app.scheduler.run_pending()
+        fake_time.advance(750)
+        app.scheduler.run_pending()
+        assert app.config.temperature == 23.5
+
+    def test_backup_offset_follows_the_sd_configuration(self, app):
+        """The calibration stored on the SD card replaces the cached one."""
+        app.viewer.load_sd_configuration.side_effect = lambda: app.config.set_rtc_temperature_offset(-1.5)
+        app._load_sd_configuration()
+        assert app.backup_thermometer.offset == -1.5
+
+    def test_ladder_windows_follow_the_sd_configuration(self, app, monkeypatch):
+        """The ladder calibration stored on the SD card replaces the defaults."""
+        monkeypatch.setattr(esp32_app, 'KEY_MODE', "ladder")
+        app.keys = MagicMock()
+        windows = [[0, 100], [200, 300], [400, 500], [600, 700], [800, 900]]
+        app.viewer.load_sd_configuration.side_effect = lambda: app.config.set_key_ladder_windows(windows)
+        app._load_sd_configuration()
+        app.keys.configure.assert_called_once_with(*app.config.get_key_ladder())
+        assert app.keys.configure.call_args[0][0] == windows
+
+    def test_light_timer_jobs_follow_config(self, app):
+        """Light on/off jobs fire at the configured wall-clock times."""
+        app.rtc.datetime = (2025, 1, 1, 7, 59, 0, 0, 1)
+        app.config.set_timer_time([8, 0, 20, 0])
+        app._register_config_jobs()
+
+        assert app.scheduler.get("light_on").deadline == app.scheduler.now() + 60 * 1000
+        fake_time.advance(60 * 1000)
+        app.scheduler.run_pending()
+        app.viewer.set_light.assert_called_once_with(True)
+
+    def test_web_rate_change_reregisters_job(self, app):
+        """Changing a web rate in the menu re-arms the job with the new period."""
+        app.rtc.datetime = (2025, 1, 1, 7, 0, 0, 0, 1)
+        app._register_config_jobs()
+        assert app.scheduler.get("web_Temp").period_ms == 3600 * 1000
+
+        app.config.set_freq_update_web_temperature(2) # '3' hours
+        app._register_config_jobs()
+        assert app.scheduler.get("web_Temp").period_ms == 3 * 3600 * 1000
+
+    def test_calendar_mode_programs_config_events(self, app):
+        """With the alarm calendar the timed tasks become RTC alarm events."""
+        app.rtc.now.return_value = (2025, 1, 1, 7, 59, 0, 0, 1)
+        app.rtc.check_alarm.return_value = False
+        app.calendar = esp32_app.AlarmCalendar(app.rtc)
+        app.scheduler = esp32_app.Scheduler(app.profiler) # Without the jobs the boot sync armed in scheduler mode
+        app.config.set_timer_time([8, 0, 20, 0])
+        app._register_jobs()
+
+        assert app.scheduler.get("light_on") is None
+        assert app.calendar.next_event().name == "light_on"
+        app.rtc.alarm2.assert_called_with((0, 8, 1), match=app.rtc.AL2_MATCH_DHM, int_en=True)
+
+        app.scheduler.run_pending() # Flag not set: nothing runs
+        app.viewer.set_light.assert_not_called()
+        app.rtc.now.return_value = (2025, 1, 1, 8, 0, 0, 0, 1)
+        app.rtc.check_alarm.return_value = True
+        fake_time.advance(esp32_app.CALENDAR_POLL_MS)
+        app.scheduler.run_pending()
+        app.viewer.set_light.assert_called_once_with(True)
+
+
+class TestWarmRestart:
+    """Group tests for the RTC-memory snapshot used after machine.reset()."""
+
+    def test_warm_boot_restores_state_and_skips_slow_stages(self, monkeypatch):
+        rtc_memory = FakeRtcMemory()
+        first = make_app(monkeypatch, rtc_memory)
+        first.config.set_on_off_ec(True)
+        first.config.end_minutes = 45
+        first.viewer.relay_mask.return_value = 0b0101
+        assert first.save_warm_snapshot()
+        first.viewer.hold_relays.assert_called_once()
+
+        mock_viewer_module.Viewer.reset_mock()
+        second = make_app(monkeypatch, rtc_memory)
+
+        assert second.warm_boot
+        assert second.config.get_on_off_ec() is True
+        assert second.config.end_minutes == 45
+        # The relays are passed to the Viewer, which creates the pins at that level
+        assert mock_viewer_module.Viewer.call_args.kwargs["relays"] == 0b0101
+        names = [stage[0] for stage in second.boot.timeline.stages]
+        assert "sd" not in names and "wifi" not in names and "ntp" not in names
+        assert second.ds18b20_rom == b'rom'
+        assert second.temp_sampler is not None
+        # The snapshot is used once
+        assert rtc_memory.data == b""
+
+    def test_power_on_is_a_cold_boot(self, monkeypatch):
+        rtc_memory = FakeRtcMemory()
+        make_app(monkeypatch, rtc_memory).save_warm_snapshot()
+
+        app = make_app(monkeypatch, rtc_memory, cause=esp32_app.PWRON_RESET)
+        assert not app.warm_boot
+        assert app.boot.timeline.status("sd") == "ok"
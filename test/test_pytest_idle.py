@@ -0,0 +1,84 @@
+import sys
+import os
+from unittest.mock import MagicMock
+import pytest
+
+# Add the project root to the path to allow importing idle from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks('machine', 'esp32')
+
+import idle
+import scheduler
+from idle import IdleManager, ALARM_GUARD_MS
+from scheduler import Scheduler
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(idle, 'time', fake)
+    monkeypatch.setattr(scheduler, 'time', fake)
+    # Light sleep returns at the timeout unless a test says otherwise
+    monkeypatch.setattr(idle, 'lightsleep', MagicMock(side_effect=fake.advance))
+    monkeypatch.setattr(idle, 'wake_reason', MagicMock(return_value=0))
+    return fake
+
+@pytest.fixture
+def rtc():
+    mock = MagicMock()
+    mock.AL1_MATCH_HMS = 8
+    mock.datetime = (2025, 1, 1, 23, 59, 50, 2, 1)
+    mock.check_alarm.return_value = True
+    return mock
+
+# --- Test Cases ---
+
+class TestIdleManager:
+    """Group tests for the light-sleep idle manager."""
+
+    def test_long_sleep_is_timed_by_rtc_alarm(self, clock, rtc):
+        sched = Scheduler()
+        sched.add("web", lambda: None, 15500)
+        manager = IdleManager(rtc, sched, int_pin=MagicMock())
+
+        assert manager.sleep_until_next() is False
+
+        # 23:59:50 + 15 s wraps to 00:00:05, rounded down to never be late
+        rtc.alarm1.assert_called_once_with((5, 0, 0), match=8)
+        idle.lightsleep.assert_called_once_with(15500 + ALARM_GUARD_MS)
+        rtc.check_alarm.assert_called_once_with(1)
+        assert manager.stats()["alarm_wakes"] == 1
+
+    def test_short_sleep_uses_timer_only(self, clock, rtc):
+        sched = Scheduler()
+        sched.add("display", lambda: None, 1000)
+        manager = IdleManager(rtc, sched, int_pin=MagicMock())
+
+        manager.sleep_until_next()
+
+        rtc.alarm1.assert_not_called()
+        idle.lightsleep.assert_called_once_with(1000)
+        assert manager.stats()["slept_ms"] == 1000
+
+    def test_tiny_gap_does_not_light_sleep(self, clock, rtc):
+        sched = Scheduler()
+        sched.add("input", lambda: None, 3)
+        IdleManager(rtc, sched).sleep_until_next()
+
+        idle.lightsleep.assert_not_called()
+        assert clock.sleeps == [3]
+
+    def test_key_wake_is_reported(self, clock, rtc):
+        sched = Scheduler()
+        sched.add("display", lambda: None, 1000)
+        manager = IdleManager(rtc, sched, key_pin=MagicMock())
+        idle.wake_reason.return_value = idle.EXT1_WAKE
+
+        assert manager.key_wake
+        assert manager.sleep_until_next() is True
+        assert manager.stats()["key_wakes"] == 1
@@ -0,0 +1,229 @@
+import sys
+import os
+from unittest.mock import MagicMock
+import pytest
+
+# Add the project root to the path to allow importing keypad from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks('machine')
+
+import keypad
+import json
+from Config import Config
+from keypad import (KeyEventQueue, DigitalKeys, AdcKeySampler, LadderKeyDecoder,
+                    KEY_NONE, KEY_UP, KEY_DOWN, KEY_RIGHT, KEY_CLICK)
+
+# --- Helpers ---
+
+class FakePin:
+    """Stand-in for machine.Pin that lets a test fire the IRQ handler."""
+    IN = 1
+    PULL_UP = 2
+    IRQ_FALLING = 4
+
+    def __init__(self, number, mode=None, pull=None):
+        self.number = number
+        self._value = 1
+        self.handler = None
+
+    def irq(self, trigger=None, handler=None):
+        self.handler = handler
+
+    def value(self):
+        return self._value
+
+    def press(self):
+        self._value = 0
+        self.handler(self)
+
+    def release(self):
+        self._value = 1
+
+class TraceAdc:
+    """ADC stand-in that replays a recorded trace of raw readings."""
+
+    def __init__(self, trace):
+        self._trace = iter(trace)
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return next(self._trace)
+
+# Raw readings captured from the ladder, three per poll.
+# Idle, then DOWN pressed with a bounce, held, then released through the
+# intermediate levels as the contact opens.
+TRACE_DOWN_PRESS = [
+    4095, 4095, 4095,
+    4095, 760, 4095,   # First contact: one sample only, no majority
+    780, 742, 1500,    # Settling: the reading on LEFT's window is outvoted
+    771, 755, 766,
+    1010, 990, 1015,   # Noise just past the window edge, kept by hysteresis
+    2100, 4095, 4095,  # Release; the RIGHT level crossed once on the way up
+    4095, 4095, 4095,
+]
+
+# UP, then straight to CLICK without passing through idle.
+TRACE_ROLL_OVER = [
+    4095, 4095, 4095,
+    120, 130, 110,
+    150, 2800, 2810,
+    2795, 2805, 2790,
+    4095, 4095, 4095,
+]
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    fake.reset(1000)
+    monkeypatch.setattr(keypad, 'time', fake)
+    return fake
+
+@pytest.fixture
+def fake_pins(monkeypatch):
+    monkeypatch.setattr(keypad, 'Pin', FakePin)
+
+# --- Test Cases ---
+
+class TestKeyEventQueue:
+    """Group tests for the ISR-safe key queue."""
+
+    def test_fifo_and_empty(self):
+        queue = KeyEventQueue(4)
+        queue.put(KEY_UP)
+        queue.put(KEY_CLICK)
+        assert len(queue) == 2
+        assert queue.get() == KEY_UP
+        assert queue.get() == KEY_CLICK
+        assert queue.get() == KEY_NONE
+
+    def test_overflow_keeps_queued_presses(self):
+        queue = KeyEventQueue(4) # One slot distinguishes full from empty
+        assert [queue.put(KEY_UP) for _ in range(4)] == [True, True, True, False]
+        assert queue.overflows == 1
+        assert len(queue) == 3
+
+
+class TestDigitalKeys:
+    """Group tests for interrupt-driven keys."""
+
+    def test_press_is_queued_from_irq(self, clock, fake_pins):
+        queue = KeyEventQueue()
+        keys = DigitalKeys(queue, ((34, KEY_UP), (35, KEY_DOWN)))
+
+        keys._pins[1].press()
+        assert queue.get() == KEY_DOWN
+        assert queue.get() == KEY_NONE
+
+    def test_bounces_are_ignored(self, clock, fake_pins):
+        queue = KeyEventQueue()
+        keys = DigitalKeys(queue, ((34, KEY_UP),), debounce_ms=50)
+        pin = keys._pins[0]
+
+        pin.press()
+        clock.advance(5)
+        pin.release()
+        pin.handler(pin) # Edge while the contact bounces open: not pressed
+        pin.press()      # Bounce back within the debounce time
+        clock.advance(60)
+        pin.release()
+        pin.press()      # A real second press
+
+        assert len(queue) == 2
+
+
+class TestAdcKeySampler:
+    """Group tests for the ADC fallback sampler."""
+
+    def test_single_sample_press_is_not_lost(self, clock):
+        queue = KeyEventQueue()
+        adc = MagicMock(**{'read.return_value': 4095})
+        sampler = AdcKeySampler(queue, ((adc, KEY_CLICK),))
+
+        sampler.poll()
+        adc.read.return_value = 0
+        clock.advance(100)
+        sampler.poll()
+
+        assert queue.get() == KEY_CLICK
+        assert queue.get() == KEY_NONE
+
+    def test_held_key_and_bounce_produce_one_press(self, clock):
+        queue = KeyEventQueue()
+        adc = MagicMock()
+        sampler = AdcKeySampler(queue, ((adc, KEY_UP),), debounce_ms=50)
+
+        for reading in (4095, 0, 4095, 4095, 4095):
+            adc.read.return_value = reading
+            sampler.poll()
+            clock.advance(10)
+
+        assert len(queue) == 1
+
+
+    def test_failed_read_skips_the_sample(self, clock):
+        """ADC2 reads raise while WiFi is on; the other keys are still read."""
+        queue = KeyEventQueue()
+        busy = MagicMock(**{'read.side_effect': OSError(263)})
+        free = MagicMock(**{'read.return_value': 4095})
+        sampler = AdcKeySampler(queue, ((busy, KEY_RIGHT), (free, KEY_UP)))
+
+        sampler.poll()
+
+        assert sampler.read_errors == 1
+        assert queue.get() == KEY_UP
+        assert queue.get() == KEY_NONE
+
+class TestLadderKeyDecoder:
+    """Group tests for the resistor-ladder decoder, fed with recorded traces."""
+
+    def replay(self, trace, samples=3):
+        queue = KeyEventQueue()
+        adc = TraceAdc(trace)
+        decoder = LadderKeyDecoder(queue, adc, samples=samples)
+        keys = []
+        for _ in range(len(trace) // samples):
+            decoder.poll()
+            keys.append(decoder.key)
+        pressed = []
+        while len(queue):
+            pressed.append(queue.get())
+        return keys, pressed, adc
+
+    def test_bouncy_press_is_posted_once(self):
+        keys, pressed, adc = self.replay(TRACE_DOWN_PRESS)
+        assert pressed == [KEY_DOWN]
+        assert keys == [KEY_NONE, KEY_NONE, KEY_DOWN, KEY_DOWN, KEY_DOWN, KEY_NONE, KEY_NONE]
+        assert adc.reads == len(TRACE_DOWN_PRESS) # One channel read per sample
+
+    def test_roll_over_posts_both_keys(self):
+        keys, pressed, _ = self.replay(TRACE_ROLL_OVER)
+        assert pressed == [KEY_UP, KEY_CLICK]
+
+    def test_classify_windows_and_gaps(self):
+        decoder = LadderKeyDecoder(KeyEventQueue(), TraceAdc([]))
+        assert decoder.classify(2000) == KEY_RIGHT
+        assert decoder.classify(400) == -1 # Between UP and DOWN
+        assert decoder.classify(4000) == KEY_NONE
+
+    def test_configure_replaces_the_windows(self):
+        decoder = LadderKeyDecoder(KeyEventQueue(), TraceAdc([]))
+        decoder.configure([(0, 100), (200, 300), (400, 500), (600, 700), (800, 900)], 10, 3)
+        assert decoder.classify(250) == KEY_DOWN
+        assert decoder.classify(950) == KEY_NONE
+
+    def test_windows_come_from_config(self):
+        config = Config()
+        config.set_key_ladder_windows([(0, 100), (200, 300), (400, 500), (600, 700), (800, 900)])
+        restored = Config()
+        restored.from_json(json.loads(json.dumps(config.to_dict())))
+        windows, hysteresis, samples = restored.get_key_ladder()
+
+        decoder = LadderKeyDecoder(KeyEventQueue(), TraceAdc([]), windows, hysteresis, samples)
+        assert decoder.classify(850) == KEY_CLICK
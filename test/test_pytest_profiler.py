@@ -0,0 +1,80 @@
+import sys
+import os
+import pytest
+
+# Add the project root to the path to allow importing profiler from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime
+
+import profiler
+import scheduler
+from profiler import LoopProfiler
+from scheduler import Scheduler
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture to provide a shared controllable clock for profiler and scheduler."""
+    fake = FakeTime()
+    monkeypatch.setattr(profiler, 'time', fake)
+    monkeypatch.setattr(scheduler, 'time', fake)
+    return fake
+
+# --- Test Cases ---
+
+class TestLoopProfiler:
+    """Group tests for the per-phase loop profiler."""
+
+    def test_snapshot_statistics(self, clock):
+        prof = LoopProfiler(("input", "display"))
+        display = prof.phase("display")
+        for _ in range(99):
+            prof.record(display, 100)
+        prof.record(display, 25000)
+
+        snap = prof.snapshot()
+        assert snap["input"]["count"] == 0
+        assert snap["display"]["count"] == 100
+        assert snap["display"]["max_us"] == 25000
+        assert snap["display"]["mean_us"] == (99 * 100 + 25000) // 100
+        # p99 falls in the [64, 128) us bucket
+        assert snap["display"]["p99_us"] == 127
+
+    def test_p99_is_capped_at_worst_case(self, clock):
+        prof = LoopProfiler(("input",))
+        prof.record(0, 70)
+        assert prof.percentile(0, 99) == 70
+
+    def test_start_stop_measures_with_ticks_us(self, clock):
+        prof = LoopProfiler(("input",))
+        prof.start(0)
+        clock.advance_us(1500)
+        prof.stop(0)
+        assert prof.snapshot()["input"]["max_us"] == 1500
+
+    def test_scheduler_records_phases_and_missed_deadlines(self, clock):
+        prof = LoopProfiler(("input", "display"), late_ms=20)
+        sched = Scheduler(prof)
+        sched.every("input", lambda: clock.advance_us(300), 50, prof.phase("input"))
+        sched.every("display", lambda: None, 100, prof.phase("display"))
+        sched.every("other", lambda: None, 100)
+
+        clock.advance(50)
+        sched.run_pending()
+        clock.advance(80) # Input 30 ms late, display 30 ms late
+        sched.run_pending()
+
+        snap = prof.snapshot()
+        assert snap["input"]["count"] == 2
+        assert snap["input"]["max_us"] == 300
+        assert snap["input"]["missed"] == 1
+        assert snap["display"]["missed"] == 1
+
+    def test_reset_starts_new_window(self, clock):
+        prof = LoopProfiler(("input",))
+        prof.record(0, 10)
+        prof.miss(0)
+        prof.reset()
+        assert prof.snapshot()["input"] == {"count": 0, "mean_us": 0, "p99_us": 0, "max_us": 0, "missed": 0}
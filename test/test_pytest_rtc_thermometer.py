@@ -0,0 +1,48 @@
+import sys
+import os
+
+# Add the project root to the path to allow importing rtc_thermometer from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rtc_thermometer import RtcThermometer
+
+# --- Helpers ---
+
+class TempRtc:
+    """DS3231 stand-in returning a settable on-die temperature."""
+
+    def __init__(self, temp):
+        self.temp = temp
+        self.fail = False
+
+    def temperature(self):
+        if self.fail:
+            raise OSError(19)
+        return self.temp
+
+# --- Test Cases ---
+
+class TestRtcThermometer:
+    """Group tests for the DS3231 backup thermometer."""
+
+    def test_read_applies_offset(self):
+        sensor = RtcThermometer(TempRtc(27.25), offset=-1.5)
+        assert sensor.read() == 25.75
+        assert sensor.value == 25.75
+        assert sensor.stats()["samples"] == 1
+
+    def test_calibrate_against_reference(self):
+        rtc = TempRtc(28.0)
+        sensor = RtcThermometer(rtc)
+        assert sensor.calibrate(24.5) == -3.5
+        rtc.temp = 29.0
+        assert sensor.read() == 25.5
+
+    def test_read_error_returns_none(self):
+        rtc = TempRtc(20.0)
+        sensor = RtcThermometer(rtc)
+        sensor.read()
+        rtc.fail = True
+        assert sensor.read() is None
+        assert sensor.value == 20.0 # Last good value kept
+        assert sensor.stats()["errors"] == 1
@@ -0,0 +1,138 @@
+import sys
+import os
+import pytest
+from unittest.mock import MagicMock
+
+# Add the project root to the path to allow importing scheduler from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime
+
+import scheduler
+from scheduler import Scheduler, ms_until
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture to provide a controllable clock for the scheduler module."""
+    fake = FakeTime()
+    monkeypatch.setattr(scheduler, 'time', fake)
+    return fake
+
+@pytest.fixture
+def sched(clock):
+    return Scheduler()
+
+# --- Test Cases ---
+
+class TestScheduler:
+    """Group tests for the deadline-based scheduler."""
+
+    def test_jobs_run_in_deadline_order(self, clock, sched):
+        ran = []
+        sched.add("b", lambda: ran.append("b"), 200)
+        sched.add("a", lambda: ran.append("a"), 100)
+        sched.add("c", lambda: ran.append("c"), 300)
+
+        clock.advance(250)
+        assert sched.run_pending() == 2
+        assert ran == ["a", "b"]
+        assert sched.time_to_next() == 50
+
+    def test_periodic_job_does_not_drift_under_load(self, clock, sched):
+        """A late run re-arms from the old deadline, not from the run time."""
+        ran = []
+        sched.every("tick", lambda: ran.append(sched.now()), 100)
+
+        clock.advance(130) # Loop iteration ran long
+        sched.run_pending()
+        assert sched.time_to_next() == 70
+        clock.advance(70)
+        sched.run_pending()
+        assert ran == [130, 200]
+
+    def test_missed_periods_are_skipped(self, clock, sched):
+        ran = []
+        sched.every("tick", lambda: ran.append(1), 100)
+
+        clock.advance(450)
+        sched.run_pending()
+        assert ran == [1]
+        assert sched.time_to_next() == 50
+
+    def test_periodic_job_reuses_its_heap_entry(self, clock, sched):
+        sched.every("tick", lambda: None, 100)
+        entry = sched._heap[0]
+
+        for _ in range(3):
+            clock.advance(100)
+            sched.run_pending()
+        assert sched._heap == [entry]
+        assert entry[0] == 400
+
+    def test_lateness_includes_the_jobs_run_before(self, clock):
+        profiler = MagicMock(late_ms=20)
+        sched = Scheduler(profiler)
+        sched.add("slow", lambda: clock.advance(50), 100, phase=0)
+        sched.add("next", lambda: None, 100, phase=1)
+
+        clock.advance(100)
+        assert sched.run_pending() == 2
+        profiler.miss.assert_called_once_with(1) # Started 50 ms after its deadline
+
+    def test_add_replaces_job_with_same_name(self, clock, sched):
+        ran = []
+        sched.add("timeout", lambda: ran.append("old"), 100)
+        sched.add("timeout", lambda: ran.append("new"), 300)
+
+        clock.advance(100)
+        assert sched.run_pending() == 0
+        clock.advance(200)
+        sched.run_pending()
+        assert ran == ["new"]
+
+    def test_cancel_and_reschedule(self, clock, sched):
+        ran = []
+        sched.every("tick", lambda: ran.append(1), 100)
+        sched.reschedule("tick", 500)
+        assert sched.time_to_next() == 500
+        assert sched.get("tick").period_ms == 100
+
+        assert sched.cancel("tick") is True
+        assert sched.cancel("tick") is False
+        assert sched.time_to_next() is None
+        clock.advance(1000)
+        assert sched.run_pending() == 0
+
+    def test_sleep_until_next_sleeps_exactly(self, clock, sched):
+        sched.add("job", lambda: None, 730)
+        clock.advance(30)
+
+        sched.sleep_until_next()
+        assert clock.sleeps == [700]
+        assert sched.run_pending() == 1
+
+    def test_clock_survives_ticks_wraparound(self, clock, monkeypatch):
+        """Deadlines stay valid when ticks_ms wraps around."""
+        period = 1 << 30
+        monkeypatch.setattr(clock, 'ticks_ms', lambda: (clock._us // 1000) % period)
+        monkeypatch.setattr(clock, 'ticks_diff', lambda a, b: ((a - b + period // 2) % period) - period // 2)
+        clock.reset(period - 50)
+        sched = Scheduler()
+        ran = []
+        sched.add("job", lambda: ran.append(1), 100)
+
+        clock.advance(60)
+        assert sched.run_pending() == 0
+        clock.advance(40)
+        assert sched.run_pending() == 1
+
+    @pytest.mark.parametrize("now, hour, minute, expected_s", [
+        ((7, 0, 0), 8, 0, 3600),
+        ((8, 0, 0), 7, 30, 23 * 3600 + 1800),
+        ((8, 0, 0), 8, 0, 86400),
+        ((23, 59, 30), 0, 0, 30),
+    ])
+    def test_ms_until(self, now, hour, minute, expected_s):
+        assert ms_until(now, hour, minute) == expected_s * 1000
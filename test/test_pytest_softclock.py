@@ -0,0 +1,161 @@
+import sys
+import os
+import pytest
+
+# Add the project root to the path to allow importing softclock from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks('machine')
+
+import softclock
+from softclock import SoftClock, SquareWaveTick
+
+# --- Helpers ---
+
+class CountingRtc:
+    """RTC whose time follows a fake clock running `ppm` faster than the ticks."""
+
+    def __init__(self, clock, start=(2025, 1, 1, 12, 0, 0), ppm=0):
+        self._clock = clock
+        self._start_ms = clock.ticks_ms()
+        self._start_s = start[3] * 3600 + start[4] * 60 + start[5]
+        self._date = start[:3]
+        self.ppm = ppm
+        self.reads = 0
+
+    def now(self):
+        self.reads += 1
+        elapsed = self._clock.ticks_ms() - self._start_ms
+        s = self._start_s + (elapsed + elapsed * self.ppm // 1000000) // 1000
+        date = self._date if s < 86400 else (self._date[0], self._date[1], self._date[2] + 1)
+        s %= 86400
+        return date + (s // 3600, s // 60 % 60, s % 60, 3, date[2])
+
+class FakePin:
+    """Stand-in for the INT/SQW input: fire() plays a falling edge."""
+
+    def __init__(self):
+        self.handler = None
+
+    def irq(self, trigger=None, handler=None):
+        self.handler = handler
+
+    def fire(self):
+        self.handler(self)
+
+
+class SqwRtc(CountingRtc):
+    def __init__(self, clock, **kwargs):
+        super().__init__(clock, **kwargs)
+        self.FREQ_1 = 1
+        self.sqw = None
+
+    def square_wave(self, freq=None):
+        self.sqw = freq
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(softclock, 'time', fake)
+    return fake
+
+# --- Test Cases ---
+
+class TestSoftClock:
+    """Group tests for the ticks-interpolated clock."""
+
+    def test_reads_rtc_once_per_resync_period(self, clock):
+        rtc = CountingRtc(clock)
+        soft = SoftClock(rtc, resync_ms=60000)
+
+        for _ in range(590): # One minute of 10 Hz refreshes
+            soft.seconds()
+            clock.advance(100)
+        assert rtc.reads == 1
+        assert soft.time == "12:00:59"
+
+        clock.advance(1000)
+        soft.seconds()
+        assert rtc.reads == 2
+
+    def test_now_matches_rtc_tuple(self, clock):
+        rtc = CountingRtc(clock, start=(2025, 6, 30, 8, 59, 58))
+        soft = SoftClock(rtc)
+        clock.advance(2000)
+        assert soft.now() == (2025, 6, 30, 9, 0, 0, 3, 30)
+
+    def test_new_day_reanchors_date(self, clock):
+        rtc = CountingRtc(clock, start=(2025, 1, 1, 23, 59, 59))
+        soft = SoftClock(rtc)
+        soft.seconds()
+        clock.advance(1500)
+        assert soft.now()[:6] == (2025, 1, 2, 0, 0, 0)
+
+    def test_drift_is_measured_at_reanchor(self, clock):
+        rtc = CountingRtc(clock, ppm=2000) # RTC gains 2 ms per second on the ticks
+        soft = SoftClock(rtc, resync_ms=600000)
+        soft.seconds()
+        clock.advance(600000)
+        soft.seconds()
+
+        stats = soft.stats()
+        assert stats["resyncs"] == 2
+        assert stats["last_drift_ms"] == 1000 # 1.2 s, quantized to the RTC second
+        assert stats["max_drift_ms"] == 1000
+        assert stats["drift_ppm"] > 0
+
+    def test_forced_resync_follows_new_rtc_time(self, clock):
+        rtc = CountingRtc(clock)
+        soft = SoftClock(rtc)
+        soft.seconds()
+        rtc._start_s = 18 * 3600 # DS3231_RTC.datetime was set
+        soft.resync()
+        assert soft.time == "18:00:00"
+
+
+class TestSquareWaveTick:
+    """Group tests for the SQW-driven one-second tick."""
+
+    def test_one_pending_tick_per_edge(self, clock):
+        rtc = SqwRtc(clock)
+        pin = FakePin()
+        tick = SquareWaveTick(rtc, pin)
+
+        assert rtc.sqw == rtc.FREQ_1
+        assert tick.pending() is False
+        pin.fire()
+        assert tick.pending() is True
+        assert tick.pending() is False
+
+    def test_missed_edges_are_coalesced(self, clock):
+        tick = SquareWaveTick(SqwRtc(clock), FakePin())
+        tick._pin.fire()
+        tick._pin.fire()
+        assert tick.pending() is True
+        assert tick.pending() is False
+
+    def test_edge_aligns_software_clock(self, clock):
+        rtc = SqwRtc(clock)
+        soft = SoftClock(rtc)
+        soft.seconds() # Anchored at mid-second: 12:00:00.500
+        pin = FakePin()
+        tick = SquareWaveTick(rtc, pin, soft)
+
+        clock.advance(400) # The RTC second actually changes here
+        pin.fire()
+        clock.advance(80)  # Consumed by the next display refresh
+        assert tick.pending()
+        assert soft._ms_of_day() == 12 * 3600000 + 1000 + 80
+
+    def test_disable_stops_square_wave(self, clock):
+        rtc = SqwRtc(clock)
+        pin = FakePin()
+        SquareWaveTick(rtc, pin).disable()
+        assert pin.handler is None
+        assert rtc.sqw is False
+
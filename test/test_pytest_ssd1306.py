@@ -0,0 +1,425 @@
+import sys
+import os
+import random
+import pytest
+
+# Add the project root to the path to allow importing ssd1306 from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import install_fake_framebuf, install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks('machine')
+install_fake_framebuf()
+
+import ssd1306
+import pymenu
+from ssd1306 import SSD1306_I2C
+from ssd1306_emulator import SSD1306Emulator
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def panel():
+    return SSD1306Emulator()
+
+@pytest.fixture
+def display(panel):
+    oled = SSD1306_I2C(128, 64, panel)
+    panel.reset_counters()
+    panel.commands = []
+    oled.reset_stats()
+    return oled
+
+def in_sync(display, panel):
+    return panel.frame() == bytes(display.buffer[1:])
+
+@pytest.fixture
+def shadowed(panel):
+    oled = SSD1306_I2C(128, 64, panel, shadow=True)
+    panel.reset_counters()
+    oled.reset_stats()
+    return oled
+
+# --- Test Cases ---
+
+class TestSSD1306DirtyRegions:
+    """Group tests for the partial flushes."""
+
+    def test_init_sends_the_whole_frame(self, panel):
+        oled = SSD1306_I2C(128, 64, panel)
+        assert panel.on
+        assert oled.stats() == {"flushes": 1, "skipped": 0, "deferred": 0, "windows": 1, "reused": 0, "pages": 8, "bytes": 1024}
+        assert in_sync(oled, panel)
+
+    def test_show_without_drawing_sends_nothing(self, display, panel):
+        display.show()
+        assert panel.transactions == 0
+        assert display.flushes == 0
+        assert display.flushes_skipped == 1
+
+    def test_text_sends_only_its_window(self, display, panel):
+        display.text("12:00:00", 30, 5, 1)
+        display.show()
+        assert display.dirty_windows() == []
+        assert (0x21, 30, 93) in panel.commands
+        assert (0x22, 0, 1) in panel.commands
+        assert panel.data_bytes == 64 * 2
+        assert in_sync(display, panel)
+
+    def test_separate_pages_are_separate_windows(self, display, panel):
+        display.pixel(3, 0, 1)
+        display.fill_rect(10, 40, 5, 3, 1)
+        assert display.dirty_windows() == [(3, 3, 0, 0), (10, 14, 5, 5)]
+        display.show()
+        assert panel.data_bytes == 1 + 5
+        assert in_sync(display, panel)
+
+    def test_adjacent_pages_merge_into_one_window(self, display, panel):
+        display.hline(0, 7, 10, 1)
+        display.vline(20, 8, 8, 1)
+        assert display.dirty_windows() == [(0, 20, 0, 1)]
+
+    def test_drawing_is_clipped_to_the_screen(self, display, panel):
+        display.text("HELLO", 100, 60, 1)
+        display.rect(-5, -5, 10, 10, 1)
+        display.line(120, 70, 130, 62, 1)
+        assert display.dirty_windows() == [(0, 4, 0, 0), (100, 127, 7, 7)]
+        display.show()
+        assert in_sync(display, panel)
+
+    def test_blit_without_size_marks_the_whole_screen(self, display, panel):
+        sprite = sys.modules['framebuf'].FrameBuffer(bytearray(8), 8, 8, sys.modules['framebuf'].MONO_HLSB)
+        display.blit(sprite, 4, 4, w=8, h=8)
+        assert display.dirty_windows() == [(4, 11, 0, 1)]
+        display.blit(sprite, 4, 4)
+        assert display.dirty_windows() == [(0, 127, 0, 7)]
+
+    def test_full_frame_after_fill_and_invalidate(self, display, panel):
+        display.fill(1)
+        display.show()
+        assert panel.data_bytes == 1024
+        assert panel.transactions == 1 # Same window as the first frame: no commands
+        display.invalidate()
+        display.show()
+        assert display.stats()["bytes"] == 2048
+        assert in_sync(display, panel)
+
+    def test_pixel_read_does_not_mark(self, display):
+        assert display.pixel(5, 5) == 0
+        assert display.dirty_windows() == []
+
+    def test_64_wide_panel_is_offset(self):
+        panel = SSD1306Emulator(width=64, height=48)
+        oled = SSD1306_I2C(64, 48, panel)
+        oled.text("AB", 0, 0, 1)
+        oled.show()
+        assert (0x21, 32, 47) in panel.commands
+        assert panel.frame(offset=32) == bytes(oled.buffer[1:])
+
+
+class TestSSD1306Batching:
+    """Group tests for the batched command transactions."""
+
+    def test_init_is_one_command_transaction(self, panel):
+        SSD1306_I2C(128, 64, panel)
+        assert panel.transactions == 2 # Init commands, then the first frame
+        assert panel.commands[0] == (0xAE,)
+        assert (0xA8, 63) in panel.commands
+        assert panel.commands[-3:] == [(0xAF,), (0x21, 0, 127), (0x22, 0, 7)]
+
+    def test_window_commands_share_the_data_transaction(self, display, panel):
+        display.text("12", 30, 5, 1)
+        display.show()
+        assert panel.transactions == 1
+        assert panel.bytes == 1 + 12 + 1 + 16 * 2 # Address, 6 framed commands, data control, data
+        assert in_sync(display, panel)
+
+    def test_unchanged_window_is_not_reprogrammed(self, display, panel):
+        for value in ("12:00:00", "12:00:01"):
+            display.text(value, 30, 5, 1)
+            display.show()
+        assert display.stats()["reused"] == 1
+        assert panel.commands.count((0x21, 30, 93)) == 1
+        assert in_sync(display, panel)
+
+    def test_write_data_forgets_the_window(self, display, panel):
+        display.text("AB", 0, 0, 1)
+        display.show()
+        display.write_data(b"\x00")
+        display.text("AB", 0, 0, 1)
+        display.show()
+        assert panel.commands.count((0x21, 0, 15)) == 2
+
+    def test_contrast_is_one_transaction(self, display, panel):
+        display.contrast(0x40)
+        assert panel.transactions == 1
+        assert panel.commands[-1] == (0x81, 0x40)
+
+
+class TestSSD1306Shadow:
+    """Group tests for the shadow-buffer frame diff."""
+
+    def test_identical_redraw_skips_the_bus(self, shadowed, panel):
+        shadowed.text("MENU", 0, 0, 1)
+        shadowed.show()
+        panel.reset_counters()
+        shadowed.fill(0)
+        shadowed.text("MENU", 0, 0, 1)
+        shadowed.show()
+        assert panel.transactions == 0
+        assert shadowed.flushes_skipped == 1
+        assert in_sync(shadowed, panel)
+
+    def test_only_changed_pages_are_sent(self, shadowed, panel):
+        shadowed.text("ROW 0", 0, 0, 1)
+        shadowed.text("ROW 3", 0, 24, 1)
+        shadowed.show()
+        shadowed.reset_stats()
+        panel.reset_counters()
+        shadowed.fill(0) # Whole screen dirty, only page 3 changes
+        shadowed.text("ROW 0", 0, 0, 1)
+        shadowed.text("ROW 4", 0, 24, 1)
+        shadowed.show()
+        assert shadowed.stats()["pages"] == 1
+        assert panel.data_bytes == 128
+        assert (0x22, 3, 3) in panel.commands
+        assert in_sync(shadowed, panel)
+
+    def test_change_at_the_window_edge_is_seen(self, shadowed, panel):
+        shadowed.show()
+        shadowed.fill_rect(10, 8, 30, 8, 1)
+        shadowed.show()
+        shadowed.reset_stats()
+        shadowed.fill_rect(10, 8, 30, 8, 1) # Same window, only its last column differs
+        shadowed.pixel(39, 15, 0)
+        shadowed.show()
+        assert shadowed.stats()["pages"] == 1
+        shadowed.pixel(39, 15, 1) # Back to the first frame: the shadow kept the last one
+        shadowed.show()
+        assert shadowed.stats()["pages"] == 2
+        assert in_sync(shadowed, panel)
+
+    def test_random_drawing_keeps_the_panel_in_sync(self, shadowed, panel):
+        rng = random.Random(1306)
+        for _ in range(200):
+            for _ in range(rng.randint(0, 4)):
+                x, y = rng.randint(-8, 135), rng.randint(-8, 71)
+                c = rng.randint(0, 1)
+                op = rng.randint(0, 3)
+                if op == 0:
+                    shadowed.pixel(x, y, c)
+                elif op == 1:
+                    shadowed.fill_rect(x, y, rng.randint(1, 40), rng.randint(1, 20), c)
+                elif op == 2:
+                    shadowed.text("AB", x, y, c)
+                else:
+                    shadowed.line(x, y, rng.randint(0, 127), rng.randint(0, 63), c)
+            shadowed.show()
+            assert in_sync(shadowed, panel)
+
+    def test_changed_pages_split_into_runs(self, shadowed, panel):
+        for page in (1, 2, 5):
+            shadowed.pixel(0, page * 8, 1)
+        shadowed.fill_rect(0, 0, 128, 64, 0) # Clears them again, except where redrawn
+        shadowed.show()
+        panel.reset_counters()
+        for page in (1, 2, 5):
+            shadowed.pixel(0, page * 8, 1)
+        shadowed.show()
+        assert shadowed.stats()["windows"] == 2
+        assert (0x22, 1, 2) in panel.commands
+        assert (0x22, 5, 5) in panel.commands
+        assert in_sync(shadowed, panel)
+
+    def test_invalidate_resends_everything(self, shadowed, panel):
+        shadowed.invalidate()
+        shadowed.show()
+        assert panel.data_bytes == 1024
+
+    def test_shadow_can_be_switched_off(self, shadowed, panel):
+        shadowed.shadow = False
+        shadowed.fill(0)
+        shadowed.show()
+        assert panel.data_bytes == 1024
+        shadowed.shadow = True
+        panel.reset_counters()
+        shadowed.fill(0)
+        shadowed.show() # First frame after enabling: the panel content is unknown
+        assert panel.data_bytes == 1024
+
+
+class TestSSD1306Frames:
+    """Group tests for the frame() transactions that coalesce show() calls."""
+
+    def test_show_inside_a_frame_is_deferred(self, display, panel):
+        with display.frame():
+            display.text("A", 0, 0, 1)
+            display.show()
+            with display.frame():
+                display.text("B", 0, 16, 1)
+                display.show()
+            assert panel.transactions == 0
+        assert display.flushes == 1
+        assert display.flushes_deferred == 2
+        assert in_sync(display, panel)
+
+    def test_frame_without_show_does_not_flush(self, display, panel):
+        with display.frame():
+            display.text("A", 0, 0, 1)
+        assert panel.transactions == 0
+
+    def test_clear_portion_is_one_flush(self, display, panel):
+        display.fill(1)
+        display.show()
+        display.reset_stats()
+        display.clear_portion(10, 10, 20, 20)
+        assert display.flushes == 1
+        assert in_sync(display, panel)
+
+    def test_one_flush_per_menu_action(self, panel):
+        oled = SSD1306_I2C(128, 64, panel, shadow=True)
+        state = {"light": False}
+        def toggle():
+            state["light"] = not state["light"]
+        menu = pymenu.Menu(object())
+        menu.set_main_screen(
+            pymenu.MenuList(oled, 'MENU')
+            .add(pymenu.MenuList(oled, 'RELAYS')
+                .add(pymenu.ToggleItem(oled, 'LIGHTS', lambda: state["light"], toggle, ('ON', 'OFF')))
+                .add(pymenu.BackItem(oled)))
+            .add(pymenu.MenuMonitoringSensor(oled, 'MONITORING'))
+            .add(pymenu.BackItem(oled)))
+        menu.draw()
+
+        actions = (
+            lambda: menu.move(1), lambda: menu.move(-1),
+            menu.click, # Into RELAYS
+            menu.click, # Toggle LIGHTS: the callback, then the list redraws
+            lambda: menu.shift(1), # Ignored by a list, still redrawn
+            lambda: menu.move(1), menu.click, # BACK
+        )
+        for action in actions:
+            oled.reset_stats()
+            action()
+            assert oled.flushes + oled.flushes_skipped == 1
+        assert state["light"]
+        assert menu.current_screen.name == 'MENU'
+        assert in_sync(oled, panel)
+
+
+class TestSSD1306HardwareScroll:
+    """Group tests for the controller's continuous scrolling."""
+
+    def test_horizontal_scroll_is_one_command_transaction(self, display, panel):
+        display.hw_scroll_h(-1, 2, 3, frames=25)
+        assert panel.transactions == 1
+        assert panel.scrolling
+        assert panel.scroll_setup == (0x27, 0x00, 2, 0x06, 3, 0x00, 0xFF)
+        assert display.hw_scrolling
+
+    def test_scrolling_costs_no_bus_traffic(self, display, panel):
+        display.hw_scroll_h()
+        panel.reset_counters()
+        for _ in range(10):
+            display.show()
+        assert panel.transactions == 0
+
+    def test_drawing_stops_the_scroll_and_resends_the_frame(self, display, panel):
+        display.hw_scroll_h()
+        display.text("NEW", 0, 0, 1)
+        panel.reset_counters()
+        display.show()
+        assert not panel.scrolling
+        assert not display.hw_scrolling
+        assert panel.data_bytes == 1024
+        assert panel.writes_while_scrolling == 0
+        assert in_sync(display, panel)
+
+    def test_pending_drawing_is_flushed_before_scrolling(self, display, panel):
+        display.text("MARQUEE", 0, 16, 1)
+        display.hw_scroll_h(1, 2, 2)
+        assert panel.writes_while_scrolling == 0
+        assert in_sync(display, panel)
+
+    def test_vertical_scroll_sets_the_area(self, display, panel):
+        display.hw_scroll_v(2, top=8, start_page=7, end_page=7, frames=2)
+        assert (0xA3, 8, 56) in panel.commands
+        assert panel.scroll_setup == (0x29, 0x00, 7, 0x07, 7, 2)
+
+    def test_scroll_screen_in_out_uses_the_text_pages(self, display, panel):
+        display.scroll_screen_in_out([[0, 0, "ROW 1"], [0, 16, "ROW 2"]])
+        assert panel.scroll_setup == (0x26, 0x00, 0, 0x00, 2, 0x00, 0xFF)
+        assert in_sync(display, panel)
+
+    def test_vertical_helper_falls_back_without_a_blank_page(self, display, panel):
+        screen = [[0, y, "ROW"] for y in range(0, 64, 8)]
+        display.scroll_screen_in_out_v(screen)
+        assert not panel.scrolling
+        assert display.flushes > 100
+        display.reset_stats()
+        display.scroll_screen_in_out_v(screen[:7])
+        assert panel.scroll_setup[2] == 7 # The blank last page takes the sideways part
+        assert display.flushes == 1
+
+    def test_horizontal_helper_falls_back_without_text_on_screen(self, display, panel):
+        display.scroll_screen_in_out([])
+        display.scroll_screen_in_out([[0, 100, "BELOW"]])
+        assert not panel.scrolling
+        assert not display.hw_scrolling
+
+    def test_software_scroll_out(self, display, panel):
+        display.fill(1)
+        display.scroll_out_screen(16)
+        assert display.flushes == 8
+        assert in_sync(display, panel)
+
+    def test_init_stops_a_scroll_left_running(self, display, panel):
+        display.hw_scroll_h()
+        display.init_display()
+        assert not panel.scrolling
+        assert not display.hw_scrolling
+
+
+class TestSSD1306Glyphs:
+    """Group tests for the scaled font renderer and its glyph cache."""
+
+    def test_glyph_scales_the_font(self, display):
+        display.text("7", 0, 0)
+        sprite = ssd1306.glyph("7", 3)
+        for y in range(24):
+            for x in range(24):
+                assert sprite.pixel(x, y) == display.pixel(x // 3, y // 3)
+
+    def test_glyphs_are_cached(self):
+        ssd1306._glyphs.clear()
+        assert ssd1306.glyph("5", 2) is ssd1306.glyph("5", 2)
+        assert ssd1306.glyph("5", 3) is not ssd1306.glyph("5", 2)
+        assert len(ssd1306._glyphs) == 2
+
+    def test_cache_is_bounded(self):
+        ssd1306._glyphs.clear()
+        for n in range(ssd1306.GLYPH_CACHE_SIZE + 1):
+            ssd1306.glyph(chr(33 + n), 2)
+        assert len(ssd1306._glyphs) <= ssd1306.GLYPH_CACHE_SIZE
+
+    def test_write_text_keeps_the_rest_of_the_screen(self, display):
+        display.fill_rect(0, 40, 128, 24, 1)
+        display.write_text("42", 8, 4, 2)
+        assert display.pixel(0, 63) == 1
+        for x in range(32):
+            for y in range(16):
+                assert display.pixel(8 + x, 4 + y) == ssd1306.glyph("42"[x // 16], 2).pixel(x % 16, y)
+
+    def test_write_text_sends_only_its_cells(self, display, panel):
+        display.write_text("12", 0, 0, 2)
+        display.show()
+        assert panel.data_bytes == 32 * 2
+        assert in_sync(display, panel)
+
+    def test_color_zero_inverts_the_cell(self, display):
+        display.write_text("1", 0, 0, 2, 0)
+        sprite = ssd1306.glyph("1", 2)
+        for x in range(16):
+            for y in range(16):
+                assert display.pixel(x, y) == 1 - sprite.pixel(x, y)
@@ -0,0 +1,83 @@
+import sys
+import os
+import pytest
+
+# Add the project root to the path to allow importing startup from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import FakeTime
+
+import startup
+from startup import BootPipeline, STATUS_OK, STATUS_FAILED, STATUS_TIMEOUT, STATUS_SKIPPED
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(startup, 'time', fake)
+    return fake
+
+# --- Test Cases ---
+
+class TestBootPipeline:
+    """Group tests for the staged startup."""
+
+    def test_foreground_stages_are_timed(self, clock):
+        boot = BootPipeline()
+        assert boot.run("display", lambda: clock.advance(30) or "oled") == "oled"
+        boot.timeline.mark_first_frame()
+
+        assert boot.timeline.stages == [("display", 0, 30, STATUS_OK)]
+        assert boot.timeline.first_frame_ms == 30
+
+    def test_foreground_failure_is_recorded_and_raised(self, clock):
+        boot = BootPipeline()
+        with pytest.raises(OSError):
+            boot.run("display", lambda: (_ for _ in ()).throw(OSError(19)))
+        assert boot.timeline.status("display") == STATUS_FAILED
+
+    def test_background_stages_run_one_step_at_a_time(self, clock):
+        ran = []
+        boot = BootPipeline()
+        boot.defer("a", lambda: ran.append("a") or True, 1000)
+        boot.defer("b", lambda: ran.append("b") or True, 1000)
+
+        assert boot.step() is True
+        assert ran == ["a"]
+        assert boot.step() is False
+        assert ran == ["a", "b"]
+        assert boot.done
+
+    def test_polled_stage_times_out_and_dependents_are_skipped(self, clock):
+        boot = BootPipeline()
+        boot.defer("wifi", lambda: False, 200)
+        boot.defer("ntp", lambda: True, 1000, requires="wifi")
+        boot.defer("sd", lambda: True, 1000)
+
+        boot.run_all(step_ms=50)
+
+        assert boot.timeline.status("wifi") == STATUS_TIMEOUT
+        assert boot.timeline.status("ntp") == STATUS_SKIPPED
+        assert boot.timeline.status("sd") == STATUS_OK
+        assert boot.timeline.stages[0][2] == 200
+
+    def test_exception_fails_only_that_stage(self, clock):
+        boot = BootPipeline()
+        boot.defer("sensors", lambda: 1 / 0, 1000)
+        boot.defer("sd", lambda: True, 1000)
+        boot.run_all()
+
+        assert boot.timeline.status("sensors") == STATUS_FAILED
+        assert boot.timeline.status("sd") == STATUS_OK
+
+    def test_repeated_stages_keep_only_their_latest_run(self, clock):
+        boot = BootPipeline()
+        boot.run("display", lambda: True)
+        for n in range(50): # A device running for months resyncs again and again
+            boot.defer("wifi", lambda: True, 1000)
+            boot.defer("ntp", lambda: clock.advance(n) or True, 1000, requires="wifi")
+            boot.run_all()
+
+        assert [stage[0] for stage in boot.timeline.stages] == ["display", "wifi", "ntp"]
+        assert boot.timeline.stages[-1][2] == 49
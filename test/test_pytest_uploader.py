@@ -0,0 +1,160 @@
+import sys
+import os
+import threading
+from unittest.mock import MagicMock
+import pytest
+
+# Add the project root to the path to allow importing uploader from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import HostTicks, HOST_TIME
+
+import uploader
+from uploader import UploadQueue, Uploader, DROP_OLDEST, DROP_NEWEST
+
+# --- Helpers ---
+
+class StalledConnection:
+    """ConnectionManaging stand-in whose uploads block until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.sent = []
+
+    def send_value_to_web(self, value, key, timestamp):
+        self.release.wait(5)
+        self.sent.append((value, key, timestamp))
+        return True
+
+
+def loop_latencies_us(submit, iterations=200, work_ms=1):
+    """
+    Simulates the main loop: one unit of UI/sensor work plus one upload
+    request per iteration. Returns the per-iteration latencies.
+    """
+    latencies = []
+    for i in range(iterations):
+        t0 = HOST_TIME.perf_counter()
+        submit(str(i), "Temp", "1700000000")
+        HOST_TIME.sleep(work_ms / 1000)
+        latencies.append(int((HOST_TIME.perf_counter() - t0) * 1000000))
+    return latencies
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture(autouse=True)
+def host_clock(monkeypatch):
+    """The worker thread needs real sleeps."""
+    monkeypatch.setattr(uploader, 'time', HostTicks)
+
+# --- Test Cases ---
+
+class TestUploadQueue:
+    """Group tests for the bounded ring queue."""
+
+    def test_fifo_order(self):
+        queue = UploadQueue(4)
+        queue.put(1, "Temp", "t1")
+        queue.put(2, "Ec", "t2")
+        assert queue.get() == (1, "Temp", "t1")
+        assert queue.get() == (2, "Ec", "t2")
+        assert queue.get() is None
+
+    def test_drop_oldest_when_full(self):
+        queue = UploadQueue(3, DROP_OLDEST)
+        for i in range(5):
+            assert queue.put(i, "Temp", "t") is True
+        assert len(queue) == 3
+        assert queue.dropped == 2
+        assert [queue.get()[0] for _ in range(3)] == [2, 3, 4]
+
+    def test_drop_newest_when_full(self):
+        queue = UploadQueue(3, DROP_NEWEST)
+        for i in range(3):
+            queue.put(i, "Temp", "t")
+        assert queue.put(99, "Temp", "t") is False
+        assert queue.dropped == 1
+        assert [queue.get()[0] for _ in range(3)] == [0, 1, 2]
+
+    def test_wraps_around(self):
+        queue = UploadQueue(2)
+        for i in range(7):
+            queue.put(i, "Temp", "t")
+            assert queue.get()[0] == i
+
+
+class TestUploader:
+    """Group tests for the background upload worker."""
+
+    def test_failed_upload_is_counted(self):
+        conn = MagicMock()
+        conn.send_value_to_web.side_effect = [False, OSError("timeout")]
+        worker = Uploader(conn, stack_size=0)
+        worker.submit("1", "Temp", "t")
+        worker.submit("2", "Temp", "t")
+
+        assert worker.process_one() is True
+        assert worker.process_one() is True
+        assert worker.process_one() is False
+        assert worker.stats() == {"queued": 0, "sent": 0, "failed": 2, "dropped": 0}
+
+    def test_pause_waits_for_the_upload_in_flight(self):
+        conn = MagicMock()
+        worker = Uploader(conn, stack_size=0)
+        seen = []
+        conn.send_value_to_web.side_effect = lambda *args: seen.append((worker.idle, worker.pause())) or True
+        worker.submit("1", "Temp", "t")
+        worker.submit("2", "Temp", "t")
+
+        assert worker.process_one() is True
+        assert seen == [(False, False)] # Busy from the moment the reading left the queue
+        assert worker.pause() is True
+        assert worker.process_one() is False
+        worker.resume()
+        assert worker.process_one() is True
+
+    def test_main_loop_latency_stays_flat_while_uploads_stall(self):
+        """
+        Latency harness: with the network stalled, the loop's worst-case
+        iteration stays at the level of an idle network, while an inline
+        (blocking) send would cost the whole stall.
+        """
+        conn = StalledConnection()
+        conn.release.set()
+        idle_worker = Uploader(conn, capacity=8, idle_ms=1, stack_size=0)
+        idle_worker.start()
+        idle = loop_latencies_us(idle_worker.submit)
+        idle_worker.stop()
+
+        conn = StalledConnection()
+        worker = Uploader(conn, capacity=8, idle_ms=1, stack_size=0)
+        worker.start()
+        try:
+            stalled = loop_latencies_us(worker.submit)
+            assert conn.sent == []  # The network never answered during the run
+            assert worker.queue.dropped > 0
+        finally:
+            conn.release.set()
+            worker.stop()
+
+        assert max(stalled) < max(idle) + 20000
+        assert max(stalled) < 50000
+
+        conn = StalledConnection()
+        threading.Timer(0.2, conn.release.set).start()
+        inline = loop_latencies_us(conn.send_value_to_web, iterations=1)
+        assert inline[0] >= 200000
+
+    def test_worker_drains_queue(self):
+        conn = StalledConnection()
+        conn.release.set()
+        worker = Uploader(conn, idle_ms=1, stack_size=0)
+        worker.start()
+        for i in range(5):
+            worker.submit(str(i), "PH", "t")
+        deadline = HOST_TIME.monotonic() + 2
+        while len(conn.sent) < 5 and HOST_TIME.monotonic() < deadline:
+            HOST_TIME.sleep(0.01)
+        worker.stop()
+        assert [s[0] for s in conn.sent] == ["0", "1", "2", "3", "4"]
+        assert worker.stats()["sent"] == 5
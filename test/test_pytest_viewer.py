@@ -0,0 +1,129 @@
+import sys
+import os
+import importlib.util
+from unittest.mock import MagicMock, patch
+import pytest
+
+# Add the project root to the path to allow importing viewer from the parent directory.
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from micropython_fakes import FakeTime, install_micropython_mocks
+
+install_micropython_mocks('machine')
+
+import animation
+import softclock
+from Config import Config
+
+
+def load_viewer():
+    """
+    Loads viewer.py under a private name, with its display, SD and network
+    dependencies mocked only while it is imported (test_pytest_esp32_app.py
+    replaces the 'viewer' module itself with a mock).
+    """
+    mocks = {name: MagicMock() for name in
+             ('ssd1306', 'pymenu', 'images_repo', 'sdCardManager', 'ntptime', 'network', 'urequests')}
+    with patch.dict(sys.modules, mocks):
+        spec = importlib.util.spec_from_file_location('viewer_under_test', os.path.join(ROOT, 'viewer.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+viewer_module = load_viewer()
+
+# --- Helpers ---
+
+class FakePin:
+    def __init__(self):
+        self.handler = None
+
+    def irq(self, trigger=None, handler=None):
+        self.handler = handler
+
+    def fire(self):
+        self.handler(self)
+
+# --- Pytest Fixtures ---
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(softclock, 'time', fake)
+    return fake
+
+@pytest.fixture
+def viewer(clock):
+    v = viewer_module.Viewer(i2c=MagicMock(), config=Config(), deferred=True)
+    v.ds = MagicMock()
+    v.ds.now.return_value = (2025, 1, 1, 12, 0, 0, 3, 1)
+    v.clock = softclock.SoftClock(v.ds)
+    v.show_first_frame()
+    v.display.reset_mock()
+    return v
+
+# --- Test Cases ---
+
+class TestViewerClockRedraw:
+    """Group tests for the main-screen clock refresh."""
+
+    def test_polled_clock_redraws_once_per_second_without_rtc_reads(self, viewer, clock):
+        reads = viewer.ds.now.call_count
+        for _ in range(30): # 3 s of 10 Hz refreshes
+            clock.advance(100)
+            viewer.run()
+
+        assert viewer.display.show.call_count == 3
+        assert viewer.ds.now.call_count == reads
+
+    def test_sqw_tick_redraws_once_per_edge(self, viewer, clock):
+        pin = FakePin()
+        viewer.tick = softclock.SquareWaveTick(viewer.ds, pin, viewer.clock)
+
+        for edge in range(3):
+            pin.fire()
+            for _ in range(10):
+                clock.advance(100)
+                viewer.run()
+
+        assert viewer.display.show.call_count == 3
+        assert viewer.time == "12:00:03"
+
+    def test_clock_tick_redraws_only_the_time_box(self, viewer, clock):
+        clock.advance(1000)
+        viewer.run()
+        assert viewer.display.fill_rect.call_args_list == [((26, 3, 73, 12, 0),)]
+        assert viewer.display.text.call_count == 1
+
+        viewer.temperature = "25"
+        clock.advance(1000)
+        viewer.display.reset_mock()
+        viewer.run()
+        assert viewer.display.fill_rect.call_count == 3 # Time box and the reading rows
+        assert viewer.display.show.call_count == 1
+
+    @pytest.mark.parametrize("reading, text, size", [(24.56, "24.6", 2), (23.25, "23.2", 2), (100.25, "100.2", 1)])
+    def test_reading_and_unit_fit_on_the_panel(self, viewer, reading, text, size):
+        viewer.temperature = reading
+        viewer.show_readings()
+        viewer.display.write_text.assert_called_once_with(text, 48, 17, size)
+        unit_x = viewer.display.text.call_args_list[0][0][1]
+        assert unit_x == 48 + len(text) * 8 * size + 8
+        assert unit_x + 8 <= viewer.oled_width
+
+    def test_animation_owns_the_screen_until_it_ends(self, viewer, clock, monkeypatch):
+        monkeypatch.setattr(animation, 'time', clock)
+        frames = []
+        def blink():
+            for n in range(3):
+                frames.append(n)
+                yield
+        viewer.animator.start("blink", blink(), viewer._end_animation)
+        viewer.transition_ms = 0
+        for _ in range(10):
+            clock.advance(100)
+            viewer.run()
+        assert frames == [0, 1, 2]
+        assert not viewer.animator.busy
+        assert viewer.display.fill_rect.call_args_list[0] == ((0, 0, 128, 51, 0),) # Main screen redrawn after it
@@ -0,0 +1,69 @@
+import sys
+import os
+
+# Add the project root to the path to allow importing warmstart from the parent directory.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from micropython_fakes import install_micropython_mocks
+
+# Mock MicroPython-specific modules before they are imported by the module under test.
+install_micropython_mocks('machine')
+
+from warmstart import WarmStart, RTC_MEMORY_SIZE
+from Config import Config
+
+# --- Helpers ---
+
+class FakeRtcMemory:
+    def __init__(self):
+        self.data = b""
+
+    def memory(self, data=None):
+        if data is None:
+            return self.data
+        self.data = bytes(data)
+
+# --- Test Cases ---
+
+class TestWarmStart:
+    """Group tests for the RTC-memory snapshot."""
+
+    def test_round_trip(self):
+        memory = FakeRtcMemory()
+        config = Config()
+        config.set_on_off_filter(True)
+
+        assert WarmStart(memory).save(config.to_dict(), 0b1010, b'\x28\xff\x01')
+        assert len(memory.data) < RTC_MEMORY_SIZE
+
+        restored, relays, rom = WarmStart(memory).load()
+        assert restored == config.to_dict()
+        assert relays == 0b1010
+        assert rom == b'\x28\xff\x01'
+
+    def test_corrupted_snapshot_is_ignored(self):
+        memory = FakeRtcMemory()
+        WarmStart(memory).save(Config().to_dict(), 1)
+        data = bytearray(memory.data)
+        data[-3] ^= 0x01 # A single flipped bit fails the CRC
+        memory.data = bytes(data)
+
+        assert WarmStart(memory).load() is None
+
+    def test_empty_or_foreign_memory_is_ignored(self):
+        memory = FakeRtcMemory()
+        assert WarmStart(memory).load() is None
+        memory.data = b"not a snapshot at all"
+        assert WarmStart(memory).load() is None
+
+    def test_oversized_snapshot_is_not_written(self):
+        memory = FakeRtcMemory()
+        assert not WarmStart(memory).save({"blob": "x" * RTC_MEMORY_SIZE}, 0)
+        assert memory.data == b""
+
+    def test_clear(self):
+        memory = FakeRtcMemory()
+        warm = WarmStart(memory)
+        warm.save(Config().to_dict(), 0)
+        warm.clear()
+        assert warm.load() is None
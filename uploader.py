@@ -0,0 +1,202 @@
+import _thread
+import time
+
+# What to do when a reading arrives and the queue is full
+DROP_OLDEST = 0  # Overwrite the oldest queued reading (keep the freshest data)
+DROP_NEWEST = 1  # Reject the new reading
+
+
+class UploadQueue:
+    """
+    Bounded, lock-protected ring queue of (value, key, timestamp) readings.
+
+    All slots are allocated up front; put() and get() only move indexes under
+    the lock, so producers never wait for the consumer.
+    """
+
+    def __init__(self, capacity=16, drop_policy=DROP_OLDEST):
+        self._capacity = capacity
+        self._drop_policy = drop_policy
+        self._values = [None] * capacity
+        self._keys = [None] * capacity
+        self._timestamps = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self._dropped = 0
+        self._lock = _thread.allocate_lock()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def dropped(self):
+        """Number of readings lost because the queue was full."""
+        return self._dropped
+
+    @property
+    def lock(self):
+        """The queue lock, for callers that pair a take() with their own state."""
+        return self._lock
+
+    def __len__(self):
+        return self._count
+
+    def put(self, value, key, timestamp):
+        """
+        Queues a reading. Returns False if it was rejected (DROP_NEWEST).
+        """
+        with self._lock:
+            if self._count == self._capacity:
+                self._dropped += 1
+                if self._drop_policy == DROP_NEWEST:
+                    return False
+                # DROP_OLDEST: advance the head over the oldest reading
+                self._head = (self._head + 1) % self._capacity
+                self._count -= 1
+            tail = (self._head + self._count) % self._capacity
+            self._values[tail] = value
+            self._keys[tail] = key
+            self._timestamps[tail] = timestamp
+            self._count += 1
+            return True
+
+    def get(self):
+        """
+        Removes and returns the oldest reading as (value, key, timestamp),
+        or None if the queue is empty.
+        """
+        with self._lock:
+            return self.take()
+
+    def take(self):
+        """
+        get() for a caller already holding the lock.
+        """
+        if not self._count:
+            return None
+        head = self._head
+        item = (self._values[head], self._keys[head], self._timestamps[head])
+        self._values[head] = self._keys[head] = self._timestamps[head] = None
+        self._head = (head + 1) % self._capacity
+        self._count -= 1
+        return item
+
+
+class Uploader:
+    """
+    Background worker that sends queued readings to the web server.
+
+    The UI/sensor loop only calls submit(); connect, POST and disconnect
+    (ConnectionManaging.send_value_to_web) run in a separate _thread.
+    Other users of the WiFi connection take it over with pause() and give
+    it back with resume().
+    """
+
+    def __init__(self, conn, capacity=16, drop_policy=DROP_OLDEST, idle_ms=200, stack_size=16 * 1024):
+        """
+        Args:
+            conn (ConnectionManaging): Connection used to send the readings.
+            capacity (int): Maximum number of queued readings.
+            drop_policy (int): DROP_OLDEST or DROP_NEWEST when the queue is full.
+            idle_ms (int): Worker poll period while the queue is empty.
+            stack_size (int): Worker thread stack size (TLS needs a large stack).
+        """
+        self._conn = conn
+        self._queue = UploadQueue(capacity, drop_policy)
+        self._idle_ms = idle_ms
+        self._stack_size = stack_size
+        self._running = False
+        self._busy = False
+        self._paused = False
+        self._sent = 0
+        self._failed = 0
+
+    @property
+    def queue(self):
+        return self._queue
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def idle(self):
+        """True if nothing is queued and no upload is in progress."""
+        with self._queue.lock:
+            return not self._busy and not len(self._queue)
+
+    @property
+    def paused(self):
+        return self._paused
+
+    def pause(self):
+        """
+        Stops the worker from starting new uploads, so the caller can use
+        the connection alone. Returns True once no upload is in progress;
+        until then the caller must wait and call it again.
+        """
+        with self._queue.lock:
+            self._paused = True
+            return not self._busy
+
+    def resume(self):
+        """Lets the worker upload again after pause()."""
+        self._paused = False
+
+    def start(self):
+        """Starts the worker thread."""
+        if self._running:
+            return
+        self._running = True
+        if self._stack_size:
+            _thread.stack_size(self._stack_size)
+        _thread.start_new_thread(self._worker, ())
+
+    def stop(self):
+        """Asks the worker to exit after the current upload."""
+        self._running = False
+
+    def submit(self, value, key, timestamp):
+        """
+        Queues a reading for upload and returns immediately.
+        """
+        return self._queue.put(value, key, timestamp)
+
+    def process_one(self):
+        """
+        Sends the oldest queued reading. Returns False if the queue was
+        empty or the uploads are paused.
+        """
+        queue = self._queue
+        with queue.lock: # idle and pause() never see an item taken but not yet busy
+            if self._paused:
+                return False
+            item = queue.take()
+            if item is None:
+                return False
+            self._busy = True
+        try:
+            if self._conn.send_value_to_web(item[0], item[1], item[2]):
+                self._sent += 1
+            else:
+                self._failed += 1
+        except Exception as e:
+            self._failed += 1
+            print(f"Upload of {item[1]} failed: {e}")
+        finally:
+            self._busy = False
+        return True
+
+    def _worker(self):
+        while self._running:
+            if not self.process_one():
+                time.sleep_ms(self._idle_ms)
+
+    def stats(self):
+        return {
+            "queued": len(self._queue),
+            "sent": self._sent,
+            "failed": self._failed,
+            "dropped": self._queue.dropped,
+        }
@@ -3,10 +3,12 @@ import images_repo as im
 import random
 from pymenu import *
 import ssd1306
-from time import sleep, localtime, time
+from time import localtime
+from animation import Animator, ease_in, lerp, progress, scroll_portion, wipe
 from sdCardManager import sdCardManager
-from Config import Config
+from Config import Config, CONFIG_CACHE_FILE
 from ds3231 import DS3231_RTC
+from softclock import SoftClock
 import ntptime
 from ConnectionManaging import ConnectionManaging
 import _thread
@@ -44,7 +46,14 @@ def send_value_to_web(self, value, key, timestamp):
         return False
 '''
 class Viewer:
-    def __init__(self, i2c=None, config=None, _w = 128, _h = 64):
+    def __init__(self, i2c=None, config=None, _w = 128, _h = 64, deferred=False, relays=None):
+        '''
+            With deferred=True only the display, the RTC and the relays are set up;
+            the application draws the first frame and calls load_sd_configuration()
+            and build_menu() later.
+            relays: relay states restored after a warm restart (see relay_mask()),
+            applied as the pins are created; None switches every relay off.
+        '''
         # ESP32 Pin assignment 
         if i2c:
             self._i2c = i2c
@@ -52,7 +61,12 @@ class Viewer:
             self._i2c = I2C(0, scl=Pin(22), sda=Pin(21), freq=800000)
             
         self.ds = DS3231_RTC(self._i2c) #RTC
+        self.clock = SoftClock(self.ds) # Time for the screen, without I2C reads
+        self._shown_seconds = None
+        self._shown_readings = None
+        self.tick = None # SquareWaveTick, set by the application in SQW tick mode
         self.conn = ConnectionManaging('Wokwi-GUEST', '',"myfishtank.altervista.org")
+        self.uploader = None # Background uploader, set by the application
         # Start the thread
         #self.set_ntp()
         self.oled_width = _w
@@ -73,37 +87,85 @@ class Viewer:
         # DS3231 on 0x68
         self.I2C_ADDR = 0x68     # DEC 104, HEX 0x68 
         
+        self.sd = None
+        self.menu = None
+        if not deferred:
+            self.load_sd_configuration()
+
+        self.display = ssd1306.SSD1306_I2C(self.oled_width, self.oled_height, self._i2c, shadow=True)
+        self.animator = Animator(self.display) # Stepped by the application scheduler once attached
+        self.transition_ms = 250 # Wipe from the menu back to the main screen, 0 to redraw at once
+        self.show_rele_symbol(self._config.get_rele_list())
+        if not deferred:
+            self.build_menu()
+        # Define the pin number
+        # Configure the pin as an output, already at its final level so a
+        # warm restart does not switch a relay off and on again
+        relays = relays or 0
+        self._light_rele = Pin(27, Pin.OUT, value=relays & 1)
+        self._filter_rele = Pin(26, Pin.OUT, value=(relays >> 1) & 1)
+        self._heater_rele = Pin(25, Pin.OUT, value=(relays >> 2) & 1)
+        self._feeder_rele = Pin(33, Pin.OUT, value=(relays >> 3) & 1)
+        # Release the hold set by hold_relays() before the reset
+        for rele in self._relays():
+            rele.init(hold=False)
+        #self.init_screen()
+        #self.display.poweroff()
+
+    def load_sd_configuration(self):
+        '''
+            Mounts the SD card and loads the configuration from it (or writes the
+            current one if missing), then refreshes the flash cache.
+        '''
         self.sd = sdCardManager()
-        
         if(self.sd.if_exist_configuration()):
             file_json = self.sd.get_configuration()
             self._config.from_json(file_json)
         else:
             self.sd.set_configuration(self._config.to_dict())
+        self._config.save(CONFIG_CACHE_FILE)
 
-        self.display = ssd1306.SSD1306_I2C(self.oled_width, self.oled_height, self._i2c)
-        self.show_rele_symbol(self._config.get_rele_list())
+    def _relays(self):
+        return (self._light_rele, self._filter_rele, self._heater_rele, self._feeder_rele)
+
+    def relay_mask(self):
+        '''
+            Relay states as a bit mask: light, filter, heater, feeder from bit 0.
+        '''
+        mask = 0
+        for index, rele in enumerate(self._relays()):
+            if rele.value():
+                mask |= 1 << index
+        return mask
+
+    def hold_relays(self):
+        '''
+            Latches the relay outputs so they keep their level through machine.reset().
+        '''
+        for rele in self._relays():
+            rele.init(hold=True)
+
+    def build_menu(self):
         self.menu = Menu(self)
         self.set_menu()
-        # Define the pin number
-        # Configure the pin as an output
-        self._light_rele = Pin(27, Pin.OUT)
-        self._filter_rele = Pin(26, Pin.OUT)
-        self._heater_rele = Pin(25, Pin.OUT)
-        self._feeder_rele = Pin(33, Pin.OUT)
-        self._light_rele.value(0) 
-        self._filter_rele.value(0) 
-        self._heater_rele.value(0)
-        self._feeder_rele.value(0)
-        #self.init_screen()
-        #self.display.poweroff()
+
+    def show_first_frame(self):
+        '''
+            Draws the main screen straight away, before the menu exists.
+        '''
+        self._shown_seconds = self.clock.seconds()
+        self.time = self.clock.time
+        self.show_main_screen()
+        self.show_rele_symbol(self._config.get_rele_list())
+        self.display.show()
+        self.exit_menu = False
 
     def set_ntp(self):
         #print(conn.connection_status())
         self.conn.connect()
         #print(self.conn.connection_status())
         ntptime.settime()
-        unix_epoch_time1 = str(self.ds.unix_epoch_time(time()))
+        unix_epoch_time1 = str(self.ds.unix_epoch_time())
         print("Unix epoch time:", unix_epoch_time1)
         self.conn.send_value_to_web("530", "Ec", unix_epoch_time1)
         #conn.post_https_request("Ec", "530", "Date", "1739311432")
@@ -111,7 +173,14 @@ class Viewer:
         #print(self.conn.connection_status())
         print(list(localtime()))
         self.ds.datetime = localtime()
+        self.clock.resync()
         
+    def set_light(self, value):
+        # Drives the light relay without changing the LIGHTS toggle
+        self._config.relay0 = value
+        self._light_rele.value(1 if value else 0)
+        self.show_rele_symbol(self._config.get_rele_list())
+
     def toggle_on_off_light_auto(self):
         self._config._on_off_light_auto = not self._config._on_off_light_auto
         self._config._on_off_light_auto_temp = self._config._on_off_light_auto
@@ -198,24 +267,31 @@ class Viewer:
 
     def _send_ec(self, value):
         # Get the Unix timestamp
-        unix_epoch_time1 = str(self.ds.unix_epoch_time(time()))
+        unix_epoch_time1 = str(self.ds.unix_epoch_time())
         print("Unix epoch time:", unix_epoch_time1)
         if value:
-            self.conn.send_value_to_web(self.ec, "Ec", str(unix_epoch_time1))
+            self.upload(self.ec, "Ec", str(unix_epoch_time1))
 
     def _send_ph(self, value):
         # Get the Unix timestamp
-        unix_epoch_time1 = str(self.ds.unix_epoch_time(time()))
+        unix_epoch_time1 = str(self.ds.unix_epoch_time())
         print("Unix epoch time:", unix_epoch_time1)
         if value:
-            self.conn.send_value_to_web(self.ph, "PH", str(unix_epoch_time1))
+            self.upload(self.ph, "PH", str(unix_epoch_time1))
 
 
     def send_temperature(self, value):
         # Get the Unix timestamp
-        unix_epoch_time1 = self.ds.unix_epoch_time(time())
+        unix_epoch_time1 = self.ds.unix_epoch_time()
         if value:
-            self.conn.send_value_to_web(self.temperature, "Temp", str(unix_epoch_time1))
+            self.upload(self.temperature, "Temp", str(unix_epoch_time1))
+
+    def upload(self, value, key, timestamp):
+        # Queue the value for the background uploader when it is running,
+        # otherwise send it right away (blocking)
+        if self.uploader and self.uploader.running:
+            return self.uploader.submit(value, key, timestamp)
+        return self.conn.send_value_to_web(value, key, timestamp)
 
     @property
     def exit_menu(self):
@@ -258,28 +334,48 @@ class Viewer:
         self._ph = value
 
     def init_screen(self):
+        '''
+            Starts the splash animation; it runs in the background and the main
+            screen is drawn when it ends.
+        '''
+        self.animator.start("splash", self.splash(), self._end_animation)
+
+    def splash(self):
+        '''
+            Splash screen as an animation generator: yielding a number of ms holds
+            the frame without blocking the application.
+        '''
         #self.oled.invert(1)
         self.display.fill(0)
         self.display.invert(1)
         self.display.show_image(im.fishtank_logo, 128, 64)
-        sleep(3)
+        yield 3000
 
         self.display.invert(0)
         #self.display.fill(0)   # fill entire screen with colour=0
         screen =  [[39, 0, "PIA12"], [28, 57, "AQUARIUM"]]
-        self.display.scroll_portion(screen, 128, 20)
+        yield from scroll_portion(self.display, screen, 20)
         rect_start_x = 10
         rect_start_y = 10
         rect_width = 105
         rect_height = 45
         self.display.rect(rect_start_x, rect_start_y, rect_width, rect_height, 1)        # draw a rectangle outline 10,10 to width=107, height=53, colour=1
-        self.display.show()
-        sleep(2)
-        for xx in range(rect_start_x, rect_height/2 - 2, 4):
+        yield 2000
+        # Shrink the rectangle towards its centre
+        for t in progress(500, ease_in):
+            xx = lerp(0, rect_height // 2 - 2, t)
             self.display.fill(0)
-            self.display.rect(xx+10, xx+10 , int(rect_width - 2 * xx), int(rect_height - 2 * xx), 1)
-            self.display.show()
-            sleep(0.05)
+            self.display.rect(rect_start_x + xx, rect_start_y + xx, rect_width - 2 * xx, rect_height - 2 * xx, 1)
+            yield
+
+    def _end_animation(self):
+        # The next run() redraws the main screen
+        self.exit_menu = True
+
+    def _draw_main_screen(self):
+        self.show_main_screen()
+        self.show_rele_symbol(self._config.get_rele_list())
+        self.display.show()
         
     def show_main_screen(self):
         '''
@@ -288,20 +384,52 @@ class Viewer:
         #self.display.fill(0) to clean wholw screen 
         self.display.fill_rect(0, 0, 128, 51, 0)       
         self.display.rect(25, 2, 75, 14, 1)
+        self.display.text("TEMP:", 0, 21)
+        self.display.text("EC:", 0, 33)
+        self.display.text("PH:", 0, 43)
+        #self.display.rect(92, 48, 36, 14, 1)
+        #self.display.text("MENU", 94, 52)
+        self.show_clock()
+        self.show_readings()
+
+    def show_clock(self):
+        '''
+            Redraws only the time inside its box, so the display sends just that window
+        '''
+        self.display.fill_rect(26, 3, 73, 12, 0)
         self.display.text(self.time, 30, 5, 1)
-        self.display.text("TEMP:", 0, 23)
-        self.display.text("{0:02}".format(self.temperature), 48, 23)
+
+    def show_readings(self):
+        '''
+            Redraws the temperature, ec and ph values next to their labels
+        '''
+        self._shown_readings = (self.temperature, self.ec, self.ph)
+        # Temperature with one decimal, in double size digits when they fit
+        # on the panel together with the unit after them
+        if isinstance(self.temperature, float):
+            temperature = "{:.1f}".format(self.temperature)
+        else:
+            temperature = "{0:02}".format(self.temperature)
+        size = 2 if 48 + (len(temperature) + 1) * 16 <= self.oled_width else 1
+        self.display.fill_rect(48, 17, self.oled_width - 48, 16, 0)
+        self.display.write_text(temperature, 48, 17, size)
+        x = 48 + len(temperature) * 8 * size
         # Visualizza il simbolo del grado sul display
-        self.display.show_custom_char(im.degree_symbol, 64 ,23)
-        self.display.text("C", 72, 23)
-        self.display.text("EC:", 0, 33)
+        self.display.show_custom_char(im.degree_symbol, x, 17)
+        self.display.text("C", x + 8, 17)
+        self.display.fill_rect(32, 33, 96, 18, 0)
         self.display.text("{0:03}".format(self.ec) +" uS/cm", 32, 33)
         #self.display.show_custom_char(self.micron_symbol, 48 ,30)
         #self.display.text("S/cm", 54, 30)
-        self.display.text("PH:", 0, 43)
         self.display.text(self.ph, 32, 43)
-        #self.display.rect(92, 48, 36, 14, 1)
-        #self.display.text("MENU", 94, 52)
+
+    def _refresh_main_screen(self):
+        # Clock tick: the readings are redrawn only when one of them changed
+        with self.display.frame():
+            self.show_clock()
+            if self._shown_readings != (self.temperature, self.ec, self.ph):
+                self.show_readings()
+            self.display.show()
         
     def show_rele_symbol(self, rele):
         ''' 
@@ -319,21 +447,38 @@ class Viewer:
         self.is_enabled_menu = False
         
     def run(self):
+        if self.animator.busy:
+            # Animations own the screen; without a scheduler they are stepped from here
+            if not self.animator.attached:
+                self.animator.step()
+            return
         if self.is_enabled_menu and not(self.exit_menu):
             self.menu.draw()
             self.exit_menu = True
         elif self.exit_menu and not(self.is_enabled_menu):
             self.exit_menu = False
-            self.menu.reset()
-            self.time = self.ds.time
-            self.show_main_screen()
-            self.show_rele_symbol(self._config.get_rele_list())
-            self.display.show() 
-        elif not(self.exit_menu) and not(self.is_enabled_menu) and (self.ds.time != self.time): 
-            #print(str(self.exit_menu) + " " + str(self.is_enabled_menu) + " " + str(time) + " " + str(self._time_temp))
-            self.time = self.ds.time
-            self.show_main_screen()
-            self.display.show()   
+            if self.menu is not None:
+                self.menu.reset()
+            self._shown_seconds = self.clock.seconds()
+            self.time = self.clock.time
+            if self.transition_ms and self.menu is not None:
+                self.animator.start("screen", wipe(self.display, self._draw_main_screen, self.transition_ms))
+            else:
+                with self.display.frame():
+                    self._draw_main_screen()
+        elif not(self.exit_menu) and not(self.is_enabled_menu):
+            if self.tick is not None:
+                # Redraw once per SQW edge
+                if self.tick.pending():
+                    self.time = self.clock.time
+                    self._refresh_main_screen()
+                return
+            # The software clock answers without I2C traffic: redraw only when the second changed
+            seconds = self.clock.seconds()
+            if seconds != self._shown_seconds:
+                self._shown_seconds = seconds
+                self.time = self.clock.time
+                self._refresh_main_screen()
         else:    
             pass  
 
@@ -0,0 +1,67 @@
+from machine import RTC
+import binascii
+import json
+import struct
+
+MAGIC = b"PTK1"
+HEADER = "<4sHI" # magic, payload length, CRC32 of the payload
+HEADER_SIZE = struct.calcsize(HEADER)
+RTC_MEMORY_SIZE = 2048 # RTC slow memory available to MicroPython on the ESP32
+
+
+class WarmStart:
+    """
+    Snapshot of the configuration and relay states kept in RTC slow memory,
+    which survives machine.reset() but not a power cycle.
+
+    The snapshot is a short header (magic, length, CRC32) followed by compact
+    JSON; a snapshot that fails any check is ignored, so a cold boot or a
+    corrupted memory falls back to the normal startup.
+    """
+
+    def __init__(self, memory=None):
+        """
+        Args:
+            memory: Object with a memory([data]) method, machine.RTC() by default.
+        """
+        self._rtc = memory if memory is not None else RTC()
+
+    def save(self, config, relays, sensor_rom=None):
+        """
+        Writes a snapshot. Returns False if it does not fit in RTC memory.
+
+        Args:
+            config (dict): Config.to_dict().
+            relays (int): Relay states, one bit per relay.
+            sensor_rom (bytes): DS18B20 ROM code, so the bus scan can be skipped.
+        """
+        state = {"c": config, "r": relays, "s": binascii.hexlify(sensor_rom).decode() if sensor_rom else None}
+        payload = json.dumps(state).encode()
+        if HEADER_SIZE + len(payload) > RTC_MEMORY_SIZE:
+            print("Warm-start snapshot too large, not saved.")
+            return False
+        self._rtc.memory(struct.pack(HEADER, MAGIC, len(payload), binascii.crc32(payload)) + payload)
+        return True
+
+    def load(self):
+        """
+        Returns (config dict, relays, sensor ROM or None) from a valid
+        snapshot, or None.
+        """
+        data = self._rtc.memory()
+        if len(data) < HEADER_SIZE:
+            return None
+        magic, length, crc = struct.unpack(HEADER, data[:HEADER_SIZE])
+        payload = data[HEADER_SIZE:HEADER_SIZE + length]
+        if magic != MAGIC or len(payload) != length or binascii.crc32(payload) != crc:
+            return None
+        try:
+            state = json.loads(payload.decode())
+            rom = binascii.unhexlify(state["s"]) if state["s"] else None
+            return state["c"], state["r"], rom
+        except (ValueError, KeyError) as e:
+            print(f"Invalid warm-start snapshot: {e}")
+            return None
+
+    def clear(self):
+        self._rtc.memory(b"")